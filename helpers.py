@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import math
+import unicodedata
 from inspect import currentframe
 from logging.handlers import RotatingFileHandler
 from os import getenv
@@ -39,6 +41,9 @@ def configure_logger(logger_name: str) -> logging.Logger:
     return logger
 
 
+GRID_CELL_SIZE = 0.1  # rozmiar komórki siatki geograficznej (w stopniach)
+
+
 def get_static_dir() -> str:
     """Provides absolute path for static directory.
 
@@ -56,3 +61,55 @@ def parent_function_name() -> str:
     """
     frame = currentframe().f_back
     return frame.f_code.co_name
+
+
+def normalize_text(text: str | None) -> str:
+    """Normalizes text for the searching (lower-cased, with Polish diacritics folded).
+
+    For example: 'Łódź' => 'lodz', 'Warmińsko-Mazurskie' => 'warminsko-mazurskie'.
+
+    Args:
+        text: Text to be normalized.
+
+    Returns:
+        Normalized text.
+    """
+    if not text:
+        return ""
+
+    text = str(text).casefold().replace("ł", "l")
+    return "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+
+
+def parse_coordinate(value: str | float | None, limit: float) -> float | None:
+    """Parses geographical coordinate stored as text (e.g. '50.0614', 'nan').
+
+    Args:
+        value: Coordinate value.
+        limit: Maximal absolute value of the coordinate (90 for latitude, 180 for longitude).
+
+    Returns:
+        Coordinate as float or None if the value is missing/invalid.
+    """
+    try:
+        coordinate = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    if math.isnan(coordinate) or abs(coordinate) > limit:
+        return None
+
+    return coordinate
+
+
+def get_grid_cell(latitude: float, longitude: float) -> str:
+    """Provides identifier of the geographical grid cell (see GRID_CELL_SIZE) containing the given point.
+
+    Args:
+        latitude: Latitude of the point.
+        longitude: Longitude of the point.
+
+    Returns:
+        Grid cell identifier, for example: '500:199'.
+    """
+    return f"{math.floor(latitude / GRID_CELL_SIZE)}:{math.floor(longitude / GRID_CELL_SIZE)}"
@@ -28,6 +28,10 @@ app.conf.update(
             # 'schedule': crontab(hour=0, minute=0),  # Każdej nocy o północy
             # 'args': (("data11",)),
         },
+        "home-paragraphs-task": {
+            "task": "mysite.celery_tasks.refresh_home_paragraphs",
+            "schedule": timedelta(hours=6),
+        },
     },
 )
 
@@ -12,6 +12,7 @@ from helpers import configure_logger
 from mysite.celery_setup import app
 
 LOGGER_WEBSITE_AVAILABILITY = configure_logger("check_website_availability")
+LOGGER_AI_POOL = configure_logger("ai_pool")
 
 
 @app.task
@@ -36,6 +37,66 @@ def check_website_availability():
         LOGGER_WEBSITE_AVAILABILITY.error(message_text)
 
 
+@app.task
+def refresh_home_paragraphs():
+    # imported here, Django apps are not loaded yet when the worker imports this module
+    from tools import HomeParagraphPool
+
+    generated = HomeParagraphPool.refresh()
+    LOGGER_AI_POOL.info(f"Wygenerowano {generated} akapitów strony głównej.")
+
+
+@app.task(bind=True, acks_late=True)
+def pregenerate_ai_descriptions(
+    self,
+    kinds: list[str] | None = None,
+    voivodeships: list[str] | None = None,
+    variants: list[str] | None = None,
+    reset: bool = False,
+):
+    """Pre-generates AI descriptions of the catalog objects (see 'tools.AiPregenerator').
+
+    Models are processed one by one. The task stops after 'AI_PREGENERATION_TASK_SECONDS' and queues its continuation,
+    which resumes from the checkpoint (also after the crash, the task is acknowledged late, so it is redelivered).
+    Run stopped without progress (the AI is unavailable) is retried after the growing pause, the object failing
+    in 'AiPregenerator.MAX_ATTEMPTS' runs is passed.
+
+    Args:
+        kinds: Catalog model names ('monument', 'archeo', 'geo'), all models if None.
+        voivodeships: Names of the voivodeships to walk (all objects, if None).
+        variants: Names of the prompt variants ('short' - detail pages, 'full' - AI pages), both if None.
+        reset: If True, all models are walked from the beginning (their checkpoints are deleted).
+    """
+    # imported here, Django apps are not loaded yet when the worker imports this module
+    from django.conf import settings
+    from tools import AiPregenerator
+
+    kinds = ["monument", "archeo", "geo"] if kinds is None else list(kinds)
+    variants = list(variants or AiPregenerator.VARIANTS)
+    if not kinds:
+        return
+
+    if reset:
+        for kind in kinds:
+            AiPregenerator(kind, voivodeships=voivodeships, variants=tuple(variants)).reset()
+
+    pregenerator = AiPregenerator(kinds[0], voivodeships=voivodeships, variants=tuple(variants))
+    checkpoint = pregenerator.run(time_limit=settings.AI_PREGENERATION_TASK_SECONDS)
+    LOGGER_AI_POOL.info(
+        f"Generowanie opisów AI {checkpoint.name!r}: obiekt {checkpoint.last_id}, wygenerowano {checkpoint.generated}, "
+        f"pominięto {checkpoint.skipped}, nieudane {checkpoint.failed}."
+    )
+    if checkpoint.stopped_at is not None:
+        self.apply_async(
+            kwargs={"kinds": kinds, "voivodeships": voivodeships, "variants": variants},
+            countdown=pregenerator.get_retry_countdown(checkpoint),
+        )
+    elif checkpoint.finished_at is None:
+        self.apply_async(kwargs={"kinds": kinds, "voivodeships": voivodeships, "variants": variants})
+    elif kinds[1:]:
+        self.apply_async(kwargs={"kinds": kinds[1:], "voivodeships": voivodeships, "variants": variants})
+
+
 @app.task
 def get_krs_foundation_data(krs_number: str):
     krs_api_request = f"https://api-krs.ms.gov.pl/api/krs/OdpisAktualny/{krs_number}?rejestr=S&format=json"
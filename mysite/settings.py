@@ -55,6 +55,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "polishness.middleware.AiMetricsMiddleware",
 ]
 
 ROOT_URLCONF = "mysite.urls"
@@ -85,10 +86,37 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # async views run queries from many threads (connections) at once, so writers wait for the lock
+        # instead of failing and readers are not blocked by writers (WAL)
+        "OPTIONS": {
+            "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Shared by all workers (single-flight locks, search results, cache versions) if REDIS_CACHE_URL is set
+# (e.g. redis://localhost:6379/2), otherwise local to the process.
+
+if getenv("REDIS_CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": getenv("REDIS_CACHE_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -137,6 +165,62 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# AI descriptions cache (tools.AiDescriptionCache): lifetime in seconds (0 - no expiry), in-process LRU size
+AI_DESCRIPTION_CACHE_TTL = int(getenv("AI_DESCRIPTION_CACHE_TTL", 30 * 24 * 60 * 60))
+AI_DESCRIPTION_CACHE_SIZE = int(getenv("AI_DESCRIPTION_CACHE_SIZE", 1024))
+# browser/proxy cache lifetime of the AI description fragment of the detail pages (in seconds)
+AI_FRAGMENT_MAX_AGE = int(getenv("AI_FRAGMENT_MAX_AGE", 60 * 60))
+
+# AI calls (tools.AiClients): timeout of the single attempt, total time of the call (in seconds), retries of the
+# failed attempt, in-flight calls per process (sync) or per event loop (async)
+AI_TIMEOUT = float(getenv("AI_TIMEOUT", 20))
+AI_BUDGET = float(getenv("AI_BUDGET", 40))
+AI_MAX_RETRIES = int(getenv("AI_MAX_RETRIES", 2))
+AI_MAX_CONCURRENCY = int(getenv("AI_MAX_CONCURRENCY", 32))
+
+# AI backend (tools.AiClients.get_backend): "openai" (default), "replay" (answers recorded in the AI_RECORDINGS_PATH
+# file - JSON lines, new answers are asked and appended if AI_RECORD=1) or "stub" (offline canned text after
+# the simulated latency: log-normal with the AI_STUB_LATENCY_MEDIAN median and AI_STUB_LATENCY_SIGMA shape,
+# AI_STUB_PART_DELAY between words)
+if getenv("AI_BACKEND") == "replay":
+    AI_BACKEND = {
+        "BACKEND": "tools.RecordReplayAiBackend",
+        "OPTIONS": {
+            "path": getenv("AI_RECORDINGS_PATH", str(BASE_DIR / "ai_recordings.json")),
+            "record": getenv("AI_RECORD") == "1",
+        },
+    }
+elif getenv("AI_BACKEND") == "stub":
+    AI_BACKEND = {
+        "BACKEND": "tools.StubAiBackend",
+        "OPTIONS": {
+            "latency_median": float(getenv("AI_STUB_LATENCY_MEDIAN", 1.5)),
+            "latency_sigma": float(getenv("AI_STUB_LATENCY_SIGMA", 0.5)),
+            "part_delay": float(getenv("AI_STUB_PART_DELAY", 0.03)),
+        },
+    }
+else:
+    AI_BACKEND = {"BACKEND": "tools.OpenAiBackend"}
+
+# bulk pre-generation of AI descriptions (tools.AiPregenerator): requests per minute, parallel requests, time of
+# the single Celery task (below the worker --time-limit), after which the task continues in the next one
+AI_PREGENERATION_RPM = int(getenv("AI_PREGENERATION_RPM", 60))
+AI_PREGENERATION_CONCURRENCY = int(getenv("AI_PREGENERATION_CONCURRENCY", 4))
+AI_PREGENERATION_TASK_SECONDS = int(getenv("AI_PREGENERATION_TASK_SECONDS", 240))
+
+# AI calls metrics of the worker process (tools.AiMetrics) at /internal/ai-metrics/: for the staff users
+# or with the "Authorization: Bearer <AI_METRICS_TOKEN>" header (e.g. for the metrics scraper)
+AI_METRICS_TOKEN = getenv("AI_METRICS_TOKEN")
+
+# DBW knowledge areas tree (tools.DbwAreaTree): file with the persisted tree, age (in seconds) after which the tree
+# is refreshed in the background
+DBW_AREA_TREE_PATH = getenv("DBW_AREA_TREE_PATH", str(BASE_DIR / "static" / "dbw_area_tree.json"))
+DBW_AREA_TREE_TTL = int(getenv("DBW_AREA_TREE_TTL", 24 * 60 * 60))
+
+# home page AI paragraphs (tools.HomeParagraphPool): pool size, paragraphs replaced by each refresh
+HOME_PARAGRAPH_POOL_SIZE = int(getenv("HOME_PARAGRAPH_POOL_SIZE", 10))
+HOME_PARAGRAPH_REFRESH_COUNT = int(getenv("HOME_PARAGRAPH_REFRESH_COUNT", 2))
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from django.contrib import admin
 
+from .models import AiDescription
+from .models import AiPregenerationCheckpoint
 from .models import ArcheologicalMonument
 from .models import GeographicalObject
+from .models import HomeParagraph
 from .models import Monument
 
 
@@ -19,6 +22,32 @@ class GeographicalObjectAdmin(admin.ModelAdmin):
     list_display = ("name", "geo_object_type", "voivodeship", "county", "parish", "latitude", "longitude")
 
 
+class AiDescriptionAdmin(admin.ModelAdmin):
+    list_display = ("object_model", "object_id", "ai_model", "created_at")
+    list_filter = ("object_model", "ai_model")
+
+
+class HomeParagraphAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "ai_model")
+
+
+class AiPregenerationCheckpointAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "last_id",
+        "generated",
+        "skipped",
+        "failed",
+        "attempts",
+        "stopped_at",
+        "finished_at",
+        "updated_at",
+    )
+
+
 admin.site.register(Monument, MonumentAdmin)
 admin.site.register(ArcheologicalMonument, ArcheologicalMonumentAdmin)
 admin.site.register(GeographicalObject, GeographicalObjectAdmin)
+admin.site.register(AiDescription, AiDescriptionAdmin)
+admin.site.register(HomeParagraph, HomeParagraphAdmin)
+admin.site.register(AiPregenerationCheckpoint, AiPregenerationCheckpointAdmin)
@@ -6,3 +6,6 @@ from django.apps import AppConfig
 class PolishnessConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "polishness"
+
+    def ready(self):
+        from . import signals  # noqa: F401
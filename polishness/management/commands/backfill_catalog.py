@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from polishness.models import ArcheologicalMonument
+from polishness.models import CoordinatesMixin
+from polishness.models import GeographicalObject
+from polishness.models import Monument
+from tools import refresh_catalog_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills normalized search columns and numeric coordinates (with grid cells) of the catalog tables "
+        "and rebuilds the catalog indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model in (Monument, ArcheologicalMonument, GeographicalObject):
+            update_fields = [f"{field}_normalized" for field in model.NORMALIZED_FIELDS]
+            if issubclass(model, CoordinatesMixin):
+                update_fields += CoordinatesMixin.COORDINATES_FIELDS
+            updated = 0
+            batch = []
+            for item in model.objects.order_by("id").iterator(chunk_size=batch_size):
+                item.fill_normalized_fields()
+                if isinstance(item, CoordinatesMixin):
+                    item.fill_coordinates()
+                batch.append(item)
+                if len(batch) == batch_size:
+                    updated += self.update_batch(model, batch, update_fields)
+                    batch = []
+            updated += self.update_batch(model, batch, update_fields)
+
+            refresh_catalog_indexes(model)
+            self.stdout.write(f"{model.__name__}: uzupełniono {updated} wierszy.")
+
+    @staticmethod
+    def update_batch(model, batch: list, update_fields: list[str]) -> int:
+        with transaction.atomic():
+            model.objects.bulk_update(batch, update_fields, batch_size=500)
+        return len(batch)
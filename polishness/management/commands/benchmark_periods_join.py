@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from os.path import join
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from tools import GusApiDbwClient
+from tools import JsonRecordsStore
+
+
+def legacy_enrich(section_periods: list[dict], periods_path: str) -> list[dict]:
+    """Enrichment used before the 'PERIODS' index (periods file loaded per request, nested loop)."""
+    with open(periods_path, "r", encoding="utf-8") as json_file:
+        periods = json.load(json_file)
+
+    for item_section_periods in section_periods:
+        item_section_periods["nazwa_przekroj"] = item_section_periods["nazwa-przekroj"]
+        item_section_periods["id_przekroj"] = item_section_periods["id-przekroj"]
+        item_section_periods["id_okres"] = item_section_periods["id-okres"]
+
+        for period in periods:
+            if period["id-okres"] == item_section_periods["id_okres"]:
+                item_section_periods["opis_okres"] = period["opis"]
+    return section_periods
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares latency of the legacy enrichment of the sections and periods (periods file loaded per request, "
+        "nested loop) and 'GusApiDbwClient.enrich_section_periods' (shared 'PERIODS' index), on synthetic data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--periods", type=int, default=400, help="Number of the periods in the dictionary.")
+        parser.add_argument("--sections", type=int, default=200, help="Maximal number of the variable sections.")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--steps", type=int, default=4, help="Number of measured section counts.")
+
+    def handle(self, *args, **options):
+        periods = [
+            {"id-okres": period_id, "symbol": f"S{period_id}", "opis": f"okres {period_id}"}
+            for period_id in range(options["periods"])
+        ]
+        with TemporaryDirectory() as directory:
+            periods_path = join(directory, "all_periods.json")
+            with open(periods_path, "w", encoding="utf-8") as json_file:
+                json.dump(periods, json_file, indent=4)
+
+            indexed_periods = JsonRecordsStore(periods_path, key="id-okres", unique=True)
+            stored_periods = GusApiDbwClient.PERIODS
+            GusApiDbwClient.PERIODS = indexed_periods
+            try:
+                self.compare(periods, periods_path, options)
+            finally:
+                GusApiDbwClient.PERIODS = stored_periods
+
+    def compare(self, periods: list[dict], periods_path: str, options: dict) -> None:
+        self.stdout.write(f"{'sections':>10} {'legacy [ms]':>14} {'indexed [ms]':>14} {'speedup':>10}")
+        for step in range(1, options["steps"] + 1):
+            count = options["sections"] * step // options["steps"]
+            section_periods = [
+                {
+                    "id-zmienna": 1,
+                    "id-przekroj": section_id,
+                    "nazwa-przekroj": f"przekrój {section_id}",
+                    # the last periods - the worst case of the nested loop
+                    "id-okres": periods[-1 - section_id % len(periods)]["id-okres"],
+                }
+                for section_id in range(count)
+            ]
+
+            legacy_times = []
+            indexed_times = []
+            for _ in range(options["repeat"]):
+                legacy_rows = [dict(item) for item in section_periods]
+                start = perf_counter()
+                legacy_enrich(legacy_rows, periods_path)
+                legacy_times.append(perf_counter() - start)
+
+                indexed_rows = [dict(item) for item in section_periods]
+                start = perf_counter()
+                GusApiDbwClient.enrich_section_periods(indexed_rows)
+                indexed_times.append(perf_counter() - start)
+
+            if legacy_rows != indexed_rows:
+                self.stderr.write(f"Różne wyniki wzbogacania dla {count} przekrojów.")
+                return
+
+            legacy_time = median(legacy_times)
+            indexed_time = median(indexed_times)
+            self.stdout.write(
+                f"{count:>10} {legacy_time * 1000:>14.3f} {indexed_time * 1000:>14.3f} "
+                f"{legacy_time / indexed_time:>9.0f}x"
+            )
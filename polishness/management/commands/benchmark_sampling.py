@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from secrets import randbelow
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from polishness.models import ArcheologicalMonument
+from polishness.models import GeographicalObject
+from polishness.models import Monument
+from tools import RandomSampler
+
+MODELS = {"monument": Monument, "archeo": ArcheologicalMonument, "geo": GeographicalObject}
+
+
+def legacy_randomize(quantity: int, items) -> list:
+    """Randomization used before 'RandomSampler' (whole queryset is loaded, rejection against a list)."""
+    items_len = len(items)
+    if quantity > items_len:
+        return [item for item in items]
+
+    randomized_items = []
+    random_numbers = []
+    for num in range(quantity):
+        random_number = randbelow(items_len)
+        while random_number in random_numbers:
+            random_number = randbelow(items_len)
+
+        randomized_items.append(items[random_number])
+        random_numbers.append(random_number)
+
+    return randomized_items
+
+
+class Command(BaseCommand):
+    help = "Compares latency of the legacy randomization and 'RandomSampler' for the growing table size."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=MODELS.keys(), default="monument")
+        parser.add_argument("--quantity", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--steps", type=int, default=5, help="Number of measured table sizes.")
+
+    def handle(self, *args, **options):
+        model = MODELS[options["model"]]
+        quantity = options["quantity"]
+        ids = list(model.objects.order_by("id").values_list("id", flat=True))
+        if not ids:
+            self.stderr.write(f"Tabela modelu {model.__name__} jest pusta.")
+            return
+
+        self.stdout.write(f"{'rows':>10} {'legacy [ms]':>14} {'sampler cold [ms]':>18} {'sampler warm [ms]':>18}")
+        for step in range(1, options["steps"] + 1):
+            last_id = ids[len(ids) * step // options["steps"] - 1]
+            queryset = model.objects.filter(id__lte=last_id)
+
+            legacy_times = []
+            for _ in range(options["repeat"]):
+                start = perf_counter()
+                legacy_randomize(quantity, model.objects.filter(id__lte=last_id))
+                legacy_times.append(perf_counter() - start)
+
+            RandomSampler.invalidate()
+            start = perf_counter()
+            RandomSampler.sample(queryset=queryset, quantity=quantity)
+            cold_time = perf_counter() - start
+
+            warm_times = []
+            for _ in range(options["repeat"]):
+                start = perf_counter()
+                RandomSampler.sample(queryset=queryset, quantity=quantity)
+                warm_times.append(perf_counter() - start)
+
+            self.stdout.write(
+                f"{len(ids) * step // options['steps']:>10} {median(legacy_times) * 1000:>14.2f} "
+                f"{cold_time * 1000:>18.2f} {median(warm_times) * 1000:>18.2f}"
+            )
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from polishness.models import ArcheologicalMonument
+from polishness.models import GeographicalObject
+from polishness.models import Monument
+from tools import AiDescriptionCache
+
+MODELS = {"monument": Monument, "archeo": ArcheologicalMonument, "geo": GeographicalObject}
+
+
+class Command(BaseCommand):
+    help = "Deletes cached AI descriptions (all, of the given table/objects, or only the expired ones)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=sorted(MODELS), help="Table of the described objects.")
+        parser.add_argument("--pk", type=int, nargs="+", help="Primary keys of the described objects.")
+        parser.add_argument("--expired", action="store_true", help="Deletes only the expired descriptions.")
+
+    def handle(self, *args, **options):
+        if options["expired"]:
+            deleted = AiDescriptionCache.delete_expired()
+        else:
+            model = MODELS[options["model"]] if options["model"] else None
+            deleted = AiDescriptionCache.invalidate(model, options["pk"] if model else None)
+        self.stdout.write(f"Usunięto {deleted} opisów AI.")
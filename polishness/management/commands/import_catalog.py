@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from polishness.models import ArcheologicalMonument
+from polishness.models import GeographicalObject
+from polishness.models import Monument
+from tools import CatalogImporter
+
+MODELS = {"monument": Monument, "archeo": ArcheologicalMonument, "geo": GeographicalObject}
+
+
+class Command(BaseCommand):
+    help = "Imports the catalog tables from the CSV files in the static directory (bulk, in chunks)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help=f"Imported tables: {', '.join(sorted(MODELS))} (all by default).")
+        parser.add_argument("--chunk-size", type=int, default=20000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--append", action="store_true", help="Keeps existing rows.")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Writes only new, changed and removed rows (primary keys of the existing rows are kept).",
+        )
+        parser.add_argument("--keep-indexes", action="store_true", help="Does not drop indexes for the load.")
+
+    def handle(self, *args, **options):
+        unknown_models = set(options["models"]) - set(MODELS)
+        if unknown_models:
+            raise CommandError(f"Nieznane tabele: {', '.join(sorted(unknown_models))}.")
+
+        for model_name in options["models"] or sorted(MODELS):
+            model = MODELS[model_name]
+            missing_indexes = CatalogImporter.get_missing_indexes(model)
+            if missing_indexes:
+                CatalogImporter.create_indexes(missing_indexes)
+                self.stdout.write(f"{model.__name__}: odtworzono {len(missing_indexes)} brakujących indeksów.")
+
+            if options["incremental"]:
+                stats = CatalogImporter.sync_model(
+                    model, chunk_size=options["chunk_size"], batch_size=options["batch_size"]
+                )
+                self.stdout.write(
+                    f"{model.__name__}: dodano {stats['inserted']}, zaktualizowano {stats['updated']}, "
+                    f"usunięto {stats['deleted']}, bez zmian {stats['unchanged']} wierszy "
+                    f"w {stats['seconds']:.2f} s."
+                )
+                continue
+
+            stats = CatalogImporter.import_model(
+                model,
+                replace=not options["append"],
+                chunk_size=options["chunk_size"],
+                batch_size=options["batch_size"],
+                drop_indexes=not options["keep_indexes"],
+            )
+            self.stdout.write(
+                f"{model.__name__}: zaimportowano {stats['rows']} wierszy w {stats['seconds']:.2f} s "
+                f"({stats['rows_per_second']:.0f} wierszy/s)."
+            )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+
+from tools import AiMetrics
+
+
+class AiMetricsMiddleware:
+    """Middleware marking the view handling the request, so its AI calls are recorded in the 'AiMetrics' under its name.
+
+    The view name stays set for the streamed response content, which is consumed after the middleware returns.
+    Works in the sync (WSGI) and async (ASGI) handlers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        AiMetrics.start_request()
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    @staticmethod
+    def process_view(request, view_func, view_args, view_kwargs):
+        AiMetrics.set_view(request.resolver_match.view_name)
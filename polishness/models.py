@@ -1,10 +1,64 @@
 from __future__ import annotations
 
 from django.db import models
+from django.utils import timezone
 
+from helpers import get_grid_cell
+from helpers import normalize_text
+from helpers import parse_coordinate
 
-class ArcheologicalMonument(models.Model):
-    library_id = models.CharField(max_length=100)  # biblioteczny identyfikator, INSPIRE_ID;
+
+class NormalizedFieldsMixin:
+    """Fills normalized (lower-cased, with Polish diacritics folded) shadow columns of the search fields.
+
+    Shadow column of the field 'x' is named 'x_normalized'. Columns are filled on save, bulk operations
+    have to call 'fill_normalized_fields' explicitly.
+
+    Attributes:
+        NORMALIZED_FIELDS (tuple): Fields with the normalized shadow columns.
+    """
+
+    NORMALIZED_FIELDS: tuple[str, ...] = ()
+
+    def fill_normalized_fields(self) -> None:
+        for field in self.NORMALIZED_FIELDS:
+            setattr(self, f"{field}_normalized", normalize_text(getattr(self, field)))
+
+    def save(self, *args, **kwargs):
+        self.fill_normalized_fields()
+        super().save(*args, **kwargs)
+
+
+class CoordinatesMixin:
+    """Fills numeric coordinates columns (NULL for missing values) and the geographical grid cell.
+
+    Columns are filled on save (from the text 'latitude'/'longitude' fields), bulk operations
+    have to call 'fill_coordinates' explicitly.
+
+    Attributes:
+        COORDINATES_FIELDS (tuple): Fields filled by the 'fill_coordinates'.
+    """
+
+    COORDINATES_FIELDS = ("latitude_value", "longitude_value", "grid_cell")
+
+    def fill_coordinates(self) -> None:
+        self.latitude_value = parse_coordinate(self.latitude, limit=90)
+        self.longitude_value = parse_coordinate(self.longitude, limit=180)
+        if self.latitude_value is None or self.longitude_value is None:
+            self.latitude_value = self.longitude_value = None
+            self.grid_cell = ""
+        else:
+            self.grid_cell = get_grid_cell(self.latitude_value, self.longitude_value)
+
+    def save(self, *args, **kwargs):
+        self.fill_coordinates()
+        super().save(*args, **kwargs)
+
+
+class ArcheologicalMonument(NormalizedFieldsMixin, models.Model):
+    NORMALIZED_FIELDS = ("function", "voivodeship", "county", "parish", "locality")
+
+    library_id = models.CharField(max_length=100, db_index=True)  # biblioteczny identyfikator, INSPIRE_ID;
     security_form = models.CharField(max_length=100)  # forma ochrony
     location_accuracy = models.CharField(max_length=100)  # dokładność położenia
     name = models.CharField(max_length=100)  # nazwa
@@ -19,6 +73,12 @@ class ArcheologicalMonument(models.Model):
     parish = models.CharField(max_length=100)  # gmina
     locality = models.CharField(max_length=100)  # miejscowość
     link = models.CharField(max_length=100)  # link do portalu zabutek pl
+    function_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    voivodeship_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    county_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    parish_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    locality_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    row_hash = models.CharField(max_length=32, default="", editable=False)  # skrót wiersza CSV
 
     class Meta:
         ordering = ("-name",)
@@ -27,7 +87,9 @@ class ArcheologicalMonument(models.Model):
         return f"{self.name} {self.function}"
 
 
-class GeographicalObject(models.Model):
+class GeographicalObject(NormalizedFieldsMixin, CoordinatesMixin, models.Model):
+    NORMALIZED_FIELDS = ("parish", "county", "voivodeship")
+
     name = models.CharField(max_length=100)  # nazwa
     geo_object_type = models.CharField(max_length=100)  # typ obiektu geograficznego
     parish = models.CharField(max_length=100)  # gmina
@@ -35,16 +97,26 @@ class GeographicalObject(models.Model):
     voivodeship = models.CharField(max_length=100)  # województwo
     latitude = models.CharField(max_length=100)  # szerokość geograficzna
     longitude = models.CharField(max_length=100)  # długość geograficzna
+    parish_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    county_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    voivodeship_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    latitude_value = models.FloatField(null=True, editable=False)  # szerokość geograficzna (liczbowo)
+    longitude_value = models.FloatField(null=True, editable=False)  # długość geograficzna (liczbowo)
+    grid_cell = models.CharField(max_length=20, default="", editable=False, db_index=True)  # komórka siatki
+    row_hash = models.CharField(max_length=32, default="", editable=False)  # skrót wiersza CSV
 
     class Meta:
         ordering = ("-name",)
+        indexes = [models.Index(fields=["latitude_value", "longitude_value"])]
 
     def __str__(self):
         return f"{self.name} ({self.geo_object_type})"
 
 
-class Monument(models.Model):
-    library_id = models.CharField(max_length=100)  # biblioteczny identyfikator
+class Monument(NormalizedFieldsMixin, CoordinatesMixin, models.Model):
+    NORMALIZED_FIELDS = ("function", "voivodeship", "county", "parish", "locality")
+
+    library_id = models.CharField(max_length=100, db_index=True)  # biblioteczny identyfikator
     security_form = models.CharField(max_length=100)  # forma ochrony
     location_accuracy = models.CharField(max_length=100)  # dokładność położenia
     name = models.CharField(max_length=100)  # nazwa
@@ -61,9 +133,73 @@ class Monument(models.Model):
     address_number = models.CharField(max_length=100)  # numer adresowy
     latitude = models.CharField(max_length=100)  # szerokość geograficzna
     longitude = models.CharField(max_length=100)  # długość geograficzna
+    function_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    voivodeship_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    county_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    parish_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    locality_normalized = models.CharField(max_length=100, default="", editable=False, db_index=True)
+    row_hash = models.CharField(max_length=32, default="", editable=False)  # skrót wiersza CSV
+    latitude_value = models.FloatField(null=True, editable=False)  # szerokość geograficzna (liczbowo)
+    longitude_value = models.FloatField(null=True, editable=False)  # długość geograficzna (liczbowo)
+    grid_cell = models.CharField(max_length=20, default="", editable=False, db_index=True)  # komórka siatki
 
     class Meta:
         ordering = ("-name",)
+        indexes = [models.Index(fields=["latitude_value", "longitude_value"])]
 
     def __str__(self):
         return f"{self.name} {self.function}"
+
+
+class AiDescription(models.Model):
+    """AI generated description of the catalog object (see 'tools.AiDescriptionCache')."""
+
+    object_model = models.CharField(max_length=100)  # etykieta modelu, np. 'polishness.monument'
+    object_id = models.BigIntegerField()  # klucz główny obiektu
+    prompt_hash = models.CharField(max_length=64)  # skrót SHA-256 zapytania
+    ai_model = models.CharField(max_length=100)  # nazwa modelu AI
+    content = models.TextField()  # opis
+    created_at = models.DateTimeField(default=timezone.now)  # data wygenerowania
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["object_model", "object_id", "prompt_hash", "ai_model"], name="unique_ai_description"
+            )
+        ]
+        indexes = [models.Index(fields=["object_model", "object_id"])]
+
+    def __str__(self):
+        return f"{self.object_model} {self.object_id} ({self.ai_model})"
+
+
+class HomeParagraph(models.Model):
+    """Pre-generated AI paragraph for the home page (see 'tools.HomeParagraphPool')."""
+
+    content = models.TextField()  # treść akapitu
+    ai_model = models.CharField(max_length=100)  # nazwa modelu AI
+    created_at = models.DateTimeField(default=timezone.now)  # data wygenerowania
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} ({self.ai_model})"
+
+
+class AiPregenerationCheckpoint(models.Model):
+    """Progress of the bulk pre-generation of AI descriptions (see 'tools.AiPregenerator')."""
+
+    name = models.CharField(max_length=255, unique=True)  # nazwa przebiegu: model, województwa, warianty, model AI
+    last_id = models.BigIntegerField(default=0)  # klucz główny ostatniego przetworzonego obiektu
+    generated = models.IntegerField(default=0)  # liczba wygenerowanych opisów
+    skipped = models.IntegerField(default=0)  # liczba opisów zapisanych wcześniej
+    failed = models.IntegerField(default=0)  # liczba nieudanych zapytań
+    stopped_at = models.DateTimeField(null=True, blank=True)  # data przerwania przebiegu bez postępu (AI niedostępne)
+    attempts = models.IntegerField(default=0)  # liczba kolejnych przerwanych przebiegów na tym samym obiekcie
+    failed_ids = models.JSONField(default=list, blank=True)  # klucze obiektów pominiętych po 'attempts' próbach
+    finished_at = models.DateTimeField(null=True, blank=True)  # data przetworzenia wszystkich obiektów
+    updated_at = models.DateTimeField(auto_now=True)  # data zapisania postępu
+
+    def __str__(self):
+        return f"{self.name} (last_id={self.last_id})"
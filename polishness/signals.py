@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import ArcheologicalMonument
+from .models import GeographicalObject
+from .models import Monument
+from tools import AiDescriptionCache
+from tools import FacetIndex
+from tools import RandomSampler
+from tools import SearchIndex
+
+
+@receiver(post_save, sender=Monument)
+@receiver(post_save, sender=ArcheologicalMonument)
+@receiver(post_save, sender=GeographicalObject)
+def update_search_index(sender, instance, **kwargs):
+    """Keeps search indexes in sync with the saved catalog object, drops its (outdated) AI descriptions."""
+    SearchIndex.update_row(instance)
+    FacetIndex.invalidate()
+    RandomSampler.invalidate()
+    if not kwargs.get("created"):
+        AiDescriptionCache.invalidate(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Monument)
+@receiver(post_delete, sender=ArcheologicalMonument)
+@receiver(post_delete, sender=GeographicalObject)
+def delete_from_search_index(sender, instance, **kwargs):
+    """Removes the deleted catalog object from search indexes, drops its AI descriptions."""
+    SearchIndex.delete_row(instance)
+    FacetIndex.invalidate()
+    RandomSampler.invalidate()
+    AiDescriptionCache.invalidate(sender, [instance.pk])
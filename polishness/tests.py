@@ -1,3 +1,1095 @@
 from __future__ import annotations
 
-# Create your tests here.
+import csv
+import json
+import re
+import warnings
+from io import StringIO
+from datetime import datetime
+from datetime import timezone
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest.mock import ANY
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from time import sleep
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from mysite.celery_tasks import pregenerate_ai_descriptions
+from polishness.models import AiDescription
+from polishness.models import AiPregenerationCheckpoint
+from polishness.models import HomeParagraph
+from polishness.models import Monument
+from polishness.views import trips
+from tools import AiDescriptionCache
+from tools import AiMetrics
+from tools import AiPregenerator
+from tools import AiPrompts
+from tools import CatalogImporter
+from tools import DbwAreaTree
+from tools import FacetIndex
+from tools import GusApiDbwClient
+from tools import HomeParagraphPool
+from tools import JsonRecordsStore
+from tools import RandomSampler
+from tools import RecordReplayAiBackend
+from tools import ResultPages
+from tools import RouteOptimizer
+from tools import SearchIndex
+from tools import SingleFlight
+from tools import StubAiBackend
+
+
+def create_monument(name: str, locality: str = "", **fields) -> Monument:
+    """Creates monument with the given fields (remaining text fields are empty)."""
+    return Monument.objects.create(name=name, locality=locality, **fields)
+
+
+class CatalogTestCase(TestCase):
+    """Test case with the search index tables of the catalog models (created in every test transaction)."""
+
+    def setUp(self):
+        for model in SearchIndex.FIELDS:
+            SearchIndex.rebuild(model)
+
+
+class SearchIndexTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lodz = create_monument("Pałac Poznańskiego", locality="Łódź", function="pałac")
+        self.lodygowice = create_monument("Kościół", locality="Łodygowice", function="kościół")
+        self.krakow = create_monument("Sukiennice", locality="Kraków", function="hala targowa")
+
+    def get_ids(self, filters: dict) -> set[int]:
+        return set(SearchIndex.filter(Monument, filters).values_list("id", flat=True))
+
+    def test_match_is_diacritic_insensitive(self):
+        self.assertEqual(self.get_ids({"locality_normalized__contains": "lodz"}), {self.lodz.id})
+        self.assertEqual(self.get_ids({"locality_normalized__icontains": "krak"}), {self.krakow.id})
+
+    def test_match_goes_through_fts_subquery(self):
+        query = str(SearchIndex.filter(Monument, {"locality_normalized__contains": "lodz"}).query)
+        self.assertIn("MATCH", query)
+
+    def test_match_combines_phrases_and_regular_filters(self):
+        ids = self.get_ids({"locality_normalized__contains": "lod", "function_normalized__contains": "kosciol"})
+        self.assertEqual(ids, {self.lodygowice.id})
+        self.assertEqual(self.get_ids({"locality_normalized__contains": "lod", "name": "Sukiennice"}), set())
+
+    def test_short_phrase_falls_back_to_regular_lookup(self):
+        queryset = SearchIndex.filter(Monument, {"locality_normalized__contains": "lo"})
+        self.assertNotIn("MATCH", str(queryset.query))
+        self.assertEqual(set(queryset.values_list("id", flat=True)), {self.lodz.id, self.lodygowice.id})
+
+    def test_index_follows_saved_and_deleted_rows(self):
+        self.krakow.locality = "Łęczyca"
+        self.krakow.save()
+        self.assertEqual(self.get_ids({"locality_normalized__contains": "krakow"}), set())
+        self.assertEqual(self.get_ids({"locality_normalized__contains": "leczyca"}), {self.krakow.id})
+
+        created = create_monument("Ratusz", locality="Łódź")
+        self.assertEqual(self.get_ids({"locality_normalized__contains": "lodz"}), {self.lodz.id, created.id})
+
+        self.lodz.delete()
+        self.assertEqual(self.get_ids({"locality_normalized__contains": "lodz"}), {created.id})
+
+
+class FacetIndexTests(CatalogTestCase):
+    FILTERS = (
+        ({"voivodeship_normalized": "lodzkie"}, {}),
+        ({"voivodeship_normalized": "lodzkie", "county_normalized__contains": "lodz"}, {}),
+        ({"chronology__in": ["XIX w.", "XX w."], "county_normalized__icontains": "LODZ"}, {"chronology": "XX w."}),
+        ({"voivodeship_normalized__in": ["lodzkie", "malopolskie"], "latitude_value__isnull": False}, {}),
+        ({"parish_normalized__contains": "zgierz"}, {"voivodeship_normalized": "malopolskie"}),
+    )
+
+    def setUp(self):
+        super().setUp()
+        locations = (
+            ("Łódzkie", "Łódź", "Łódź", "XIX w.", "51.77", "19.46"),
+            ("Łódzkie", "łódzki wschodni", "Koluszki", "XX w.", "51.74", "19.82"),
+            ("Łódzkie", "zgierski", "Zgierz", "XIX w.", "", ""),
+            ("Małopolskie", "Kraków", "Kraków", "XIV w.", "50.06", "19.94"),
+            ("Małopolskie", "krakowski", "Zgierzówka", "XX w.", "50.10", "19.80"),
+        )
+        for number, (voivodeship, county, parish, chronology, latitude, longitude) in enumerate(locations):
+            create_monument(
+                f"Zabytek {number}",
+                voivodeship=voivodeship,
+                county=county,
+                parish=parish,
+                chronology=chronology,
+                latitude=latitude,
+                longitude=longitude,
+            )
+
+    def assert_matches_orm(self):
+        for filters, excludes in self.FILTERS:
+            with self.subTest(filters=filters, excludes=excludes):
+                expected = sorted(Monument.objects.filter(**filters).exclude(**excludes).values_list("id", flat=True))
+                self.assertEqual(FacetIndex.get_ids(Monument, filters, excludes).tolist(), expected)
+
+    def test_facet_lookups_match_orm(self):
+        self.assert_matches_orm()
+
+    def test_index_is_invalidated_by_save_and_delete(self):
+        self.assert_matches_orm()
+
+        monument = Monument.objects.get(parish="Kraków")
+        monument.voivodeship = "Łódzkie"
+        monument.county = "Łódź"
+        monument.save()
+        self.assert_matches_orm()
+
+        Monument.objects.get(parish="Koluszki").delete()
+        self.assert_matches_orm()
+
+    def test_unsupported_lookup_is_not_answered(self):
+        self.assertIsNone(FacetIndex.get_ids(Monument, {"name": "Zabytek 1"}))
+
+
+class RandomSamplerTests(CatalogTestCase):
+    def test_draw_returns_all_ids_if_quantity_is_not_lower(self):
+        ids = [3, 5, 8, 13]
+        for quantity in (4, 10):
+            with self.subTest(quantity=quantity):
+                self.assertCountEqual(RandomSampler.draw(ids, quantity), ids)
+
+    def test_draw_of_nothing(self):
+        self.assertEqual(RandomSampler.draw([1, 2, 3], 0), [])
+        self.assertEqual(RandomSampler.draw([], 5), [])
+
+    def test_draw_has_no_duplicates(self):
+        ids = list(range(100, 150))
+        for quantity in (1, 2, 25, 49):
+            with self.subTest(quantity=quantity):
+                drawn = RandomSampler.draw(np.array(ids), quantity)
+                self.assertEqual(len(drawn), quantity)
+                self.assertEqual(len(set(drawn)), quantity)
+                self.assertTrue(set(drawn) <= set(ids))
+
+    def test_filtered_samples_are_in_filtered_set(self):
+        for number in range(30):
+            create_monument(
+                f"Zabytek {number}",
+                locality=("Łódź", "Kraków", "Zgierz")[number % 3],
+                voivodeship=("Łódzkie", "Małopolskie")[number % 2],
+            )
+        cases = (
+            ({"voivodeship_normalized": "lodzkie"}, {}),  # facet index
+            ({"locality_normalized__contains": "lodz"}, {}),  # search index
+            ({"voivodeship_normalized": "lodzkie"}, {"locality_normalized__contains": "zgierz"}),
+        )
+        for filters, excludes in cases:
+            with self.subTest(filters=filters, excludes=excludes):
+                expected = set(Monument.objects.filter(**filters).exclude(**excludes).values_list("id", flat=True))
+                ids = RandomSampler.sample_ids_filtered(Monument, 4, filters, excludes)
+                self.assertEqual(len(ids), len(set(ids)))
+                self.assertEqual(len(ids), 4)
+                self.assertTrue(set(ids) <= expected)
+
+                items = RandomSampler.sample_filtered(Monument, 4, filters, excludes)
+                self.assertEqual(len({item.id for item in items}), 4)
+                self.assertTrue({item.id for item in items} <= expected)
+
+                all_items = RandomSampler.sample_filtered(Monument, 100, filters, excludes)
+                self.assertEqual({item.id for item in all_items}, expected)
+
+
+class CatalogImporterTests(CatalogTestCase):
+    """Tests of the catalog import from the CSV files (the static directory is replaced with a temporary one)."""
+
+    def setUp(self):
+        super().setUp()
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.static_dir = directory.name + "/"
+        static_dir_patcher = patch("tools.get_static_dir", return_value=self.static_dir)
+        static_dir_patcher.start()
+        self.addCleanup(static_dir_patcher.stop)
+
+    def write_monuments(self, rows: list[tuple[str, str, str]]) -> None:
+        """Writes the monuments CSV file with the rows of the library id, name and locality."""
+        fields = CatalogImporter.SOURCES[Monument]["fields"]
+        with open(join(self.static_dir, CatalogImporter.SOURCES[Monument]["file_name"]), "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            for library_id, name, locality in rows:
+                values = dict.fromkeys(fields, "")
+                values.update(library_id=library_id, name=name, locality=locality, latitude="51.1", longitude="19.2")
+                writer.writerow(values[field] for field in fields)
+
+    def test_failed_import_keeps_rows_and_indexes(self):
+        self.write_monuments([("A1", "Ratusz", "Łódź"), ("A2", "Kościół", "Zgierz"), ("A3", "Dwór", "Koluszki")])
+        CatalogImporter.import_model(Monument)
+        self.write_monuments([("B1", "Pałac", "Kraków"), ("B2", "Młyn", "Tarnów")])
+
+        with patch.object(CatalogImporter, "insert_rows", side_effect=[1, OSError("przerwany import")]):
+            with self.assertRaises(OSError):
+                CatalogImporter.import_model(Monument, chunk_size=1)
+
+        self.assertEqual(sorted(Monument.objects.values_list("library_id", flat=True)), ["A1", "A2", "A3"])
+        self.assertEqual(CatalogImporter.get_missing_indexes(Monument), [])
+
+    def test_import_command_recreates_missing_indexes(self):
+        self.write_monuments([("A1", "Ratusz", "Łódź")])
+        self.assertEqual(CatalogImporter.get_missing_indexes(Monument), [])
+        dropped_indexes = CatalogImporter.drop_indexes(Monument)
+        self.assertEqual(len(CatalogImporter.get_missing_indexes(Monument)), len(dropped_indexes))
+
+        output = StringIO()
+        call_command("import_catalog", "monument", "--keep-indexes", stdout=output)
+
+        self.assertIn(f"odtworzono {len(dropped_indexes)} brakujących indeksów", output.getvalue())
+        self.assertEqual(CatalogImporter.get_missing_indexes(Monument), [])
+        self.assertEqual(list(Monument.objects.values_list("library_id", flat=True)), ["A1"])
+
+    def test_sync_writes_only_changed_rows(self):
+        self.write_monuments(
+            [
+                ("A1", "Ratusz", "Łódź"),
+                ("A2", "Kościół", "Zgierz"),
+                ("A2", "Kaplica", "Zgierz"),
+                ("A3", "Dwór", "Koluszki"),
+                ("A4", "Spichlerz", "Łowicz"),
+            ]
+        )
+        CatalogImporter.import_model(Monument)
+        ids = {(item.library_id, item.name): item.id for item in Monument.objects.all()}
+        for object_id in ids.values():
+            AiDescription.objects.create(
+                object_model="polishness.monument", object_id=object_id, prompt_hash="x", ai_model="m", content="opis"
+            )
+
+        self.write_monuments(
+            [
+                ("A1", "Ratusz", "Łódź"),
+                ("A2", "Kościół", "Zgierz"),
+                ("A2", "Kaplica św. Anny", "Zgierz"),
+                ("A2", "Krzyż", "Zgierz"),
+                ("A4", "Spichlerz", "Łowicz nad Bzurą"),
+                ("A5", "Młyn", "Tarnów"),
+            ]
+        )
+        stats = CatalogImporter.sync_model(Monument, chunk_size=2)  # duplicated keys in separate chunks
+
+        self.assertEqual(
+            {key: stats[key] for key in ("inserted", "updated", "deleted", "unchanged")},
+            {"inserted": 2, "updated": 2, "deleted": 1, "unchanged": 2},
+        )
+        synced_ids = {(item.library_id, item.name): item.id for item in Monument.objects.all()}
+        for key in (("A1", "Ratusz"), ("A2", "Kościół"), ("A4", "Spichlerz")):
+            self.assertEqual(synced_ids[key], ids[key])
+        self.assertEqual(synced_ids[("A2", "Kaplica św. Anny")], ids[("A2", "Kaplica")])
+        self.assertNotIn(ids[("A3", "Dwór")], synced_ids.values())
+        self.assertEqual(Monument.objects.get(id=ids[("A4", "Spichlerz")]).locality_normalized, "lowicz nad bzura")
+
+        described_ids = set(AiDescription.objects.values_list("object_id", flat=True))
+        self.assertEqual(described_ids, {ids[("A1", "Ratusz")], ids[("A2", "Kościół")]})
+
+        self.assertEqual(
+            CatalogImporter.sync_model(Monument),
+            {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 6, "seconds": ANY},
+        )
+
+
+class ResultsViewTests(CatalogTestCase):
+    MONUMENT_LINK = re.compile(r'href="/monument/(\d+)/"')
+    NEXT_URL = re.compile(r'href="(/results/(\w+)/\?after=\d+)"')
+
+    def setUp(self):
+        super().setUp()
+        for number in range(120):
+            create_monument(f"Zabytek {number}", voivodeship="Łódzkie")
+
+    def search(self, quantity: int) -> tuple[list[int], str, str]:
+        """Searches monuments, returns shown primary keys, the next page url and the results token."""
+        response = self.client.post(reverse("polishness:monuments"), {"voivodeship": "Łódzkie", "quantity": quantity})
+        self.assertEqual(response.status_code, 200)
+        next_url, token = self.NEXT_URL.search(response.content.decode()).groups()
+        return self.get_shown_ids(response.content), next_url, token
+
+    def get_shown_ids(self, content: bytes) -> list[int]:
+        return [int(pk) for pk in self.MONUMENT_LINK.findall(content.decode())]
+
+    def test_first_page_keeps_drawn_order(self):
+        shown_ids, _, token = self.search(100)
+
+        kind, ids = ResultPages.load(token)
+        self.assertEqual(kind, "monument")
+        self.assertEqual(len(set(ids.tolist())), 100)
+        self.assertEqual(shown_ids, ids[: ResultPages.PAGE_SIZE].tolist())
+        self.assertNotEqual(ids.tolist(), sorted(ids.tolist()))  # random order, not the primary key order
+
+    def test_next_page_follows_cursor(self):
+        shown_ids, next_url, token = self.search(100)
+        response = self.client.get(next_url)
+
+        self.assertEqual(response.status_code, 200)
+        _, ids = ResultPages.load(token)
+        self.assertEqual(shown_ids + self.get_shown_ids(response.content), ids.tolist())
+        self.assertIsNone(self.NEXT_URL.search(response.content.decode()))
+
+    def test_unknown_or_expired_results_are_not_found(self):
+        self.assertEqual(self.client.get(reverse("polishness:results", args=["unknown"])).status_code, 404)
+
+        _, _, token = self.search(100)
+        unknown_id = Monument.objects.order_by("-id").first().id + 1
+        response = self.client.get(reverse("polishness:results", args=[token]), {"after": unknown_id})
+        self.assertEqual(response.status_code, 404)
+
+        with patch.object(ResultPages, "load", return_value=None):
+            self.assertEqual(self.client.get(reverse("polishness:results", args=[token])).status_code, 404)
+
+    async def test_stream_is_not_buffered_under_asgi(self):
+        _, _, token = await sync_to_async(self.search)(100)
+        with patch.object(ResultPages, "CHUNK_SIZE", 30), patch.object(
+            ResultPages, "get_page", wraps=ResultPages.get_page
+        ) as get_page, warnings.catch_warnings():
+            warnings.simplefilter("error")
+            response = await self.async_client.get(reverse("polishness:results", args=[token]), {"stream": 1})
+            self.assertTrue(response.is_async)
+            fetched_chunks = [get_page.call_count async for _ in response]
+
+        # rows are fetched chunk by chunk, while the response is sent
+        self.assertEqual(fetched_chunks, [0, 1, 2, 3, 4, 4])
+
+    async def test_stream_renders_all_results_in_chunks(self):
+        _, _, token = await sync_to_async(self.search)(100)
+        with patch.object(ResultPages, "CHUNK_SIZE", 30):
+            response = await self.async_client.get(reverse("polishness:results", args=[token]), {"stream": 1})
+            parts = [part async for part in response]
+
+        self.assertEqual(len(parts), 2 + 4)  # page beginning, chunks of 30, 30, 30, 10 rows and page ending
+        chunk_ids = [self.get_shown_ids(part) for part in parts[1:-1]]
+        self.assertEqual([len(ids) for ids in chunk_ids], [30, 30, 30, 10])
+        _, ids = await sync_to_async(ResultPages.load)(token)
+        self.assertEqual(sum(chunk_ids, []), ids.tolist())
+        self.assertIn("(ilość: 100)", parts[0].decode())
+
+
+class AiDescriptionCacheTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        AiDescriptionCache.invalidate()
+        self.lodz = create_monument("Pałac Poznańskiego", locality="Łódź")
+        self.krakow = create_monument("Sukiennice", locality="Kraków")
+        AiDescriptionCache.set(self.lodz, "pytanie", "opis Łodzi", ai_model="m")
+        AiDescriptionCache.set(self.krakow, "pytanie", "opis Krakowa", ai_model="m")
+
+    def invalidate_in_other_process(self, ids: list[int]) -> None:
+        """Invalidates descriptions like another process does (the LRU of this process is not touched)."""
+        AiDescription.objects.filter(object_id__in=ids).delete()
+        version_key = AiDescriptionCache.VERSION_CACHE_KEY.format(label="polishness.monument")
+        cache.add(version_key, 0, None)
+        version = cache.incr(version_key)
+        cache.set(
+            AiDescriptionCache.INVALIDATION_CACHE_KEY.format(label="polishness.monument", version=version),
+            {"ids": ids},
+        )
+
+    def test_version_is_checked_once_per_interval(self):
+        with patch("tools.cache.get_many", wraps=cache.get_many) as get_many:
+            with patch.object(AiDescriptionCache, "VERSION_CHECK_INTERVAL", 3600):
+                for _ in range(10):
+                    self.assertEqual(AiDescriptionCache.get(self.lodz, "pytanie", ai_model="m"), "opis Łodzi")
+            self.assertLessEqual(get_many.call_count, 1)
+
+            call_count = get_many.call_count
+            with patch.object(AiDescriptionCache, "VERSION_CHECK_INTERVAL", 0):
+                AiDescriptionCache.get(self.lodz, "pytanie", ai_model="m")
+            self.assertEqual(get_many.call_count, call_count + 1)
+
+    def test_other_process_invalidation_drops_only_invalidated_objects(self):
+        with patch.object(AiDescriptionCache, "VERSION_CHECK_INTERVAL", 3600):
+            AiDescriptionCache.get(self.lodz, "pytanie", ai_model="m")
+            self.invalidate_in_other_process([self.lodz.id])
+            # outdated description is served until the next version check
+            self.assertEqual(AiDescriptionCache.get(self.lodz, "pytanie", ai_model="m"), "opis Łodzi")
+
+        with patch.object(AiDescriptionCache, "VERSION_CHECK_INTERVAL", 0):
+            self.assertIsNone(AiDescriptionCache.get(self.lodz, "pytanie", ai_model="m"))
+            with self.assertNumQueries(0):
+                self.assertEqual(AiDescriptionCache.get(self.krakow, "pytanie", ai_model="m"), "opis Krakowa")
+
+    def test_missed_invalidations_drop_all_descriptions_of_model(self):
+        AiDescriptionCache.get(self.krakow, "pytanie", ai_model="m")
+        for _ in range(AiDescriptionCache.MAX_INVALIDATIONS + 1):
+            self.invalidate_in_other_process([self.lodz.id])
+
+        with patch.object(AiDescriptionCache, "VERSION_CHECK_INTERVAL", 0), self.assertNumQueries(1):
+            self.assertEqual(AiDescriptionCache.get(self.krakow, "pytanie", ai_model="m"), "opis Krakowa")
+
+    def test_saved_object_drops_only_its_descriptions(self):
+        self.lodz.name = "Pałac Izraela Poznańskiego"
+        self.lodz.save()
+
+        self.assertIsNone(AiDescriptionCache.get(self.lodz, "pytanie", ai_model="m"))
+        with self.assertNumQueries(0):
+            self.assertEqual(AiDescriptionCache.get(self.krakow, "pytanie", ai_model="m"), "opis Krakowa")
+
+
+class RouteOptimizerTests(TestCase):
+    def get_points(self, seed: int, size: int = 40) -> tuple[list[float], list[float]]:
+        generator = np.random.default_rng(seed)
+        return generator.uniform(49.0, 54.8, size).tolist(), generator.uniform(14.1, 24.1, size).tolist()
+
+    def test_route_is_permutation_of_points(self):
+        latitudes, longitudes = self.get_points(1)
+        for start in (None, (52.23, 21.01)):
+            with self.subTest(start=start):
+                route = RouteOptimizer.solve(latitudes, longitudes, start=start)
+                self.assertEqual(sorted(route), list(range(len(latitudes))))
+
+        self.assertEqual(RouteOptimizer.solve([], []), [])
+        self.assertEqual(RouteOptimizer.solve([50.0], [20.0], start=(52.0, 21.0)), [0])
+
+    def test_route_starts_at_start_point(self):
+        latitudes = [51.0, 49.5, 53.5, 50.0, 52.5, 54.0]
+        longitudes = [19.0] * len(latitudes)
+        by_latitude = sorted(range(len(latitudes)), key=lambda index: latitudes[index])
+
+        self.assertEqual(RouteOptimizer.solve(latitudes, longitudes, start=(49.0, 19.0)), by_latitude)
+        self.assertEqual(RouteOptimizer.solve(latitudes, longitudes, start=(54.5, 19.0)), by_latitude[::-1])
+
+    def test_route_is_not_longer_than_nearest_neighbour_route(self):
+        for seed in range(10):
+            latitudes, longitudes = self.get_points(seed)
+            for start in (None, (52.23, 21.01)):
+                with self.subTest(seed=seed, start=start):
+                    matrix = RouteOptimizer.get_distance_matrix(latitudes, longitudes, start)
+                    route = RouteOptimizer.solve(latitudes, longitudes, start=start)
+                    tour = np.array([0] + [index + 1 for index in route])
+                    nearest_neighbour_length = RouteOptimizer.get_route_length(
+                        RouteOptimizer.nearest_neighbour(matrix), matrix
+                    )
+                    self.assertLessEqual(
+                        RouteOptimizer.get_route_length(tour, matrix), nearest_neighbour_length + RouteOptimizer.EPSILON
+                    )
+
+
+class TripsViewTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        for number in range(8):
+            create_monument(f"Zabytek {number}", latitude=f"{50 + number * 0.3:.2f}", longitude="19.5")
+        create_monument("Zabytek bez współrzędnych")
+
+    def get_trip(self, data: dict) -> list[Monument]:
+        request = RequestFactory().post("/trips/", data)
+        with patch("polishness.views.render", return_value=None) as render:
+            trips(request)
+        return render.call_args.args[2]["monuments"]
+
+    def test_trip_without_start_point(self):
+        monuments = self.get_trip({"quantity": 5})
+
+        self.assertEqual(len(monuments), 5)
+        self.assertEqual(len({monument.id for monument in monuments}), 5)
+        self.assertTrue(all(monument.latitude_value is not None for monument in monuments))
+        latitudes = [monument.latitude_value for monument in monuments]
+        self.assertIn(latitudes, (sorted(latitudes), sorted(latitudes, reverse=True)))
+
+    def test_trip_with_start_point(self):
+        monuments = self.get_trip({"quantity": 8, "start_latitude": "49.0", "start_longitude": "19.5"})
+
+        self.assertEqual(
+            [monument.latitude_value for monument in monuments], [50 + number * 0.3 for number in range(8)]
+        )
+
+
+class SingleFlightTests(TestCase):
+    CALLERS = 10
+
+    def setUp(self):
+        self.calls = 0
+
+    async def lookup(self):
+        return None
+
+    async def test_concurrent_calls_compute_once(self):
+        async def compute() -> str:
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return "wynik"
+
+        results = await asyncio.gather(
+            *(SingleFlight.arun("test-once", compute, self.lookup, timeout=5) for _ in range(self.CALLERS))
+        )
+
+        self.assertEqual(results, ["wynik"] * self.CALLERS)
+        self.assertEqual(self.calls, 1)
+
+    async def test_waiters_compute_when_leader_fails(self):
+        async def compute() -> str:
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            if self.calls == 1:
+                raise ConnectionError("awaria lidera")
+            return "wynik"
+
+        results = await asyncio.gather(
+            *(SingleFlight.arun("test-failure", compute, self.lookup, timeout=5) for _ in range(self.CALLERS)),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(results[0], ConnectionError)
+        self.assertEqual(results[1:], ["wynik"] * (self.CALLERS - 1))
+        self.assertEqual(self.calls, 2)
+
+    def test_waiting_threads_compute_when_leader_fails(self):
+        barrier = Barrier(self.CALLERS)
+
+        def compute() -> str:
+            self.calls += 1
+            sleep(0.1)
+            if self.calls == 1:
+                raise ConnectionError("awaria lidera")
+            return "wynik"
+
+        def call():
+            barrier.wait()
+            try:
+                return SingleFlight.run("test-thread-failure", compute, lambda: None, timeout=5)
+            except ConnectionError as error:
+                return error
+
+        with ThreadPoolExecutor(self.CALLERS) as executor:
+            results = list(executor.map(lambda _: call(), range(self.CALLERS)))
+
+        self.assertEqual(sum(isinstance(result, ConnectionError) for result in results), 1)
+        self.assertEqual(results.count("wynik"), self.CALLERS - 1)
+        self.assertEqual(self.calls, 2)
+
+
+class FailingStubAiBackend(StubAiBackend):
+    """Stub backend timing out on the questions about the objects named in the 'FAILING' (others answered at once)."""
+
+    FAILING = set()
+
+    def get_answer(self, ask: str) -> tuple[list[str], float]:
+        parts, _ = super().get_answer(ask)
+        return parts, 3600.0 if any(name in ask for name in self.FAILING) else 0.0
+
+
+@override_settings(
+    AI_BACKEND={"BACKEND": "polishness.tests.FailingStubAiBackend", "OPTIONS": {"part_delay": 0}},
+    AI_TIMEOUT=0.01,
+    AI_BUDGET=0.05,
+    AI_MAX_RETRIES=0,
+    AI_PREGENERATION_RPM=60000,
+)
+class AiPregeneratorTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        AiDescriptionCache.invalidate()
+        self.monuments = [create_monument(f"Zabytek {number}", voivodeship="Łódzkie") for number in range(7)]
+        self.addCleanup(FailingStubAiBackend.FAILING.clear)
+
+    def get_described_ids(self) -> set[int]:
+        return set(AiDescription.objects.values_list("object_id", flat=True))
+
+    def test_checkpoint_stops_before_failed_object(self):
+        FailingStubAiBackend.FAILING.add("Zabytek 4")
+        pregenerator = AiPregenerator("monument", variants=("short",))
+        with patch.object(AiPregenerator, "BATCH_SIZE", 3):
+            checkpoint = pregenerator.run()
+
+        self.assertEqual(checkpoint.last_id, self.monuments[3].id)
+        self.assertIsNone(checkpoint.finished_at)
+        self.assertEqual(checkpoint.failed, 2)  # in the batch of the objects 3-5 and again in the batch 4-6
+        self.assertEqual(
+            self.get_described_ids(), {monument.id for monument in self.monuments} - {self.monuments[4].id}
+        )
+
+        FailingStubAiBackend.FAILING.clear()
+        with patch.object(AiPregenerator, "BATCH_SIZE", 3):
+            checkpoint = pregenerator.run()
+
+        self.assertEqual(checkpoint.last_id, self.monuments[-1].id)
+        self.assertIsNotNone(checkpoint.finished_at)
+        self.assertEqual(self.get_described_ids(), {monument.id for monument in self.monuments})
+
+    def test_stopped_run_is_reported_and_object_is_passed_after_max_attempts(self):
+        FailingStubAiBackend.FAILING.add("Zabytek 0")
+        pregenerator = AiPregenerator("monument", variants=("short",))
+        with patch.object(AiPregenerator, "MAX_ATTEMPTS", 2):
+            checkpoint = pregenerator.run()
+
+            self.assertIsNotNone(checkpoint.stopped_at)
+            self.assertIsNone(checkpoint.finished_at)
+            self.assertEqual((checkpoint.last_id, checkpoint.attempts), (0, 1))
+            self.assertEqual(pregenerator.get_retry_countdown(checkpoint), AiPregenerator.RETRY_COUNTDOWN)
+
+            checkpoint = pregenerator.run()
+
+        self.assertIsNone(checkpoint.stopped_at)
+        self.assertIsNotNone(checkpoint.finished_at)
+        self.assertEqual((checkpoint.attempts, checkpoint.failed_ids), (0, [self.monuments[0].id]))
+        self.assertEqual(self.get_described_ids(), {monument.id for monument in self.monuments[1:]})
+
+    def test_retry_countdown_grows_up_to_maximum(self):
+        pregenerator = AiPregenerator("monument")
+        countdowns = [
+            pregenerator.get_retry_countdown(AiPregenerationCheckpoint(attempts=attempts)) for attempts in range(1, 9)
+        ]
+
+        self.assertEqual(countdowns[:3], [60, 120, 240])
+        self.assertEqual(countdowns[-1], AiPregenerator.MAX_RETRY_COUNTDOWN)
+
+    def test_stopped_task_is_requeued_with_countdown(self):
+        FailingStubAiBackend.FAILING.add("Zabytek 0")
+        with patch.object(pregenerate_ai_descriptions, "apply_async") as apply_async:
+            pregenerate_ai_descriptions.run(kinds=["monument"], variants=["short"])
+            pregenerate_ai_descriptions.run(kinds=["monument"], variants=["short"])
+
+        self.assertEqual([call.kwargs["countdown"] for call in apply_async.call_args_list], [60, 120])
+
+
+@override_settings(
+    AI_BACKEND={"BACKEND": "polishness.tests.FailingStubAiBackend", "OPTIONS": {"part_delay": 0}},
+    AI_TIMEOUT=0.01,
+    AI_BUDGET=0.05,
+    AI_MAX_RETRIES=0,
+    HOME_PARAGRAPH_POOL_SIZE=4,
+    HOME_PARAGRAPH_REFRESH_COUNT=2,
+)
+class HomeParagraphPoolTests(TestCase):
+    def setUp(self):
+        self.reset_local_pool()
+        self.addCleanup(self.reset_local_pool)
+        self.addCleanup(FailingStubAiBackend.FAILING.clear)
+
+    @staticmethod
+    def reset_local_pool():
+        HomeParagraphPool._HomeParagraphPool__pool = (0.0, [])
+
+    def test_empty_pool_returns_fallback(self):
+        self.assertEqual(HomeParagraphPool.pick(), HomeParagraphPool.FALLBACK)
+
+    def test_refresh_fills_pool_and_then_replaces_oldest_paragraphs(self):
+        self.assertEqual(HomeParagraphPool.refresh(), 4)
+        ids = list(HomeParagraph.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+        self.assertEqual(HomeParagraphPool.refresh(), 2)
+        self.assertEqual(HomeParagraph.objects.count(), 4)
+        self.assertEqual(set(HomeParagraph.objects.values_list("id", flat=True)) & set(ids), set(ids[:2]))
+        self.assertIn(HomeParagraphPool.pick(), HomeParagraph.objects.values_list("content", flat=True))
+
+    def test_unavailable_ai_keeps_existing_paragraphs(self):
+        contents = [f"Akapit {number}" for number in range(4)]
+        for content in contents:
+            HomeParagraph.objects.create(content=content, ai_model="m")
+        FailingStubAiBackend.FAILING.add(AiPrompts.HOME)
+
+        self.assertEqual(HomeParagraphPool.refresh(), 0)
+        self.assertCountEqual(HomeParagraph.objects.values_list("content", flat=True), contents)
+        self.assertIn(HomeParagraphPool.pick(), contents)
+
+
+@override_settings(
+    AI_BACKEND={"BACKEND": "polishness.tests.FailingStubAiBackend", "OPTIONS": {"part_delay": 0}},
+    AI_TIMEOUT=0.01,
+    AI_BUDGET=0.05,
+    AI_MAX_RETRIES=0,
+)
+class AiViewsTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        AiDescriptionCache.invalidate()
+        self.monument = create_monument("Zamek", "Malbork")
+
+    @staticmethod
+    def parse_events(body: str) -> list[tuple[str, object]]:
+        """Splits server-sent events body into (event name, data) pairs ('message' for the unnamed events)."""
+        events = []
+        for block in filter(None, body.split("\n\n")):
+            fields = dict(line.split(": ", 1) for line in block.split("\n"))
+            events.append((fields.get("event", "message"), json.loads(fields["data"])))
+        return events
+
+    async def get_stream_events(self) -> list[tuple[str, object]]:
+        response = await self.async_client.get(reverse("polishness:monument_single_ai_stream", args=[self.monument.id]))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return self.parse_events(b"".join([part async for part in response]).decode())
+
+    async def test_stream_sends_answer_in_parts_and_then_from_cache(self):
+        events = await self.get_stream_events()
+        parts = [data for event, data in events if event == "message"]
+        prompt = AiPrompts.for_object(self.monument)
+
+        self.assertGreater(len(parts), 1)
+        self.assertEqual(events[-1][0], "end")
+        self.assertEqual("".join(parts), await sync_to_async(AiDescriptionCache.get)(self.monument, prompt))
+
+        with patch("tools.ask_ai_stream") as ask_ai_stream:
+            events = await self.get_stream_events()
+
+        ask_ai_stream.assert_not_called()
+        self.assertEqual(events, [("message", "".join(parts)), ("end", {})])
+
+    async def test_stream_of_missing_object_is_not_found(self):
+        response = await self.async_client.get(reverse("polishness:monument_single_ai_stream", args=[0]))
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(AI_FRAGMENT_MAX_AGE=123)
+    def test_fragment_is_cacheable(self):
+        response = self.client.get(reverse("polishness:monument_single_ai_fragment", args=[self.monument.id]))
+        prompt = AiPrompts.for_object(self.monument, short=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response["Cache-Control"].split(", ")), {"public", "max-age=123"})
+        self.assertIn(AiDescriptionCache.get(self.monument, prompt), response.content.decode())
+
+    def test_fragment_of_missing_object_is_not_found(self):
+        response = self.client.get(reverse("polishness:monument_single_ai_fragment", args=[0]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class RecordReplayAiBackendTests(TestCase):
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = join(directory.name, "ai_recordings.json")
+
+    def get_recording_backend(self) -> RecordReplayAiBackend:
+        backend = RecordReplayAiBackend(self.path, record=True)
+        backend.backend = StubAiBackend(latency_median=0, latency_sigma=0, part_delay=0)
+        return backend
+
+    def read_lines(self) -> list[str]:
+        with open(self.path, encoding="utf-8") as file:
+            return file.readlines()
+
+    def test_answers_are_appended_and_replayed(self):
+        backend = self.get_recording_backend()
+        answers = [backend.complete(f"Pytanie {number}", model="m", timeout=1) for number in range(3)]
+        lines = self.read_lines()
+        backend.complete("Pytanie 3", model="m", timeout=1)
+
+        self.assertEqual(self.read_lines()[:3], lines)  # earlier recordings are not rewritten
+        self.assertEqual(len(self.read_lines()), 4)
+        replay = RecordReplayAiBackend(self.path)
+        usage = {}
+        self.assertEqual(replay.complete("Pytanie 1", model="m", timeout=1, usage=usage), answers[1])
+        self.assertEqual(usage["completion_tokens"], len(answers[1].split()))
+
+    def test_former_json_object_is_converted_to_lines(self):
+        recording = {"model": "m", "ask": "Pytanie", "answer": "Odpowiedź", "usage": {}}
+        key = RecordReplayAiBackend.get_key("Pytanie", "m")
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump({key: recording}, file, ensure_ascii=False, indent=1)
+
+        self.assertEqual(RecordReplayAiBackend(self.path).complete("Pytanie", model="m", timeout=1), "Odpowiedź")
+        backend = self.get_recording_backend()
+        backend.complete("Inne pytanie", model="m", timeout=1)
+
+        self.assertEqual([json.loads(line)["key"] for line in self.read_lines()][0], key)
+        self.assertEqual(len(self.read_lines()), 2)
+        self.assertEqual(RecordReplayAiBackend(self.path).complete("Pytanie", model="m", timeout=1), "Odpowiedź")
+
+    def test_broken_line_is_skipped(self):
+        backend = self.get_recording_backend()
+        answer = backend.complete("Pytanie", model="m", timeout=1)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write('{"key": "przerwany zap')
+
+        self.assertEqual(RecordReplayAiBackend(self.path).complete("Pytanie", model="m", timeout=1), answer)
+
+
+class AiMetricsTests(TestCase):
+    STARTED_AT = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+    def setUp(self):
+        self.addCleanup(AiMetrics.reset)
+        AiMetrics._AiMetrics__views = None  # registry of the process, which was not started yet
+
+    def test_registry_is_started_by_first_request(self):
+        with patch("tools.timezone.now", return_value=self.STARTED_AT):
+            AiMetrics.start_request()
+        AiMetrics.set_view("polishness:home")
+        AiMetrics.record("pytanie", "gpt-3.5-turbo", started=0, cache="hit")
+        AiMetrics.start_request()
+
+        snapshot = AiMetrics.snapshot()
+        self.assertEqual(snapshot["started_at"], self.STARTED_AT.isoformat())
+        self.assertEqual(snapshot["views"]["polishness:home"]["cache"], {"hit": 1})
+
+    def test_reset_clears_registry(self):
+        AiMetrics.record("pytanie", "gpt-3.5-turbo", started=0, cache="miss")
+        with patch("tools.timezone.now", return_value=self.STARTED_AT):
+            AiMetrics.reset()
+
+        self.assertEqual(AiMetrics.snapshot()["views"], {})
+        self.assertEqual(AiMetrics.snapshot()["started_at"], self.STARTED_AT.isoformat())
+
+
+class EnrichStatsDataTests(TestCase):
+    SECTION_DIMENSIONS = [
+        {"id-wymiar": 1, "nazwa-wymiar": "Wyroby spożywcze", "id-pozycja": 11, "nazwa-pozycja": "Cukier [kg]"},
+        {"id-wymiar": 1, "nazwa-wymiar": "Wyroby spożywcze", "id-pozycja": 12, "nazwa-pozycja": "Mąka [kg]"},
+        {"id-wymiar": 2, "nazwa-wymiar": "Region", "id-pozycja": 21, "nazwa-pozycja": "Polska"},
+    ]
+
+    def setUp(self):
+        measures_patcher = patch.object(GusApiDbwClient, "REPRESENTATION_MEASURES", {180: {"nazwa": "Cena [zł]"}})
+        measures_patcher.start()
+        self.addCleanup(measures_patcher.stop)
+
+    def test_rows_are_enriched(self):
+        stats_data = [
+            {
+                "id-wymiar-1": 1,
+                "id-pozycja-1": 12,
+                "id-wymiar-2": 2,
+                "id-pozycja-2": 21,
+                "id-sposob-prezentacji-miara": 180,
+            },
+            {
+                "id-wymiar-1": 1,
+                "id-pozycja-1": 99,
+                "id-wymiar-2": 0,
+                "id-pozycja-2": 0,
+                "id-sposob-prezentacji-miara": 999,
+            },
+        ]
+
+        self.assertIs(GusApiDbwClient.enrich_stats_data(stats_data, self.SECTION_DIMENSIONS), stats_data)
+        descriptions = [{key: row[key] for key in row if "description" in key} for row in stats_data]
+        self.assertEqual(
+            descriptions,
+            [
+                {
+                    "dimension_description": "Wyroby spożywcze / Mąka [kg]",
+                    "dimension_description_beta": "Region / Polska",
+                    "dimension_description_gamma": "-",
+                    "representation_description": "Cena [zł]",
+                },
+                {
+                    "dimension_description": "",  # unknown position
+                    "dimension_description_beta": "-",  # no dimension
+                    "dimension_description_gamma": "-",
+                    "representation_description": "",  # unknown measure
+                },
+            ],
+        )
+
+    def test_row_without_dimension(self):
+        stats_data = [{"id-wymiar-1": None, "id-pozycja-1": None, "id-sposob-prezentacji-miara": 180}]
+
+        GusApiDbwClient.enrich_stats_data(stats_data, self.SECTION_DIMENSIONS)
+
+        self.assertEqual(stats_data[0]["dimension_description"], "-")
+        self.assertEqual(stats_data[0]["dimension_description_beta"], "-")
+        self.assertEqual(stats_data[0]["representation_description"], "Cena [zł]")
+
+
+def mock_dbw_response(data, status_code: int = 200) -> Mock:
+    """Creates mock of the DBW API response with the given JSON data."""
+    return Mock(status_code=status_code, json=Mock(return_value=data))
+
+
+class DbwAreaTreeTests(TestCase):
+    AREAS = [
+        {"id": 1, "nazwa": "Gospodarka", "id-nadrzedny-element": None},
+        {"id": 2, "nazwa": "Ceny", "id-nadrzedny-element": 1},
+    ]
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = join(directory.name, "dbw_area_tree.json")
+        settings_override = override_settings(DBW_AREA_TREE_PATH=self.path, DBW_AREA_TREE_TTL=60)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.reset_tree()
+        self.addCleanup(self.reset_tree)
+
+    @staticmethod
+    def reset_tree():
+        DbwAreaTree._DbwAreaTree__tree = None
+        DbwAreaTree._DbwAreaTree__retry_at = 0.0
+        DbwAreaTree._DbwAreaTree__is_refreshing = False
+
+    def write_tree(self, areas: list[dict], fetched_at: float):
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump({"fetched_at": fetched_at, "areas": areas}, file)
+
+    def test_first_start_downloads_and_persists_tree(self):
+        with patch("tools.requests.get", return_value=mock_dbw_response(self.AREAS)) as get:
+            self.assertEqual(DbwAreaTree.get_children(None), self.AREAS[:1])
+            self.assertEqual(DbwAreaTree.get_area(2), self.AREAS[1])
+
+        get.assert_called_once()
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["areas"], self.AREAS)
+
+    def test_stale_tree_is_served_while_refreshed(self):
+        self.write_tree(self.AREAS[:1], fetched_at=datetime.now().timestamp() - 3600)
+        new_areas = [*self.AREAS, {"id": 3, "nazwa": "Ludność", "id-nadrzedny-element": None}]
+        with patch("tools.requests.get", return_value=mock_dbw_response(new_areas)) as get, patch(
+            "tools.Thread"
+        ) as thread:
+            self.assertEqual(DbwAreaTree.get_children(None), self.AREAS[:1])  # persisted copy, no DBW API call
+            get.assert_not_called()
+            thread.return_value.start.assert_called_once()
+
+            thread.call_args.kwargs["target"]()  # background refresh
+
+        get.assert_called_once()
+        self.assertEqual([area["id"] for area in DbwAreaTree.get_children(None)], [1, 3])
+        self.assertEqual(DbwAreaTree.get_children(1), self.AREAS[1:])
+
+    def test_failed_refresh_keeps_stale_tree(self):
+        self.write_tree(self.AREAS, fetched_at=datetime.now().timestamp() - 3600)
+        with patch("tools.requests.get", return_value=mock_dbw_response(None, status_code=500)), patch(
+            "tools.Thread"
+        ) as thread:
+            DbwAreaTree.get_tree()
+            thread.call_args.kwargs["target"]()
+            thread.reset_mock()
+
+            self.assertEqual(DbwAreaTree.get_children(None), self.AREAS[:1])
+            thread.assert_not_called()  # next attempt after the retry interval
+
+
+class JsonRecordsStoreTests(TestCase):
+    SECTION_PERIODS = [
+        {"id-zmienna": 1679, "id-przekroj": 2, "nazwa-przekroj": "Polska, województwa", "id-okres": 282},
+        {"id-zmienna": 1679, "id-przekroj": 3, "nazwa-przekroj": "Polska", "id-okres": 247},
+        {"id-zmienna": 313, "id-przekroj": 655, "nazwa-przekroj": "Polska", "id-okres": 247},
+    ]
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = join(directory.name, "all_section_periods.json")
+
+    def write_records(self, records: list[dict]):
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(records, file)
+
+    def test_file_is_loaded_once_and_indexed(self):
+        self.write_records(self.SECTION_PERIODS)
+        store = JsonRecordsStore(self.path, key="id-zmienna")
+        with patch.object(store, "load", wraps=store.load) as load:
+            self.assertEqual(store.get(1679), self.SECTION_PERIODS[:2])
+            self.assertEqual(store.get(313), self.SECTION_PERIODS[2:])
+            self.assertEqual(store.get(1), [])
+
+        load.assert_called_once()
+
+    def test_changed_file_is_reloaded(self):
+        self.write_records(self.SECTION_PERIODS)
+        store = JsonRecordsStore(self.path, key="id-zmienna")
+        self.assertEqual(len(store.get(1679)), 2)
+
+        self.write_records(self.SECTION_PERIODS[1:])
+        self.assertEqual(store.get(1679), self.SECTION_PERIODS[1:2])
+
+    def test_missing_file_is_downloaded_and_saved(self):
+        pages = [mock_dbw_response({"data": self.SECTION_PERIODS[:2]}), mock_dbw_response({"data": []}, 500)]
+        store = JsonRecordsStore(self.path, key="id-zmienna", download=GusApiDbwClient.download_section_periods)
+        with patch("tools.requests.get", side_effect=pages) as get:
+            self.assertEqual(store.get(1679), self.SECTION_PERIODS[:2])
+            self.assertEqual(store.get(1679), self.SECTION_PERIODS[:2])
+
+        self.assertEqual(get.call_count, 2)  # both pages, once
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(json.load(file), self.SECTION_PERIODS[:2])
+
+    def test_failed_download_is_not_saved(self):
+        store = JsonRecordsStore(self.path, key="id-zmienna", download=lambda: [])
+
+        self.assertEqual(store.get(1679), [])
+        self.assertIsNone(store.get_stamp())
+
+    def test_variable_section_periods_are_copies(self):
+        self.write_records(self.SECTION_PERIODS)
+        with patch.object(GusApiDbwClient, "SECTION_PERIODS", JsonRecordsStore(self.path, key="id-zmienna")):
+            section_periods = GusApiDbwClient.get_variable_section_periods(1679, "Wskaźnik")
+            section_periods[0]["opis_okres"] = "rok"
+
+            self.assertEqual(GusApiDbwClient.get_variable_section_periods(1679, "Wskaźnik"), self.SECTION_PERIODS[:2])
+            self.assertEqual(GusApiDbwClient.get_variable_section_periods(1, "Nieznana"), [])
+
+
+class EnrichSectionPeriodsTests(TestCase):
+    PERIODS = [
+        {"id-okres": 247, "symbol": "M01", "opis": "miesiąc - dane miesięczne - styczeń"},
+        {"id-okres": 282, "symbol": "R", "opis": "rok - dane roczne"},
+    ]
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = join(directory.name, "all_periods.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.PERIODS, file)
+        periods_patcher = patch.object(GusApiDbwClient, "PERIODS", JsonRecordsStore(path, key="id-okres", unique=True))
+        periods_patcher.start()
+        self.addCleanup(periods_patcher.stop)
+
+    def test_periods_are_joined(self):
+        section_periods = [
+            {"id-zmienna": 1679, "id-przekroj": 2, "nazwa-przekroj": "Polska", "id-okres": 282},
+            {"id-zmienna": 1679, "id-przekroj": 3, "nazwa-przekroj": "Województwa", "id-okres": 999},
+        ]
+
+        self.assertIs(GusApiDbwClient.enrich_section_periods(section_periods), section_periods)
+        self.assertEqual(
+            section_periods[0],
+            {
+                "id-zmienna": 1679,
+                "id-przekroj": 2,
+                "nazwa-przekroj": "Polska",
+                "id-okres": 282,
+                "nazwa_przekroj": "Polska",
+                "id_przekroj": 2,
+                "id_okres": 282,
+                "opis_okres": "rok - dane roczne",
+            },
+        )
+        self.assertEqual(section_periods[1]["id_okres"], 999)
+        self.assertNotIn("opis_okres", section_periods[1])  # unknown period
+
+    def test_periods_are_listed(self):
+        self.assertEqual(GusApiDbwClient.get_periods(), self.PERIODS)
+
+
+class RepresentationMeasuresTests(TestCase):
+    MEASURES = [{"id-sposob-prezentacji-miara": 180, "nazwa": "Cena [zł]"}]
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        store = JsonRecordsStore(
+            join(directory.name, "all_representation_measures.json"),
+            key="id-sposob-prezentacji-miara",
+            download=GusApiDbwClient.download_representation_measures,
+            unique=True,
+        )
+        measures_patcher = patch.object(GusApiDbwClient, "REPRESENTATION_MEASURES", store)
+        measures_patcher.start()
+        self.addCleanup(measures_patcher.stop)
+
+    def test_measures_are_downloaded_once_and_looked_up(self):
+        with patch("tools.requests.get", return_value=mock_dbw_response({"data": self.MEASURES})) as get:
+            self.assertEqual(GusApiDbwClient.get_representation_description(180), "Cena [zł]")
+            self.assertEqual(GusApiDbwClient.get_representation_description(999), "")  # unknown measure
+
+        get.assert_called_once()
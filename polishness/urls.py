@@ -10,12 +10,37 @@ urlpatterns = [
     path("", views.home, name="home"),
     path("contact/", views.contact, name="contact"),
     path("monuments/", views.monuments, name="monuments"),
+    path("results/<str:token>/", views.results, name="results"),
     # path("trips/", views.trips, name="trips"),
     path("monument/<int:pk>/", views.monument_single, name="monument_single"),
     path("monument/archeo/<int:pk>/", views.monument_single_archeo, name="monument_single_archeo"),
     path("monument/<int:pk>/ai/", views.monument_single_ai, name="monument_single_ai"),
+    path(
+        "monument/<int:pk>/ai/stream/",
+        views.ai_answer_stream,
+        {"kind": "monument"},
+        name="monument_single_ai_stream",
+    ),
+    path(
+        "monument/<int:pk>/ai/fragment/",
+        views.ai_description_fragment,
+        {"kind": "monument"},
+        name="monument_single_ai_fragment",
+    ),
     path("monument/<int:pk>/photos/", views.monument_single_photos, name="monument_single_photos"),
     path("monument/archeo/<int:pk>/ai/", views.monument_archeo_single_ai, name="monument_archeo_single_ai"),
+    path(
+        "monument/archeo/<int:pk>/ai/stream/",
+        views.ai_answer_stream,
+        {"kind": "archeo"},
+        name="monument_archeo_single_ai_stream",
+    ),
+    path(
+        "monument/archeo/<int:pk>/ai/fragment/",
+        views.ai_description_fragment,
+        {"kind": "archeo"},
+        name="monument_archeo_single_ai_fragment",
+    ),
     path("monument/archeo/<int:pk>/photos/", views.monument_archeo_single_photos, name="monument_archeo_single_photos"),
     path("poland-in-numbers/", views.poland_in_numbers, name="poland_in_numbers"),
     path(
@@ -31,9 +56,17 @@ urlpatterns = [
     path("nature/", views.nature, name="nature"),
     path("nature/<int:pk>/", views.nature_single, name="nature_single"),
     path("nature/<int:pk>/ai/", views.nature_single_ai, name="nature_single_ai"),
+    path("nature/<int:pk>/ai/stream/", views.ai_answer_stream, {"kind": "geo"}, name="nature_single_ai_stream"),
+    path(
+        "nature/<int:pk>/ai/fragment/",
+        views.ai_description_fragment,
+        {"kind": "geo"},
+        name="nature_single_ai_fragment",
+    ),
     path("photo_discovery/", views.photo_discovery, name="photo_discovery"),
     path("press_news/", views.press_news, name="press_news"),
     path("history/", views.history, name="history"),
     path("statute/", views.statute, name="statute"),
     path("privacy_policy/", views.privacy_policy, name="privacy_policy"),
+    path("internal/ai-metrics/", views.ai_metrics, name="ai_metrics"),
 ]
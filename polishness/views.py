@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime
 from os import getenv
+from secrets import compare_digest
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.core.mail import send_mail
+from django.http import Http404
+from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import HttpResponseRedirect
+from django.shortcuts import aget_object_or_404
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import add_never_cache_headers
+from django.utils.cache import patch_cache_control
 
 from .forms import ContactForm
 from .models import ArcheologicalMonument
@@ -14,13 +26,20 @@ from .models import GeographicalObject
 from .models import Monument
 from helpers import configure_logger
 from helpers import parent_function_name
-from tools import ask_ai
+from helpers import parse_coordinate
+from tools import AiClients
+from tools import AiDescriptionCache
+from tools import AiMetrics
+from tools import AiUnavailableError
+from tools import AiPrompts
 from tools import collect_press_news
 from tools import current_day_message
 from tools import GeoObjectsSupport
 from tools import get_polish_photo_google_links
 from tools import GusApiDbwClient
+from tools import HomeParagraphPool
 from tools import MonumentsSupport
+from tools import ResultPages
 from tools import TripGenerator
 
 # from tools import get_history_news
@@ -30,19 +49,23 @@ from tools import TripGenerator
 LOGGER_VIEWS = configure_logger("views")
 LOGGER_CONTACT_FORM = configure_logger("contact_form")
 
+# kind of the results: (page template, name of the rows in the context, rows template)
+RESULTS_TEMPLATES = {
+    "monument": ("polishness/monuments.html", "monuments", "polishness/monument_cards.html"),
+    "archeo": ("polishness/archeological-monuments.html", "archeo_monuments", "polishness/archeo_monument_cards.html"),
+    "geo": ("polishness/nature.html", "nature_items", "polishness/nature_cards.html"),
+}
+RESULTS_STREAM_MARKER = "@@polishness-results-rows@@"
 
-def home(request):
+
+async def home(request):
     """Homepage view"""
     # photo_data = get_polish_photo_data()
     # LOGGER_VIEWS.debug(
     #     f"Zostanie wyświetlone losowe polskie zdjęcie {photo_data!r} {request.build_absolute_uri()!r}, "
     #     f"(view: {parent_function_name()}, path: {request.path!r})."
     # )
-    ask_text = (
-        "Opowiedz, jak poznawać Polskę i dobrze się przy tym bawić? "
-        "Zwróć tekst sformatowany, z paragrafami. Ma być 1 akapit."
-    )
-    response_ai = ask_ai(ask=ask_text)
+    response_ai = await sync_to_async(HomeParagraphPool.pick)()
     # photo_data["response_ai"] = response_ai
 
     response_ai = response_ai.split("\n\n")
@@ -95,11 +118,65 @@ def contact(request):
         return render(request, "polishness/contact.html", {"form": form})
 
 
+def render_results(request, kind: str, token: str, ids, after: int | None = None, stream: bool = False):
+    """Renders page of the stored search results (or all results in the streaming mode)."""
+    template_name, items_name, _ = RESULTS_TEMPLATES[kind]
+    results_url = reverse("polishness:results", args=[token])
+    results_page = {"total": len(ids), "stream_url": f"{results_url}?stream=1", "next_url": None}
+    if stream:
+        return StreamingHttpResponse(
+            stream_results(request, kind, ids, results_page={**results_page, "stream_url": None})
+        )
+
+    try:
+        items, next_after = ResultPages.get_page(kind, ids, after=after)
+    except ValueError:
+        raise Http404("Nieznana strona wyników wyszukiwania.")
+    if next_after is not None:
+        results_page["next_url"] = f"{results_url}?after={next_after}"
+    return render(request, template_name, {items_name: items, "results_page": results_page})
+
+
+async def stream_results(request, kind: str, ids, results_page: dict):
+    """Yields the results page in parts: page beginning, rows rendered in chunks and page ending.
+
+    Async generator, so it is served under ASGI as it is produced (rows are fetched and rendered
+    in a worker thread chunk by chunk).
+    """
+    template_name, items_name, rows_template_name = RESULTS_TEMPLATES[kind]
+    page = await sync_to_async(render_to_string)(
+        template_name,
+        {items_name: [], "results_page": {**results_page, "stream_marker": RESULTS_STREAM_MARKER}},
+        request=request,
+    )
+    page_beginning, page_ending = page.split(RESULTS_STREAM_MARKER, 1)
+    yield page_beginning
+    async for items in ResultPages.aiter_chunks(kind, ids):
+        yield await sync_to_async(render_to_string)(rows_template_name, {items_name: items}, request=request)
+    yield page_ending
+
+
+def results(request, token):
+    """Search results (next pages or streamed) view"""
+    stored_results = ResultPages.load(token)
+    if stored_results is None:
+        raise Http404("Wyniki wyszukiwania wygasły.")
+
+    kind, ids = stored_results
+    try:
+        after = int(request.GET["after"])
+    except (KeyError, ValueError):
+        after = None
+
+    LOGGER_VIEWS.debug(
+        f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
+        f"(view: {parent_function_name()!r}, path: {request.path!r})."
+    )
+    return render_results(request, kind, token, ids, after=after, stream=bool(request.GET.get("stream")))
+
+
 def monuments(request):
     """Monuments view"""
-    monument_items = None
-    archeo_monuments = None
-    is_archeological = None
     if request.method == "POST":
         query_params = MonumentsSupport.get_monument_query_params(request.POST)
         quantity = query_params.pop("quantity")
@@ -109,90 +186,64 @@ def monuments(request):
         except KeyError:
             is_archeological = False
 
-        if is_archeological:
-            archeo_monuments_filtered = ArcheologicalMonument.objects.filter(**query_params)
-            archeo_monuments = MonumentsSupport.randomize_monuments(
-                quantity=quantity, monuments=archeo_monuments_filtered
-            )
-            return render(request, "polishness/archeological-monuments.html", {"archeo_monuments": archeo_monuments})
-
-        monument_items_cleaned = Monument.objects.filter(**query_params)
-        monument_items = MonumentsSupport.randomize_monuments(quantity=int(quantity), monuments=monument_items_cleaned)
+        kind, model = ("archeo", ArcheologicalMonument) if is_archeological else ("monument", Monument)
+        ids = MonumentsSupport.randomize_monument_ids(quantity=quantity, model=model, query_params=query_params)
+        LOGGER_VIEWS.debug(
+            f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
+            f"(view: {parent_function_name()!r}, path: {request.path!r})."
+        )
+        token, ids = ResultPages.store(kind, ids)
+        return render_results(request, kind, token, ids, stream=bool(request.POST.get("stream")))
 
     LOGGER_VIEWS.debug(
         f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
-    return render(request, "polishness/monuments.html", {"monuments": monument_items})
+    return render(request, "polishness/monuments.html", {"monuments": None})
 
 
-def monument_single(request, pk):
+async def monument_single(request, pk):
     """Monuments single view"""
-    monument_item = Monument.objects.get(id=pk)
+    monument_item = await Monument.objects.aget(id=pk)
     LOGGER_VIEWS.debug(
         f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
 
-    ask_text = f"Opowiedz mi o zabytku: {monument_item.name}, {monument_item.locality}"
-    if monument_item.street and monument_item.street != "nan":
-        ask_text += f", {monument_item.street}"
-
-    if monument_item.address_number and monument_item.address_number != "nan":
-        ask_text += f", {monument_item.address_number}"
-
-    if monument_item.chronology != "Data nieznana":
-        ask_text += f", czas pochodzenia zabytku {monument_item.chronology}"
-
-    ask_text += "Opis ma mieć maksymalnie 4 zdania."
-    response_ai = ask_ai(ask=ask_text)
-
-    return render(request, "polishness/monument_single.html", {"monument": monument_item, "response_ai": response_ai})
+    ai_context = await get_ai_fragment_context(
+        monument_item, fragment_url=reverse("polishness:monument_single_ai_fragment", args=[pk])
+    )
+    return render(request, "polishness/monument_single.html", {"monument": monument_item, **ai_context})
 
 
-def monument_single_archeo(request, pk):
+async def monument_single_archeo(request, pk):
     """Archeological monument single view"""
-    monument_item = ArcheologicalMonument.objects.get(id=pk)
+    monument_item = await ArcheologicalMonument.objects.aget(id=pk)
     LOGGER_VIEWS.debug(
         f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
 
-    ask_text = (
-        f"Opowiedz mi o zabytku archeogicznym: "
-        f"{monument_item.name}, {monument_item.locality}, {monument_item.chronology}, {monument_item.function}. "
-        f"Opis ma mieć maksymalnie 4 zdania."
+    ai_context = await get_ai_fragment_context(
+        monument_item, fragment_url=reverse("polishness:monument_archeo_single_ai_fragment", args=[pk])
     )
+    return render(request, "polishness/monument_single_archeo.html", {"monument": monument_item, **ai_context})
 
-    response_ai = ask_ai(ask=ask_text)
 
-    return render(
-        request, "polishness/monument_single_archeo.html", {"monument": monument_item, "response_ai": response_ai}
-    )
-
-
-def monument_single_ai(request, pk):
+async def monument_single_ai(request, pk):
     """Monument question to AI view"""
-    monument_item = Monument.objects.get(id=pk)
-
-    ask_text = f"Opowiedz mi o zabytku: {monument_item.name}, {monument_item.locality}"
-    if monument_item.street and monument_item.street != "nan":
-        ask_text += f", {monument_item.street}"
-
-    if monument_item.address_number and monument_item.address_number != "nan":
-        ask_text += f", {monument_item.address_number}"
-
-    if monument_item.chronology != "Data nieznana":
-        ask_text += f", czas pochodzenia zabytku {monument_item.chronology}"
-
-    response_ai = ask_ai(ask=ask_text)
+    monument_item = await Monument.objects.aget(id=pk)
 
     LOGGER_VIEWS.debug(
         f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
-    return render(
-        request, "polishness/monument_single_ai.html", {"monument": monument_item, "response_ai": response_ai}
+    return await render_ai_answer(
+        request,
+        "polishness/monument_single_ai.html",
+        {"monument": monument_item},
+        item=monument_item,
+        stream_url=reverse("polishness:monument_single_ai_stream", args=[pk]),
     )
 
 
@@ -215,23 +266,20 @@ def monument_single_photos(request, pk):
     )
 
 
-def monument_archeo_single_ai(request, pk):
+async def monument_archeo_single_ai(request, pk):
     """Archeological monument question to AI view"""
-    monument_item = ArcheologicalMonument.objects.get(id=pk)
-
-    ask_text = (
-        f"Opowiedz mi o zabytku archeogicznym: "
-        f"{monument_item.name}, {monument_item.locality}, {monument_item.chronology}, {monument_item.function}"
-    )
-
-    response_ai = ask_ai(ask=ask_text)
+    monument_item = await ArcheologicalMonument.objects.aget(id=pk)
 
     LOGGER_VIEWS.debug(
         f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
-    return render(
-        request, "polishness/monument_single_archeo_ai.html", {"monument": monument_item, "response_ai": response_ai}
+    return await render_ai_answer(
+        request,
+        "polishness/monument_single_archeo_ai.html",
+        {"monument": monument_item},
+        item=monument_item,
+        stream_url=reverse("polishness:monument_archeo_single_ai_stream", args=[pk]),
     )
 
 
@@ -261,7 +309,6 @@ def monument_archeo_single_photos(request, pk):
 
 def nature(request):
     """Nature view"""
-    nature_items = None
     if request.method == "POST":
         query_params = GeoObjectsSupport.get_query_params(request.POST)
         quantity = query_params.pop("quantity")
@@ -271,67 +318,147 @@ def nature(request):
         except KeyError:
             nature_object_type = None
 
-        nature_items_prefiltered = GeographicalObject.objects.filter(**query_params)
-        if nature_object_type is None:
-            nature_items = GeoObjectsSupport.randomize(quantity=quantity, geo_objects=nature_items_prefiltered)
-            return render(request, "polishness/nature.html", {"nature_items": nature_items})
+        excludes = None
+        if nature_object_type == "inne":
+            excludes = {"geo_object_type__in": GeoObjectsSupport.MAPPER_ALL}
+        elif nature_object_type is not None:
+            query_params["geo_object_type__in"] = GeoObjectsSupport.MAPPER[nature_object_type]
 
-        elif nature_object_type == "inne":
-            nature_items_filtered = nature_items_prefiltered.exclude(geo_object_type__in=GeoObjectsSupport.MAPPER_ALL)
-            nature_items = GeoObjectsSupport.randomize(quantity=quantity, geo_objects=nature_items_filtered)
-            return render(request, "polishness/nature.html", {"nature_items": nature_items})
-
-        else:
-            nature_items_filtered = nature_items_prefiltered.filter(
-                geo_object_type__in=GeoObjectsSupport.MAPPER[nature_object_type]
-            )
-            nature_items = GeoObjectsSupport.randomize(quantity=quantity, geo_objects=nature_items_filtered)
-            return render(request, "polishness/nature.html", {"nature_items": nature_items})
+        ids = GeoObjectsSupport.randomize_ids(quantity=quantity, query_params=query_params, excludes=excludes)
+        LOGGER_VIEWS.debug(
+            f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
+            f"(view: {parent_function_name()!r}, path: {request.path!r})."
+        )
+        token, ids = ResultPages.store("geo", ids)
+        return render_results(request, "geo", token, ids, stream=bool(request.POST.get("stream")))
 
     LOGGER_VIEWS.debug(
         f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
-    return render(request, "polishness/nature.html", {"nature_items": nature_items})
+    return render(request, "polishness/nature.html", {"nature_items": None})
 
 
-def nature_single(request, pk):
+async def nature_single(request, pk):
     """Nature single item view"""
-    nature_item = GeographicalObject.objects.get(id=pk)
+    nature_item = await GeographicalObject.objects.aget(id=pk)
     LOGGER_VIEWS.debug(
         f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
-    ask_text = (
-        f"Opowiedz mi o obiekcie przyrodniczym: {nature_item.name}. Typ obiektu: {nature_item.geo_object_type}."
-        f" Lokalizacja obiektu: województwo {nature_item.voivodeship}, powiat: {nature_item.county},"
-        f" gmina: {nature_item.parish}. Opis ma mieć maksymalnie 4 zdania."
+    ai_context = await get_ai_fragment_context(
+        nature_item, fragment_url=reverse("polishness:nature_single_ai_fragment", args=[pk])
     )
-    response_ai = ask_ai(ask=ask_text)
     map_photo_link = get_map_photo_link(latitude=nature_item.latitude, longitude=nature_item.longitude)
     return render(
         request,
         "polishness/nature_single.html",
-        {"nature_item": nature_item, "response_ai": response_ai, "map_photo_link": map_photo_link},
+        {"nature_item": nature_item, "map_photo_link": map_photo_link, **ai_context},
     )
 
 
-def nature_single_ai(request, pk):
+async def nature_single_ai(request, pk):
     """Nature question to AI view"""
-    nature_item = GeographicalObject.objects.get(id=pk)
+    nature_item = await GeographicalObject.objects.aget(id=pk)
 
-    ask_text = (
-        f"Opowiedz mi o obiekcie przyrodniczym: {nature_item.name}. Typ obiektu: {nature_item.geo_object_type}."
-        f" Lokalizacja obiektu: województwo {nature_item.voivodeship}, powiat: {nature_item.county},"
-        f" gmina: {nature_item.parish}."
+    LOGGER_VIEWS.debug(
+        f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
+        f"(view: {parent_function_name()!r}, path: {request.path!r})."
+    )
+    return await render_ai_answer(
+        request,
+        "polishness/nature_single_ai.html",
+        {"nature_item": nature_item},
+        item=nature_item,
+        stream_url=reverse("polishness:nature_single_ai_stream", args=[pk]),
     )
-    response_ai = ask_ai(ask=ask_text)
 
+
+async def get_ai_fragment_context(item, fragment_url: str) -> dict:
+    """Provides context of the short AI description on the detail page, without waiting for the AI.
+
+    Cached description is rendered at once. Otherwise the page gets the 'fragment_url', from which
+    the description is loaded after the page is shown (see 'ai_description_fragment').
+    """
+    response_ai = await sync_to_async(AiDescriptionCache.get)(item, AiPrompts.for_object(item, short=True))
+    return {"response_ai": response_ai, "fragment_url": fragment_url if response_ai is None else None}
+
+
+async def ai_description_fragment(request, pk, kind):
+    """Short AI description of the catalog object (HTML fragment of the detail page) view
+
+    Description is cacheable by the browser and proxies ('AI_FRAGMENT_MAX_AGE' setting), the fallback text
+    (AI answer not available) is not cached.
+    """
+    item = await aget_object_or_404(ResultPages.MODELS[kind], id=pk)
     LOGGER_VIEWS.debug(
-        f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
+        f"Zostanie wyświetlony fragment {request.build_absolute_uri()!r}, "
         f"(view: {parent_function_name()!r}, path: {request.path!r})."
     )
-    return render(request, "polishness/nature_single_ai.html", {"nature_item": nature_item, "response_ai": response_ai})
+    response_ai = await AiDescriptionCache.aget_or_ask(item, AiPrompts.for_object(item, short=True))
+    response = render(request, "polishness/ai_description.html", {"response_ai": response_ai})
+    if response_ai == AiClients.FALLBACK:
+        add_never_cache_headers(response)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.AI_FRAGMENT_MAX_AGE)
+    return response
+
+
+async def render_ai_answer(request, template_name: str, context: dict, item, stream_url: str):
+    """Renders page with the AI answer about catalog object.
+
+    Cached answer is rendered at once. Otherwise the page is rendered without the answer, which is then
+    loaded from the 'stream_url' (server-sent events) part by part. With '?stream=0' the page waits for
+    the complete answer.
+    """
+    ask_text = AiPrompts.for_object(item)
+    if request.GET.get("stream") == "0":
+        response_ai = await AiDescriptionCache.aget_or_ask(item, ask_text)
+    else:
+        response_ai = await sync_to_async(AiDescriptionCache.get)(item, ask_text)
+
+    return render(
+        request,
+        template_name,
+        {**context, "response_ai": response_ai, "stream_url": stream_url if response_ai is None else None},
+    )
+
+
+async def ai_answer_stream(request, pk, kind):
+    """AI answer about catalog object (server-sent events) view"""
+    item = await aget_object_or_404(ResultPages.MODELS[kind], id=pk)
+    LOGGER_VIEWS.debug(
+        f"Zostanie wysłana odpowiedź strumieniowa {request.build_absolute_uri()!r}, "
+        f"(view: {parent_function_name()!r}, path: {request.path!r})."
+    )
+    response = StreamingHttpResponse(
+        stream_ai_answer(item, AiPrompts.for_object(item)), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def stream_ai_answer(item, ask_text: str):
+    """Yields server-sent events: parts of the AI answer and then the end event (or the error event)."""
+    try:
+        async for part in AiDescriptionCache.astream_or_ask(item, ask_text):
+            yield f"data: {json.dumps(part)}\n\n"
+    except AiUnavailableError as error:
+        LOGGER_VIEWS.error(f"Odpowiedź strumieniowa AI zostanie przerwana ({error!r}).")
+        yield "event: error\ndata: {}\n\n"
+        return
+    yield "event: end\ndata: {}\n\n"
+
+
+def ai_metrics(request):
+    """Internal view of the AI calls metrics of the worker process (for the staff users or with the metrics token)"""
+    token = settings.AI_METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    is_token_valid = bool(token) and compare_digest(authorization.encode(), f"Bearer {token}".encode())
+    if not (is_token_valid or request.user.is_staff):
+        raise Http404
+    return JsonResponse(AiMetrics.snapshot(), json_dumps_params={"ensure_ascii": False})
 
 
 def poland_in_numbers(request):
@@ -376,46 +503,7 @@ def poland_in_numbers_field_browser(request, field_id, field_variable_id, field_
 
         GusApiDbwClient.DBW_LOGGER.info("Zostaną wzbogacone pobrane dane statystyczne.")
         section_dimensions = GusApiDbwClient.get_section_dimensions(section_id=section_id)
-        for stats in stats_data:
-            GusApiDbwClient.DBW_LOGGER.info(f"Wzbogacanie następującego rekordu danych statystycznych: {stats}.")
-            dimension_id = stats["id-wymiar-1"]
-            dimension_position_id = stats["id-pozycja-1"]
-            dimension_description = GusApiDbwClient.get_dimension_description(
-                section_id=section_id,
-                dimension_id=dimension_id,
-                dimension_position_id=dimension_position_id,
-                section_dimensions=section_dimensions,
-            )
-            stats["dimension_description"] = dimension_description
-
-            try:
-                dimension_id_beta = stats.get("id-wymiar-2", False)
-                dimension_position_id_beta = stats.get("id-pozycja-2", False)
-                dimension_description_beta = GusApiDbwClient.get_dimension_description(
-                    section_id=section_id,
-                    dimension_id=dimension_id_beta,
-                    dimension_position_id=dimension_position_id_beta,
-                    section_dimensions=section_dimensions,
-                )
-                stats["dimension_description_beta"] = dimension_description_beta
-            except ValueError:
-                stats["dimension_description_beta"] = "-"
-
-            try:
-                dimension_id_gamma = stats["id-wymiar-3"]
-                dimension_position_id_gamma = stats["id-pozycja-3"]
-                dimension_description_gamma = GusApiDbwClient.get_dimension_description(
-                    section_id=section_id,
-                    dimension_id=dimension_id_gamma,
-                    dimension_position_id=dimension_position_id_gamma,
-                    section_dimensions=section_dimensions,
-                )
-                stats["dimension_description_gamma"] = dimension_description_gamma
-            except (ValueError, KeyError):
-                stats["dimension_description_gamma"] = "-"
-
-            representation_id = stats["id-sposob-prezentacji-miara"]
-            stats["representation_description"] = GusApiDbwClient.get_representation_description(representation_id)
+        GusApiDbwClient.enrich_stats_data(stats_data, section_dimensions)
 
         LOGGER_VIEWS.debug(
             f"Zostanie wyświetlona strona {request.build_absolute_uri()!r}, "
@@ -437,17 +525,7 @@ def poland_in_numbers_field_browser(request, field_id, field_variable_id, field_
     section_periods = GusApiDbwClient.get_variable_section_periods(
         field_variable_id=field_variable_id, field_variable_name=field_variable_name
     )
-
-    periods = GusApiDbwClient.get_periods()
-
-    for item_section_periods in section_periods:
-        item_section_periods["nazwa_przekroj"] = item_section_periods["nazwa-przekroj"]
-        item_section_periods["id_przekroj"] = item_section_periods["id-przekroj"]
-        item_section_periods["id_okres"] = item_section_periods["id-okres"]
-
-        for period in periods:
-            if period["id-okres"] == item_section_periods["id_okres"]:
-                item_section_periods["opis_okres"] = period["opis"]
+    GusApiDbwClient.enrich_section_periods(section_periods)
 
     current_year = datetime.now().year
     years = range(2011, current_year + 1)
@@ -483,11 +561,16 @@ def trips(request):
     if request.method == "POST":
         query_params = MonumentsSupport.get_monument_query_params(request.POST)
         quantity = query_params.pop("quantity")
-        quantity = 10 if int(quantity) > 10 else int(quantity)
-        monument_items_cleaned = Monument.objects.exclude(latitude="nan", longitude="nan").filter(**query_params)
-        monument_items = MonumentsSupport.randomize_monuments(quantity=int(quantity), monuments=monument_items_cleaned)
+        quantity = min(int(quantity), TripGenerator.QUANTITY_LIMIT)
+        query_params["latitude_value__isnull"] = False
+        monument_items = MonumentsSupport.randomize_monuments(
+            quantity=quantity, model=Monument, query_params=query_params
+        )
 
-        trip_generator = TripGenerator(quantity=quantity, monuments=monument_items)
+        start_latitude = parse_coordinate(request.POST.get("start_latitude"), limit=90)
+        start_longitude = parse_coordinate(request.POST.get("start_longitude"), limit=180)
+        start = (start_latitude, start_longitude) if None not in (start_latitude, start_longitude) else None
+        trip_generator = TripGenerator(quantity=quantity, monuments=monument_items, start=start)
         monument_items = trip_generator.generate_trip()
 
     LOGGER_VIEWS.debug(
@@ -1,556 +1,4210 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
 import json
+import re
+from collections import defaultdict
+from collections import OrderedDict
+from contextvars import ContextVar
+from concurrent.futures import as_completed
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import date
+from hashlib import blake2b
+from hashlib import sha256
+from itertools import takewhile
+from logging import Logger
+from math import ceil
 from os import getenv
+from os import getpid
+from os import replace
+from os import stat
 from os.path import exists
 from os.path import getsize
 from secrets import randbelow
+from secrets import randbits
+from threading import BoundedSemaphore
+from threading import Lock
+from threading import Thread
+from time import monotonic
+from time import sleep
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
 from typing import Optional
+from uuid import uuid4
+from weakref import WeakKeyDictionary
 
 import feedparser
+import httpx
+import numpy as np
 import pandas as pd
 import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db import models
+from django.db import transaction
+from django.db.models.expressions import RawSQL
 from django.db.models.query import QuerySet
 from django.http import QueryDict
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from openai import APIConnectionError
+from openai import APITimeoutError
+from openai import AsyncOpenAI
+from openai import DefaultAsyncHttpxClient
+from openai import DefaultHttpxClient
+from openai import InternalServerError
 from openai import OpenAI
+from openai import OpenAIError
+from openai import RateLimitError
 
 from helpers import configure_logger
+from helpers import get_grid_cell
 from helpers import get_static_dir
+from helpers import normalize_text
+from helpers import parse_coordinate
+from polishness.models import AiDescription
+from polishness.models import AiPregenerationCheckpoint
 from polishness.models import ArcheologicalMonument
+from polishness.models import CoordinatesMixin
 from polishness.models import GeographicalObject
+from polishness.models import HomeParagraph
 from polishness.models import Monument
 
 
-def ask_ai(ask: str) -> str:
-    """Asks openai question.
+OPENAI_MODEL = "gpt-3.5-turbo"
+
+
+def ask_ai(ask: str, model: str = OPENAI_MODEL, timeout: Optional[float] = None) -> str:
+    """Asks openai question (with the shared client and the call limits, see 'AiClients').
 
     Args:
         ask: Question text.
+        model: Name of the openai model.
+        timeout: Timeout of the single attempt (in seconds), 'AI_TIMEOUT' setting by default.
 
     Returns:
         Answer text from the openai.
+
+    Raises:
+        AiUnavailableError: If the answer was not received within the call budget.
     """
-    client = OpenAI(
-        api_key=getenv("OPENAI_API_KEY"),
-    )
-    chat_completion = client.chat.completions.create(
-        messages=[
-            {
-                "role": "user",
-                "content": ask,
-            }
-        ],
-        model="gpt-3.5-turbo",
-    )
-    return chat_completion.choices[0].message.content
+    return AiClients.complete(ask=ask, model=model, timeout=timeout)
 
 
-def current_day_message() -> str:
-    """Provides current day message (without year).
+async def ask_ai_async(ask: str, model: str = OPENAI_MODEL, timeout: Optional[float] = None) -> str:
+    """Asks openai question without blocking the event loop (see 'AiClients').
+
+    Args:
+        ask: Question text.
+        model: Name of the openai model.
+        timeout: Timeout of the single attempt (in seconds), 'AI_TIMEOUT' setting by default.
 
     Returns:
-        Current day message (without year).
+        Answer text from the openai.
+
+    Raises:
+        AiUnavailableError: If the answer was not received within the call budget.
     """
-    days = {
-        1: "pierwszy",
-        2: "drugi",
-        3: "trzeci",
-        4: "czwarty",
-        5: "piąty",
-        6: "szósty",
-        7: "siódmy",
-        8: "ósmy",
-        9: "dziewiąty",
-        10: "dziesiąty",
-        11: "jedenasty",
-        12: "dwunasty",
-        13: "trzynasty",
-        14: "czternasty",
-        15: "piętnasty",
-        16: "szesnasty",
-        17: "siedemnasty",
-        18: "osiemnasty",
-        19: "dziewiętnasty",
-        20: "dwudziesty",
-        21: "dwudziesty pierwszy",
-        22: "dwudziesty drugi",
-        23: "dwudziesty trzeci",
-        24: "dwudziesty czwarty",
-        25: "dwudziesty piąty",
-        26: "dwudziesty szósty",
-        27: "dwudziesty siódmy",
-        28: "dwudziesty ósmy",
-        29: "dwudziesty dziewiąty",
-        30: "trzydziesty",
-        31: "trzydziesty pierwszy",
-    }
+    return await AiClients.acomplete(ask=ask, model=model, timeout=timeout)
 
-    # Słownik z nazwami miesięcy
-    months = {
-        1: "styczeń",
-        2: "luty",
-        3: "marzec",
-        4: "kwiecień",
-        5: "maj",
-        6: "czerwiec",
-        7: "lipiec",
-        8: "sierpień",
-        9: "wrzesień",
-        10: "październik",
-        11: "listopad",
-        12: "grudzień",
-    }
 
-    current_day = datetime.date.today()
+async def ask_ai_stream(ask: str, model: str = OPENAI_MODEL, timeout: Optional[float] = None) -> AsyncIterator[str]:
+    """Asks openai question and yields the answer in parts, as soon as they are generated (see 'AiClients').
 
-    day_ = days[current_day.day]
-    month_ = months[current_day.month]
+    Args:
+        ask: Question text.
+        model: Name of the openai model.
+        timeout: Timeout of the single attempt (in seconds), 'AI_TIMEOUT' setting by default.
 
-    return f"{day_} {month_}"
+    Yields:
+        Next parts (tokens) of the answer text.
 
+    Raises:
+        AiUnavailableError: If the answer was not received within the call budget or its stream was broken.
+    """
+    async for part in AiClients.astream(ask=ask, model=model, timeout=timeout):
+        yield part
 
-def get_history_news() -> str:
-    """Provides current day message (without year).
 
-    Returns:
-        Current day message (without year).
+class AiUnavailableError(Exception):
+    """AI answer was not received within the call budget (timeouts, retries or limit of the in-flight calls)."""
+
+
+class AiClients:
+    """Class managing the AI backend, the shared openai clients and the limits of the AI calls.
+
+    Single attempts are made by the backend configured by the 'AI_BACKEND' setting ('OpenAiBackend',
+    'RecordReplayAiBackend' or 'StubAiBackend'). One sync openai client per process and one async client per event
+    loop are created, each with its pool of keep-alive HTTP connections. Calls are limited by the settings:
+     - 'AI_TIMEOUT' - timeout of the single attempt (in seconds),
+     - 'AI_MAX_RETRIES' - retries of the failed attempt (with exponential backoff and jitter),
+     - 'AI_BUDGET' - total time of the call: waiting for the free slot, all attempts and pauses (in seconds),
+     - 'AI_MAX_CONCURRENCY' - in-flight calls per process (sync) or per event loop (async).
+
+    Attributes:
+        AI_LOGGER (logging.Logger): Dedicated logger object for the AI calls.
+        FALLBACK (str): Text shown instead of the AI answer which was not received within the budget.
+        MAX_CONNECTIONS (int): Maximal number of the concurrent connections of the client.
+        MAX_KEEPALIVE_CONNECTIONS (int): Maximal number of the idle connections kept open.
+        RETRY_BACKOFF (float): Base of the pause before the retry (in seconds), doubled by each attempt.
+        RETRIED_ERRORS (tuple): Transient openai errors, after which the attempt is retried.
+        __backend (tuple): Backend configuration and the backend object created from it.
+        __client (OpenAI or None): Sync client of the process.
+        __semaphore (BoundedSemaphore or None): Limit of the in-flight sync calls.
+        __async_clients (WeakKeyDictionary): Async clients by their event loops.
+        __async_semaphores (WeakKeyDictionary): Limits of the in-flight async calls by their event loops.
+        __lock (Lock): Lock guarding creation of the backend, the sync client and semaphore.
     """
-    current_day = datetime.date.today()
-    filename = f"{current_day.day}d_{current_day.month}m.txt"
-    file_path = get_static_dir() + "historical_news/" + str(current_day.month) + "/" + filename
 
-    with open(file_path, "r") as file:
-        text = file.read()
+    AI_LOGGER = configure_logger(logger_name="ai")
+    FALLBACK = "Opis nie jest w tej chwili dostępny, spróbuj ponownie za chwilę."
+    MAX_CONNECTIONS = 500
+    MAX_KEEPALIVE_CONNECTIONS = 100
+    RETRY_BACKOFF = 0.5
+    RETRIED_ERRORS = (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+    __backend = (None, None)
+    __client = None
+    __semaphore = None
+    __async_clients = WeakKeyDictionary()
+    __async_semaphores = WeakKeyDictionary()
+    __lock = Lock()
 
-    return text
+    @classmethod
+    def get(cls) -> OpenAI:
+        """Provides sync client of the process.
 
+        Returns:
+            Openai client.
+        """
+        with cls.__lock:
+            if cls.__client is None:
+                cls.__client = OpenAI(
+                    api_key=getenv("OPENAI_API_KEY"),
+                    max_retries=0,
+                    http_client=DefaultHttpxClient(limits=cls.get_limits()),
+                )
+        return cls.__client
 
-def get_polish_photo_data() -> dict:
-    """Download polish photo data from the unplash api.
+    @classmethod
+    def aget(cls) -> AsyncOpenAI:
+        """Provides async client of the running event loop.
 
-    Returns:
-        The polish photo data dictionary (photo_link, photo_author, photo_author_link, photo_city)
-    """
-    unplash_api_key = getenv("UNPLASH_API_KEY")
-    url_request = f"https://api.unsplash.com/photos/random?query=poland&client_id={unplash_api_key}&count=1"
-    response = requests.get(url_request, timeout=60)
-    if response.status_code == 200:
-        return {
-            "photo_link": response.json()[0]["urls"]["full"],
-            "photo_author": response.json()[0]["user"]["name"],
-            "photo_author_link": response.json()[0]["user"]["links"]["html"],
-            "photo_city": response.json()[0]["location"]["city"],
-        }
-    return {}
+        Returns:
+            Async openai client.
+        """
+        loop = asyncio.get_running_loop()
+        client = cls.__async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=getenv("OPENAI_API_KEY"),
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(limits=cls.get_limits()),
+            )
+            cls.__async_clients[loop] = client
+        return client
 
+    @classmethod
+    def get_backend(cls) -> OpenAiBackend | RecordReplayAiBackend | StubAiBackend:
+        """Provides AI backend configured by the 'AI_BACKEND' setting (created again, if the setting is changed).
 
-def get_polish_photo_google_links(phrase: Optional[str] = None) -> list:
-    """Download polish photo data from the Google custom search engine api.
+        Returns:
+            AI backend object.
+        """
+        with cls.__lock:
+            config, backend = cls.__backend
+            if backend is None or config != settings.AI_BACKEND:
+                config = settings.AI_BACKEND
+                backend = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+                cls.__backend = (config, backend)
+        return backend
 
-    Args:
-        phrase: Query text.
+    @classmethod
+    def get_semaphore(cls) -> BoundedSemaphore:
+        """Provides limit of the in-flight sync calls of the process.
 
-    Returns:
-        List with the polish photo links.
-    """
-    query_keywords = [
-        "Polski krajobraz",
-        "Polski pejzaż",
-        "Polskie lasy",
-        "Polskie rzeki",
-        "Polskie góry, Tatry",
-        "Polskie jeziora",
-        "Morze Bałtyckie, Polska",
-        "Wisła, Polska",
-        "Odra, Polska",
-        "Warta, Polska",
-        "Polskie plaże",
-        "Polska przyroda",
-        "Parki Narodowe w Polsce",
-        "Polskie zwierzęta",
-        "Polska grzyby",
-        "Polska wieś",
-        "Polska PRL",
-        "Polskie kościoły",
-        "Polskie zabytki",
-        "Polskie zabytki archeologiczne",
-        "Polskie herby",
-        "Polska sztuka",
-        "Polska znaczki pocztowe",
-        "Kraków Wawel",
-        "Łazienki Warszawa",
-        "Kraków Rynek",
-        "Warszawa Belweder",
-        "Warszawa Pałac Kultury",
-        "Kraków Kościół Mariacki",
-        "Kraków sukiennice",
-        "Kraków Kazimierz",
-        "Polska Wrocław",
-        "Polska Bydgoszcz",
-        "Polska Lublin",
-        "Polska Zielona Góra",
-        "Polska Łódź",
-        "Polska Kraków",
-        "Polska Warszawa",
-        "Polska Opole",
-        "Polska Rzeszów",
-        "Polska Białystok",
-        "Polska Gdańsk",
-        "Polska Katowice",
-        "Polska Kielce",
-        "Polska Olsztyn",
-        "Polska Poznań",
-        "Polska Szczecin",
-    ]
-    if phrase is None:
-        random_number = randbelow(len(query_keywords))
-        phrase = query_keywords[random_number]
+        Returns:
+            Semaphore.
+        """
+        with cls.__lock:
+            if cls.__semaphore is None:
+                cls.__semaphore = BoundedSemaphore(settings.AI_MAX_CONCURRENCY)
+        return cls.__semaphore
 
-    google_custom_search_api_key = getenv("GOOGLE_CUSTOM_SEARCH_API_KEY")
-    google_custom_search_engine_id = getenv("GOOGLE_CUSTOM_SEARCH_ENGINE_ID")
-    url_request = (
-        f"https://www.googleapis.com/customsearch/v1?q={phrase}&searchType=image&"
-        f"imgSize=xlarge&key={google_custom_search_api_key}&cx={google_custom_search_engine_id}"
-    )
-    response = requests.get(url_request, timeout=60)
-    if response.status_code == 200:
-        photo_items = response.json().get("items", [])
-        # print(photo_items)
-        photo_links = [photo_item.get("link") for photo_item in photo_items]
-        return [photo_links, phrase]
-    else:
-        return [[], phrase]
+    @classmethod
+    def aget_semaphore(cls) -> asyncio.Semaphore:
+        """Provides limit of the in-flight async calls of the running event loop.
 
+        Returns:
+            Semaphore.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = cls.__async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = cls.__async_semaphores[loop] = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+        return semaphore
 
-def populate_archeological_monument_db_table() -> None:
-    """Populates data for the monuments table.
+    @classmethod
+    def get_limits(cls) -> httpx.Limits:
+        """Provides limits of the HTTP connections pool of the client.
 
-    Returns:
-        None
-    """
-    csv_db_path = get_static_dir() + "archaeological_monuments.csv"
-    df_data = pd.read_csv(csv_db_path, sep=";", dtype=object)
-    df_size = len(df_data.index)
-    for number in range(df_size):
-        if number == 0:
-            continue
-        input_data = tuple(df_data.iloc[number])
-        ArcheologicalMonument.objects.create(
-            library_id=input_data[0],
-            security_form=input_data[1],
-            location_accuracy=input_data[2],
-            name=input_data[3],
-            field_azp=input_data[4],
-            position_area_number=input_data[5],
-            chronology=input_data[6],
-            function=input_data[7],
-            documents=input_data[8],
-            registration_date=input_data[9],
-            voivodeship=input_data[10],
-            county=input_data[11],
-            parish=input_data[12],
-            locality=input_data[13],
-            link=input_data[14],
+        Returns:
+            Connections pool limits.
+        """
+        return httpx.Limits(
+            max_connections=cls.MAX_CONNECTIONS, max_keepalive_connections=cls.MAX_KEEPALIVE_CONNECTIONS
         )
 
+    @classmethod
+    def complete(cls, ask: str, model: str = OPENAI_MODEL, timeout: Optional[float] = None) -> str:
+        """Asks the AI with the sync call of the backend (within the limits of the call, recorded in 'AiMetrics').
 
-def populate_geographical_object_table() -> None:
-    """Populates data for the monuments table.
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the single attempt (in seconds), 'AI_TIMEOUT' setting by default.
 
-    Returns:
-        None
-    """
-    csv_db_path = get_static_dir() + "geographicalObjects.csv"
-    df_data = pd.read_csv(csv_db_path, sep=";", dtype=object)
-    df_size = len(df_data.index)
-    for number in range(df_size):
-        input_data = tuple(df_data.iloc[number])
-        GeographicalObject.objects.create(
-            name=input_data[0],
-            geo_object_type=input_data[1],
-            parish=input_data[2],
-            county=input_data[3],
-            voivodeship=input_data[4],
-            latitude=input_data[5],
-            longitude=input_data[6],
-        )
+        Returns:
+            Answer text.
 
+        Raises:
+            AiUnavailableError: If the answer was not received within the call budget.
+        """
+        started = monotonic()
+        usage = {}
+        try:
+            answer = cls.__complete(ask, model, timeout, usage)
+        except AiUnavailableError as error:
+            AiMetrics.record(ask, model, started, cache="miss", usage=usage, error=error)
+            raise
+        AiMetrics.record(ask, model, started, cache="miss", usage=usage)
+        return answer
 
-def populate_monument_db_table() -> None:
-    """Populates data for the monuments table.
+    @classmethod
+    async def acomplete(cls, ask: str, model: str = OPENAI_MODEL, timeout: Optional[float] = None) -> str:
+        """Asks the AI with the async call of the backend (within the limits of the call, recorded in 'AiMetrics').
 
-    Returns:
-        None
-    """
-    csv_db_path = get_static_dir() + "monuments.csv"
-    df_data = pd.read_csv(csv_db_path, dtype=object)
-    df_size = len(df_data.index)
-    for number in range(df_size):
-        input_data = tuple(df_data.iloc[number])
-        Monument.objects.create(
-            library_id=input_data[0],
-            security_form=input_data[1],
-            location_accuracy=input_data[2],
-            name=input_data[3],
-            chronology_date=input_data[4],
-            function=input_data[5],
-            documents=input_data[6],
-            registration_date=input_data[7],
-            voivodeship=input_data[8],
-            county=input_data[9],
-            parish=input_data[10],
-            locality=input_data[11],
-            street=input_data[12],
-            address_number=input_data[13],
-            latitude=input_data[14],
-            longitude=input_data[15],
-            chronology=input_data[16],
-        )
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the single attempt (in seconds), 'AI_TIMEOUT' setting by default.
 
+        Returns:
+            Answer text.
 
-class GeoObjectsSupport:
-    """Class with static method for supporting geographical object functionalities."""
+        Raises:
+            AiUnavailableError: If the answer was not received within the call budget.
+        """
+        started = monotonic()
+        usage = {}
+        try:
+            answer = await cls.__acomplete(ask, model, timeout, usage)
+        except AiUnavailableError as error:
+            AiMetrics.record(ask, model, started, cache="miss", usage=usage, error=error)
+            raise
+        AiMetrics.record(ask, model, started, cache="miss", usage=usage)
+        return answer
 
-    MAPPER = {
-        "doliny": ["dolina", "jar", "wąwóz", "wąwozy", "rów", "obniżenie", "zagłębienie"],
-        "bagna": ["bagna/błota", "bagno/błoto", "torfowiska", "torfowisko"],
-        "cyrki": ["cyrk lodowcowy"],
-        "gory": ["góry", "góra/szczyt", "wzgórze/wzniesienie", "wzgórza/wzniesienia", "zbocze/stok", "pasmo górskie"],
-        "groble": ["grobla", "śluza"],
-        "jaskinie": ["jaskinia/grota", "bagno/błoto", "torfowiska", "torfowisko"],
-        "jeziora": ["jezioro", "jeziora", "staw", "stawy", "sztuczny zbiornik wodny"],
-        "lasy": ["las", "lasy", "część lasu"],
-        "mosty": ["most"],
-        "parki": ["park"],
-        "wydmy": ["wydma", "wydmy", "obszar piasków"],
-        "wyspy": ["półwysep", "wyspa", "zatoka"],
-        "regiony": ["region naturalny"],
-        "rzeki": ["rzeka", "potok", "struga", "strumień", "kanał"],
-        "skaly": ["skała", "skały", "głaz", "głazy"],
-        "starorzecza": ["starorzecze", "stare koryto"],
-        "uroczyska": ["uroczysko", "uroczysko/dawna miejscowość"],
-        "wodospady": ["wodospad", "wodospady"],
-    }
+    @classmethod
+    async def astream(cls, ask: str, model: str = OPENAI_MODEL, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Asks the AI with the stream of the backend and yields parts of the answer (within the limits of the call,
+        recorded in 'AiMetrics' when the stream ends).
+
+        Attempts are retried only until the stream is opened, the budget does not limit the streaming itself
+        (the timeout limits waiting for each part).
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the single attempt (in seconds), 'AI_TIMEOUT' setting by default.
+
+        Yields:
+            Next parts of the answer text.
+
+        Raises:
+            AiUnavailableError: If the stream was not opened within the call budget or it was broken.
+        """
+        started = monotonic()
+        usage = {}
+        error = None
+        try:
+            async for part in cls.__astream(ask, model, timeout, usage):
+                yield part
+        except AiUnavailableError as unavailable_error:
+            error = unavailable_error
+            raise
+        finally:
+            AiMetrics.record(ask, model, started, cache="miss", usage=usage, error=error)
+
+    @classmethod
+    def __complete(cls, ask: str, model: str, timeout: Optional[float], usage: dict) -> str:
+        """Makes attempts of the sync call (see 'complete'), token usage is put into the 'usage'."""
+        backend = cls.get_backend()
+        semaphore = cls.get_semaphore()
+        deadline = monotonic() + settings.AI_BUDGET
+        if not semaphore.acquire(timeout=settings.AI_BUDGET):
+            raise cls.get_unavailable_error("limit wywołań w toku")
+
+        try:
+            attempt = 0
+            while True:
+                try:
+                    return backend.complete(
+                        ask, model=model, timeout=cls.get_attempt_timeout(deadline, timeout), usage=usage
+                    )
+                except OpenAIError as error:
+                    delay = cls.get_retry_delay(attempt, deadline, error)
+                sleep(delay)
+                attempt += 1
+        finally:
+            semaphore.release()
+
+    @classmethod
+    async def __acomplete(cls, ask: str, model: str, timeout: Optional[float], usage: dict) -> str:
+        """Makes attempts of the async call (see 'acomplete'), token usage is put into the 'usage'."""
+        backend = cls.get_backend()
+        semaphore = cls.aget_semaphore()
+        deadline = monotonic() + settings.AI_BUDGET
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=settings.AI_BUDGET)
+        except asyncio.TimeoutError:
+            raise cls.get_unavailable_error("limit wywołań w toku")
+
+        try:
+            attempt = 0
+            while True:
+                try:
+                    return await backend.acomplete(
+                        ask, model=model, timeout=cls.get_attempt_timeout(deadline, timeout), usage=usage
+                    )
+                except OpenAIError as error:
+                    delay = cls.get_retry_delay(attempt, deadline, error)
+                await asyncio.sleep(delay)
+                attempt += 1
+        finally:
+            semaphore.release()
+
+    @classmethod
+    async def __astream(cls, ask: str, model: str, timeout: Optional[float], usage: dict) -> AsyncIterator[str]:
+        """Makes attempts of the streamed call (see 'astream'), token usage is put into the 'usage'."""
+        backend = cls.get_backend()
+        semaphore = cls.aget_semaphore()
+        deadline = monotonic() + settings.AI_BUDGET
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=settings.AI_BUDGET)
+        except asyncio.TimeoutError:
+            raise cls.get_unavailable_error("limit wywołań w toku")
+
+        try:
+            attempt = 0
+            while True:
+                try:
+                    parts = await backend.aopen_stream(
+                        ask, model=model, timeout=cls.get_attempt_timeout(deadline, timeout), usage=usage
+                    )
+                    break
+                except OpenAIError as error:
+                    delay = cls.get_retry_delay(attempt, deadline, error)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+            try:
+                async for part in parts:
+                    yield part
+            except (OpenAIError, httpx.HTTPError) as error:
+                raise cls.get_unavailable_error(f"przerwana odpowiedź strumieniowa ({error!r})") from error
+        finally:
+            semaphore.release()
+
+    @classmethod
+    def get_attempt_timeout(cls, deadline: float, timeout: Optional[float] = None) -> float:
+        """Provides timeout of the next attempt, cut to the remaining budget.
+
+        Args:
+            deadline: Monotonic time, when the call budget is exceeded.
+            timeout: Timeout of the single attempt (in seconds), 'AI_TIMEOUT' setting by default.
+
+        Returns:
+            Timeout (in seconds).
+
+        Raises:
+            AiUnavailableError: If the call budget is already exceeded.
+        """
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            raise cls.get_unavailable_error("przekroczony czas wywołania")
+        return min(settings.AI_TIMEOUT if timeout is None else timeout, remaining)
+
+    @classmethod
+    def get_retry_delay(cls, attempt: int, deadline: float, error: OpenAIError) -> float:
+        """Provides pause before the retry of the failed attempt (exponential backoff with full jitter).
+
+        Args:
+            attempt: Number of the failed attempt (counted from 0).
+            deadline: Monotonic time, when the call budget is exceeded.
+            error: Error of the failed attempt.
+
+        Returns:
+            Pause (in seconds).
+
+        Raises:
+            AiUnavailableError: If the error is not transient, retries are used up or the pause exceeds the budget.
+        """
+        if not isinstance(error, cls.RETRIED_ERRORS) or attempt >= settings.AI_MAX_RETRIES:
+            raise cls.get_unavailable_error(f"nieudana próba {attempt + 1} ({error!r})") from error
+
+        delay = cls.RETRY_BACKOFF * 2**attempt * randbelow(1001) / 1000
+        if monotonic() + delay >= deadline:
+            raise cls.get_unavailable_error(f"brak czasu na ponowienie próby {attempt + 1} ({error!r})") from error
+
+        cls.AI_LOGGER.warning(f"Nieudana próba {attempt + 1} zapytania do AI ({error!r}), ponowienie za {delay:.2f}s.")
+        return delay
+
+    @classmethod
+    def get_unavailable_error(cls, reason: str) -> AiUnavailableError:
+        """Logs and provides error of the AI call, which did not fit in the limits.
+
+        Args:
+            reason: Description of the reason.
+
+        Returns:
+            Error to be raised.
+        """
+        cls.AI_LOGGER.error(f"Odpowiedź AI nie jest dostępna: {reason}.")
+        return AiUnavailableError(reason)
+
+
+class OpenAiBackend:
+    """AI backend asking the openai (single attempts, with the shared clients of the 'AiClients')."""
+
+    def complete(self, ask: str, model: str, timeout: float, usage: Optional[dict] = None) -> str:
+        """Asks the AI.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Answer text.
+        """
+        chat_completion = AiClients.get().chat.completions.create(
+            messages=[{"role": "user", "content": ask}], model=model, timeout=timeout
+        )
+        self.put_usage(chat_completion.usage, usage)
+        return chat_completion.choices[0].message.content
+
+    async def acomplete(self, ask: str, model: str, timeout: float, usage: Optional[dict] = None) -> str:
+        """Async version of the 'complete'.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Answer text.
+        """
+        chat_completion = await AiClients.aget().chat.completions.create(
+            messages=[{"role": "user", "content": ask}], model=model, timeout=timeout
+        )
+        self.put_usage(chat_completion.usage, usage)
+        return chat_completion.choices[0].message.content
+
+    async def aopen_stream(
+        self, ask: str, model: str, timeout: float, usage: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Asks the AI for the streamed answer.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Async iterator of the next parts of the answer.
+        """
+        chat_stream = await AiClients.aget().chat.completions.create(
+            messages=[{"role": "user", "content": ask}],
+            model=model,
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=timeout,
+        )
+        return self.iter_parts(chat_stream, usage)
+
+    @classmethod
+    async def iter_parts(cls, chat_stream: AsyncIterator, usage: Optional[dict] = None) -> AsyncIterator[str]:
+        """Yields text parts of the openai stream chunks (token usage comes with the last chunk)."""
+        async for chunk in chat_stream:
+            cls.put_usage(chunk.usage, usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    @staticmethod
+    def put_usage(completion_usage: Any, usage: Optional[dict]) -> None:
+        """Puts token usage of the openai completion into the 'usage' dictionary (if both are given)."""
+        if completion_usage is not None and usage is not None:
+            usage["prompt_tokens"] = completion_usage.prompt_tokens
+            usage["completion_tokens"] = completion_usage.completion_tokens
+
+
+class RecordReplayAiBackend:
+    """AI backend replaying answers recorded in the JSON lines file (keyed by the model and question).
+
+    In the recording mode missing answers are asked from the openai ('OpenAiBackend') and appended to the file
+    (one line per answer, so the file is not rewritten), otherwise missing answers are not available.
+    Recordings are meant for the single process (e.g. the load test runs on replays, the recording is done
+    by the one process).
+
+    Attributes:
+        path (str): Path of the recordings file.
+        record (bool): If True, missing answers are recorded.
+        backend (OpenAiBackend): Backend asking for the missing answers.
+        __recordings (dict): Recordings: key -> {'model': ..., 'ask': ..., 'answer': ...}.
+        __lock (Lock): Lock guarding the recordings.
+    """
+
+    def __init__(self, path: str, record: bool = False):
+        """Backend initialization (recordings are loaded).
+
+        Args:
+            path: Path of the recordings file.
+            record: If True, missing answers are recorded.
+        """
+        self.path = path
+        self.record = record
+        self.backend = OpenAiBackend()
+        self.__lock = Lock()
+        self.__recordings = self.load()
+
+    def load(self) -> dict:
+        """Loads recordings from the file.
+
+        Lines of the file hold recordings with their keys (later recordings of the key override earlier ones),
+        broken line (e.g. of the interrupted write) is skipped. File in the former format (JSON object: key ->
+        recording) is loaded too and, in the recording mode, converted to the JSON lines.
+
+        Returns:
+            Dictionary with recordings: key -> {'model': ..., 'ask': ..., 'answer': ..., 'usage': ...}.
+        """
+        if not exists(self.path):
+            return {}
+
+        with open(self.path, encoding="utf-8") as file:
+            text = file.read()
+        try:
+            recordings = json.loads(text)
+        except json.JSONDecodeError:
+            recordings = None
+        if isinstance(recordings, dict) and "answer" not in recordings:
+            if self.record:
+                self.rewrite(recordings)
+            return recordings
+
+        recordings = {}
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                recording = json.loads(line)
+            except json.JSONDecodeError:
+                AiClients.AI_LOGGER.warning(f"Pominięto uszkodzony wiersz {number} nagrań {self.path!r}.")
+                continue
+            recordings[recording.pop("key")] = recording
+        return recordings
+
+    def rewrite(self, recordings: dict) -> None:
+        """Writes all recordings as the JSON lines (the file is replaced atomically).
+
+        Args:
+            recordings: Recordings by their keys.
+
+        Returns:
+            None
+        """
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            for key, recording in recordings.items():
+                file.write(json.dumps({"key": key, **recording}, ensure_ascii=False) + "\n")
+        replace(temporary_path, self.path)
+
+    @staticmethod
+    def get_key(ask: str, model: str) -> str:
+        """Provides key of the recording.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+
+        Returns:
+            Key text (SHA-256 hex digest).
+        """
+        return sha256(f"{model}\n{ask}".encode()).hexdigest()
+
+    def complete(self, ask: str, model: str, timeout: float, usage: Optional[dict] = None) -> str:
+        """Provides recorded answer (or asks the AI and records its answer).
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Answer text.
+
+        Raises:
+            AiUnavailableError: If the answer is not recorded (outside the recording mode).
+        """
+        answer = self.get_recorded(ask, model, usage)
+        if answer is None:
+            usage = {} if usage is None else usage
+            answer = self.backend.complete(ask, model=model, timeout=timeout, usage=usage)
+            self.save(ask, model, answer, usage)
+        return answer
+
+    async def acomplete(self, ask: str, model: str, timeout: float, usage: Optional[dict] = None) -> str:
+        """Async version of the 'complete'.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Answer text.
+
+        Raises:
+            AiUnavailableError: If the answer is not recorded (outside the recording mode).
+        """
+        answer = self.get_recorded(ask, model, usage)
+        if answer is None:
+            usage = {} if usage is None else usage
+            answer = await self.backend.acomplete(ask, model=model, timeout=timeout, usage=usage)
+            self.save(ask, model, answer, usage)
+        return answer
+
+    async def aopen_stream(
+        self, ask: str, model: str, timeout: float, usage: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Provides recorded answer in parts (or asks the AI for the streamed answer and records it).
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Async iterator of the next parts of the answer.
+
+        Raises:
+            AiUnavailableError: If the answer is not recorded (outside the recording mode).
+        """
+        answer = self.get_recorded(ask, model, usage)
+        if answer is not None:
+            return self.iter_recorded(answer)
+
+        usage = {} if usage is None else usage
+        parts = await self.backend.aopen_stream(ask, model=model, timeout=timeout, usage=usage)
+        return self.iter_recording(ask, model, parts, usage)
+
+    def get_recorded(self, ask: str, model: str, usage: Optional[dict] = None) -> Optional[str]:
+        """Provides recorded answer (and its token usage).
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            usage: Dictionary filled with the recorded token usage.
+
+        Returns:
+            Answer text or None, if it is not recorded (in the recording mode).
+
+        Raises:
+            AiUnavailableError: If the answer is not recorded (outside the recording mode).
+        """
+        recording = self.__recordings.get(self.get_key(ask, model))
+        if recording is not None:
+            if usage is not None:
+                usage.update(recording.get("usage", {}))
+            return recording["answer"]
+        if not self.record:
+            raise AiClients.get_unavailable_error(f"brak nagranej odpowiedzi ({self.get_key(ask, model)})")
+        return None
+
+    def save(self, ask: str, model: str, answer: str, usage: dict) -> None:
+        """Records the answer (its line is appended to the file).
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            answer: Answer text.
+            usage: Token usage of the answer.
+
+        Returns:
+            None
+        """
+        key = self.get_key(ask, model)
+        recording = {"model": model, "ask": ask, "answer": answer, "usage": usage}
+        line = json.dumps({"key": key, **recording}, ensure_ascii=False) + "\n"
+        with self.__lock:
+            self.__recordings[key] = recording
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+
+    @staticmethod
+    async def iter_recorded(answer: str) -> AsyncIterator[str]:
+        """Yields recorded answer word by word."""
+        for part in re.findall(r"\S+\s*", answer):
+            yield part
+
+    async def iter_recording(self, ask: str, model: str, parts: AsyncIterator[str], usage: dict) -> AsyncIterator[str]:
+        """Yields parts of the streamed answer and records the complete answer."""
+        answer = []
+        async for part in parts:
+            answer.append(part)
+            yield part
+        self.save(ask, model, "".join(answer), usage)
+
+
+class StubAiBackend:
+    """Offline AI backend answering with the canned Polish text after the simulated latency (for load tests).
+
+    Time to the first part of the answer is drawn from the log-normal distribution (median 'latency_median', shape
+    'latency_sigma'; 0 - constant latency), next parts (words) come every 'part_delay'. Complete answer is returned
+    after the time of the whole stream. Attempt exceeding the timeout fails as the openai timeout does
+    ('APITimeoutError'), so the retries and budget of the 'AiClients' are exercised too.
+
+    Attributes:
+        ANSWERS (tuple): Canned answers (chosen by the question hash).
+        URL (str): URL reported in the simulated timeout errors.
+    """
+
+    ANSWERS = (
+        "To jedno z tych miejsc, które najlepiej poznawać powoli. Historia obiektu sięga kilku stuleci, a jego "
+        "bryła nosi ślady kolejnych przebudów. Warto zwrócić uwagę na detale architektoniczne i otoczenie. "
+        "Najlepiej odwiedzić je wiosną lub wczesną jesienią.",
+        "Obiekt jest ważnym świadectwem dziejów regionu i lokalnej tradycji. Przez lata pełnił różne funkcje, "
+        "dziś przyciąga miłośników historii i krajobrazu. W pobliżu znajdziesz szlaki spacerowe i punkty "
+        "widokowe. To dobry cel krótkiej, jednodniowej wycieczki.",
+        "Miejsce zachwyca spokojem i malowniczym położeniem. Okolica od dawna była zamieszkana, o czym "
+        "przypominają liczne pamiątki przeszłości. Warto zaplanować tu dłuższy spacer. Pobliskie miejscowości "
+        "oferują regionalną kuchnię i nocleg.",
+    )
+    URL = "https://api.openai.com/v1/chat/completions"
+
+    def __init__(self, latency_median: float = 1.5, latency_sigma: float = 0.5, part_delay: float = 0.03):
+        """Backend initialization.
+
+        Args:
+            latency_median: Median time to the first part of the answer (in seconds).
+            latency_sigma: Shape of the log-normal latency distribution (0 - constant latency).
+            part_delay: Time between next parts of the answer (in seconds).
+        """
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.part_delay = part_delay
+
+    def get_answer(self, ask: str) -> tuple[list[str], float]:
+        """Provides answer parts and drawn latency.
+
+        Args:
+            ask: Question text.
+
+        Returns:
+            Answer parts (words) and time to the first part (in seconds).
+        """
+        answer = self.ANSWERS[int(sha256(ask.encode()).hexdigest(), 16) % len(self.ANSWERS)]
+        latency = self.latency_median
+        if self.latency_sigma > 0:
+            latency = np.random.default_rng(randbits(128)).lognormal(np.log(self.latency_median), self.latency_sigma)
+        return re.findall(r"\S+\s*", answer), float(latency)
+
+    @staticmethod
+    def put_usage(ask: str, parts: list[str], usage: Optional[dict]) -> None:
+        """Puts estimated token usage (4 characters of the question or 1 word of the answer per token)."""
+        if usage is not None:
+            usage["prompt_tokens"] = ceil(len(ask) / 4)
+            usage["completion_tokens"] = len(parts)
+
+    def get_timeout_error(self) -> APITimeoutError:
+        """Provides simulated timeout error of the openai."""
+        return APITimeoutError(request=httpx.Request("POST", self.URL))
+
+    def complete(self, ask: str, model: str, timeout: float, usage: Optional[dict] = None) -> str:
+        """Provides canned answer after the simulated latency.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Answer text.
+
+        Raises:
+            APITimeoutError: If the simulated latency exceeds the timeout.
+        """
+        parts, latency = self.get_answer(ask)
+        duration = latency + len(parts) * self.part_delay
+        if duration > timeout:
+            sleep(timeout)
+            raise self.get_timeout_error()
+        sleep(duration)
+        self.put_usage(ask, parts, usage)
+        return "".join(parts)
+
+    async def acomplete(self, ask: str, model: str, timeout: float, usage: Optional[dict] = None) -> str:
+        """Async version of the 'complete'.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Answer text.
+
+        Raises:
+            APITimeoutError: If the simulated latency exceeds the timeout.
+        """
+        parts, latency = self.get_answer(ask)
+        duration = latency + len(parts) * self.part_delay
+        if duration > timeout:
+            await asyncio.sleep(timeout)
+            raise self.get_timeout_error()
+        await asyncio.sleep(duration)
+        self.put_usage(ask, parts, usage)
+        return "".join(parts)
+
+    async def aopen_stream(
+        self, ask: str, model: str, timeout: float, usage: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Provides canned answer in parts, the first one after the simulated latency.
+
+        Args:
+            ask: Question text.
+            model: Name of the AI model.
+            timeout: Timeout of the attempt (in seconds).
+            usage: Dictionary filled with the token usage ('prompt_tokens', 'completion_tokens').
+
+        Returns:
+            Async iterator of the next parts of the answer.
+
+        Raises:
+            APITimeoutError: If the simulated latency exceeds the timeout.
+        """
+        parts, latency = self.get_answer(ask)
+        if latency > timeout:
+            await asyncio.sleep(timeout)
+            raise self.get_timeout_error()
+        await asyncio.sleep(latency)
+        self.put_usage(ask, parts, usage)
+        return self.iter_parts(parts)
+
+    async def iter_parts(self, parts: list[str]) -> AsyncIterator[str]:
+        """Yields parts of the answer, every 'part_delay'."""
+        for index, part in enumerate(parts):
+            if index:
+                await asyncio.sleep(self.part_delay)
+            yield part
+
+
+class AiMetrics:
+    """Class with the in-process registry of the AI calls metrics.
+
+    Every AI call ('AiClients', cache status 'miss') and every description served without the call
+    ('AiDescriptionCache', cache status 'hit' or 'coalesced' - answer of the concurrent caller) is recorded for the view
+    handling the request (set by the 'polishness.middleware.AiMetricsMiddleware', '-' outside the requests): prompt
+    length, prompt and completion tokens, wall time, cache status and error. Wall times are counted in the log-spaced
+    histograms (per view and cache status), from which the percentiles are estimated. Registry is started on the first
+    request or record of the process (e.g. of the worker forked by the gunicorn), not at the import.
+
+    Attributes:
+        LATENCY_BUCKETS (np.ndarray): Upper bounds of the histogram buckets (in seconds), 20 per decade.
+        PRICES (dict): Prices of the AI models (USD per 1M prompt tokens, USD per 1M completion tokens).
+        PERCENTILES (tuple): Reported percentiles.
+        VIEW (ContextVar): Holder of the name of the view handling the current request.
+        __views (dict | None): Metrics by the view names (None before the registry start).
+        __started_at (str | None): Time of the registry start (ISO format).
+        __lock (Lock): Lock guarding the registry.
+    """
+
+    LATENCY_BUCKETS = np.geomspace(0.001, 1000, 121)
+    PRICES = {"gpt-3.5-turbo": (0.5, 1.5)}
+    PERCENTILES = (50, 95, 99)
+    VIEW = ContextVar("ai_metrics_view", default=None)
+    __views = None
+    __started_at = None
+    __lock = Lock()
+
+    @classmethod
+    def start_request(cls) -> None:
+        """Starts metrics context of the request (the view is not known yet), the registry is started if needed.
+
+        Returns:
+            None
+        """
+        if cls.__views is None:
+            with cls.__lock:
+                cls.__start()
+        cls.VIEW.set(["-"])
+
+    @classmethod
+    def set_view(cls, view_name: str) -> None:
+        """Sets name of the view handling the current request.
+
+        Args:
+            view_name: View name.
+
+        Returns:
+            None
+        """
+        holder = cls.VIEW.get()
+        if holder is not None:
+            holder[0] = view_name
+
+    @classmethod
+    def get_view(cls) -> str:
+        """Provides name of the view handling the current request.
+
+        Returns:
+            View name ('-' outside the requests).
+        """
+        holder = cls.VIEW.get()
+        return "-" if holder is None else holder[0]
+
+    @classmethod
+    def record(
+        cls,
+        prompt: str,
+        model: str,
+        started: float,
+        cache: str,
+        usage: Optional[dict] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Records the AI call (or the description served without the call).
+
+        Args:
+            prompt: Question text.
+            model: Name of the AI model.
+            started: Monotonic time of the call start.
+            cache: Cache status: 'hit', 'miss' or 'coalesced'.
+            usage: Numbers of the 'prompt_tokens' and 'completion_tokens' (if known).
+            error: Error of the call.
+
+        Returns:
+            None
+        """
+        wall_time = monotonic() - started
+        usage = usage or {}
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        prompt_price, completion_price = cls.PRICES.get(model, (0.0, 0.0))
+        bucket = min(int(np.searchsorted(cls.LATENCY_BUCKETS, wall_time)), len(cls.LATENCY_BUCKETS) - 1)
+        with cls.__lock:
+            cls.__start()
+            metrics = cls.__views.setdefault(
+                cls.get_view(),
+                {
+                    "calls": 0,
+                    "cache": defaultdict(int),
+                    "errors": defaultdict(int),
+                    "prompt_chars": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost_usd": 0.0,
+                    "wall_time": {},
+                },
+            )
+            metrics["calls"] += 1
+            metrics["cache"][cache] += 1
+            if error is not None:
+                metrics["errors"][type(error).__name__] += 1
+            metrics["prompt_chars"] += len(prompt)
+            metrics["prompt_tokens"] += prompt_tokens
+            metrics["completion_tokens"] += completion_tokens
+            metrics["cost_usd"] += (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+            histogram = metrics["wall_time"].setdefault(
+                cache, {"count": 0, "sum": 0.0, "max": 0.0, "buckets": np.zeros(len(cls.LATENCY_BUCKETS), dtype=int)}
+            )
+            histogram["count"] += 1
+            histogram["sum"] += wall_time
+            histogram["max"] = max(histogram["max"], wall_time)
+            histogram["buckets"][bucket] += 1
+
+    @classmethod
+    def get_percentiles(cls, buckets: np.ndarray) -> dict[str, float]:
+        """Estimates percentiles of the wall time from the histogram (upper bound of the bucket).
+
+        Args:
+            buckets: Counts of the histogram buckets.
+
+        Returns:
+            Percentiles (in seconds) by their names, e.g. 'p95'.
+        """
+        cumulative = np.cumsum(buckets)
+        indexes = np.searchsorted(cumulative, np.array(cls.PERCENTILES) / 100 * cumulative[-1])
+        return {
+            f"p{percentile}": float(cls.LATENCY_BUCKETS[index]) for percentile, index in zip(cls.PERCENTILES, indexes)
+        }
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """Provides metrics of the process (JSON serializable).
+
+        Returns:
+            Dictionary with the metrics by the view names.
+        """
+        with cls.__lock:
+            cls.__start()
+            views = {}
+            for view_name, metrics in cls.__views.items():
+                wall_time = {}
+                for status, histogram in metrics["wall_time"].items():
+                    buckets = histogram["buckets"]
+                    wall_time[status] = {
+                        "count": histogram["count"],
+                        "mean": histogram["sum"] / histogram["count"],
+                        "max": histogram["max"],
+                        **cls.get_percentiles(buckets),
+                        "histogram": {
+                            f"{cls.LATENCY_BUCKETS[index]:.4g}": int(buckets[index])
+                            for index in np.flatnonzero(buckets)
+                        },
+                    }
+                views[view_name] = {
+                    **metrics,
+                    "cache": dict(metrics["cache"]),
+                    "errors": dict(metrics["errors"]),
+                    "cost_usd": round(metrics["cost_usd"], 6),
+                    "wall_time": wall_time,
+                }
+        return {"pid": getpid(), "started_at": cls.__started_at, "views": views}
+
+    @classmethod
+    def reset(cls) -> None:
+        """Clears the registry.
+
+        Returns:
+            None
+        """
+        with cls.__lock:
+            cls.__views = None
+            cls.__start()
+
+    @classmethod
+    def __start(cls) -> None:
+        """Starts the registry, if it is not started (called with the lock held)."""
+        if cls.__views is None:
+            cls.__views = {}
+            cls.__started_at = timezone.now().isoformat()
+
+
+class AiPrompts:
+    """Class with static methods building questions to the AI about the catalog objects.
+
+    Attributes:
+        LENGTH_LIMIT (str): Instruction limiting the length of the answer (used on the detail pages).
+        HOME (str): Question for the home page paragraph.
+    """
+
+    LENGTH_LIMIT = "Opis ma mieć maksymalnie 4 zdania."
+    HOME = (
+        "Opowiedz, jak poznawać Polskę i dobrze się przy tym bawić? "
+        "Zwróć tekst sformatowany, z paragrafami. Ma być 1 akapit."
+    )
+
+    @classmethod
+    def monument(cls, monument: Monument, short: bool = False) -> str:
+        """Provides question about the monument.
+
+        Args:
+            monument: Monument object.
+            short: If True, length of the answer is limited.
+
+        Returns:
+            Question text.
+        """
+        ask_text = f"Opowiedz mi o zabytku: {monument.name}, {monument.locality}"
+        if monument.street and monument.street != "nan":
+            ask_text += f", {monument.street}"
+
+        if monument.address_number and monument.address_number != "nan":
+            ask_text += f", {monument.address_number}"
+
+        if monument.chronology != "Data nieznana":
+            ask_text += f", czas pochodzenia zabytku {monument.chronology}"
+
+        if short:
+            ask_text += cls.LENGTH_LIMIT
+        return ask_text
+
+    @classmethod
+    def archeological_monument(cls, monument: ArcheologicalMonument, short: bool = False) -> str:
+        """Provides question about the archeological monument.
+
+        Args:
+            monument: Archeological monument object.
+            short: If True, length of the answer is limited.
+
+        Returns:
+            Question text.
+        """
+        ask_text = (
+            f"Opowiedz mi o zabytku archeogicznym: "
+            f"{monument.name}, {monument.locality}, {monument.chronology}, {monument.function}"
+        )
+        if short:
+            ask_text += f". {cls.LENGTH_LIMIT}"
+        return ask_text
+
+    @classmethod
+    def geographical_object(cls, geographical_object: GeographicalObject, short: bool = False) -> str:
+        """Provides question about the geographical object.
+
+        Args:
+            geographical_object: Geographical object.
+            short: If True, length of the answer is limited.
+
+        Returns:
+            Question text.
+        """
+        ask_text = (
+            f"Opowiedz mi o obiekcie przyrodniczym: {geographical_object.name}. "
+            f"Typ obiektu: {geographical_object.geo_object_type}. "
+            f"Lokalizacja obiektu: województwo {geographical_object.voivodeship}, "
+            f"powiat: {geographical_object.county}, gmina: {geographical_object.parish}."
+        )
+        if short:
+            ask_text += f" {cls.LENGTH_LIMIT}"
+        return ask_text
+
+    @classmethod
+    def for_object(cls, item: Monument | ArcheologicalMonument | GeographicalObject, short: bool = False) -> str:
+        """Provides question about the catalog object of any model.
+
+        Args:
+            item: Catalog object.
+            short: If True, length of the answer is limited.
+
+        Returns:
+            Question text.
+        """
+        if isinstance(item, Monument):
+            return cls.monument(item, short=short)
+        if isinstance(item, ArcheologicalMonument):
+            return cls.archeological_monument(item, short=short)
+        return cls.geographical_object(item, short=short)
+
+
+class HomeParagraphPool:
+    """Class with functionalities for the pool of pre-generated home page paragraphs.
+
+    Paragraphs are generated in the background (Celery beat task 'refresh_home_paragraphs') and stored
+    in the database ('HomeParagraph' model), the home page picks one of them at random, without calling the AI.
+    Pool size and number of paragraphs replaced by each refresh are configured by the 'HOME_PARAGRAPH_POOL_SIZE'
+    and 'HOME_PARAGRAPH_REFRESH_COUNT' settings.
+
+    Attributes:
+        FALLBACK (str): Paragraph shown before the pool is filled.
+        LOCAL_TTL (int): Lifetime of the in-process copy of the pool (in seconds).
+        __pool (tuple): In-process copy of the pool: (load timestamp, paragraphs).
+    """
+
+    FALLBACK = (
+        "Polskę najlepiej poznawać z ciekawością i bez pośpiechu: wybierz region, zajrzyj do lokalnych zabytków, "
+        "wyrusz na szlak przyrodniczy i spróbuj regionalnej kuchni. Każda wycieczka to okazja, by odkryć historię, "
+        "tradycje i ludzi, którzy tworzą to miejsce - a przy tym świetnie się bawić."
+    )
+    LOCAL_TTL = 60
+    __pool = (0.0, [])
+
+    @classmethod
+    def pick(cls) -> str:
+        """Provides random paragraph from the pool (no AI call is made).
+
+        Returns:
+            Paragraph text.
+        """
+        loaded_at, paragraphs = cls.__pool
+        if monotonic() - loaded_at > cls.LOCAL_TTL:
+            paragraphs = list(HomeParagraph.objects.values_list("content", flat=True))
+            cls.__pool = (monotonic(), paragraphs)
+
+        if not paragraphs:
+            return cls.FALLBACK
+
+        return paragraphs[randbelow(len(paragraphs))]
+
+    @classmethod
+    def refresh(cls, ai_model: str = OPENAI_MODEL) -> int:
+        """Generates new paragraphs (filling the pool or replacing the oldest ones).
+
+        Args:
+            ai_model: Name of the AI model.
+
+        Returns:
+            Number of the generated paragraphs (the refresh stops at the first AI call, which did not fit
+            in the limits).
+        """
+        pool_size = settings.HOME_PARAGRAPH_POOL_SIZE
+        missing = pool_size - HomeParagraph.objects.count()
+        count = max(missing, min(settings.HOME_PARAGRAPH_REFRESH_COUNT, pool_size))
+        for generated in range(count):
+            try:
+                content = ask_ai(ask=AiPrompts.HOME, model=ai_model)
+            except AiUnavailableError:
+                count = generated
+                break
+            HomeParagraph.objects.create(content=content, ai_model=ai_model)
+
+        outdated_ids = list(HomeParagraph.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        HomeParagraph.objects.filter(id__in=outdated_ids[pool_size:]).delete()
+        cls.__pool = (0.0, [])
+        return count
+
+
+class SingleFlight:
+    """Class coalescing the concurrent identical calls (single-flight).
+
+    The first caller of the key becomes the leader and makes the call, other callers wait for its result:
+     - callers of the same process (threads or tasks of the event loop) wait on the future of the leader,
+     - callers of other processes (workers) wait for the lock in the cache backend ('CACHES' setting) to be
+       released and then read the result stored by the leader ('lookup').
+    If the leader fails (its error is raised to the leader only) or is abandoned, waiting callers try again,
+    so one of them becomes the new leader and makes the call.
+
+    Attributes:
+        LOCK_KEY (str): Cache key of the lock held by the leader ({key} is replaced).
+        POLL_INTERVAL (float): Pause between checks of the lock held by other process (in seconds).
+        __futures (dict): Futures of the calls in progress (in threads) by their keys.
+        __async_futures (WeakKeyDictionary): Futures of the calls in progress by their event loops and keys.
+        __lock (Lock): Lock guarding the '__futures'.
+    """
+
+    LOCK_KEY = "polishness:single-flight:{key}"
+    POLL_INTERVAL = 0.1
+    __futures = {}
+    __async_futures = WeakKeyDictionary()
+    __lock = Lock()
+
+    @classmethod
+    def run(cls, key: str, compute: Callable[[], Any], lookup: Callable[[], Any], timeout: float) -> Any:
+        """Provides result of the call, made once for all the concurrent callers of the key.
+
+        Args:
+            key: Key of the call.
+            compute: Function making the call, its result has to be available for the 'lookup' of other processes.
+            lookup: Function providing stored result (or None).
+            timeout: Maximal time of waiting for the result of other caller (in seconds).
+
+        Returns:
+            Result of the call.
+
+        Raises:
+            TimeoutError: If the result of other caller was not received in time.
+        """
+        deadline = monotonic() + timeout
+        while True:
+            with cls.__lock:
+                future = cls.__futures.get(key)
+                is_leader = future is None
+                if is_leader:
+                    future = cls.__futures[key] = Future()
+
+            if not is_leader:
+                try:
+                    value = future.result(timeout=max(deadline - monotonic(), 0))
+                except FutureTimeoutError:
+                    raise TimeoutError(f"Przekroczony czas oczekiwania na wynik wywołania {key!r}.")
+                if value is None:
+                    continue
+                return value
+
+            value = None
+            try:
+                value = cls.__run_locked(key, compute, lookup, timeout, deadline)
+                return value
+            finally:
+                with cls.__lock:
+                    del cls.__futures[key]
+                if not future.done():
+                    future.set_result(value)
+
+    @classmethod
+    async def arun(
+        cls, key: str, acompute: Callable[[], Awaitable], alookup: Callable[[], Awaitable], timeout: float
+    ) -> Any:
+        """Async version of the 'run'.
+
+        Args:
+            key: Key of the call.
+            acompute: Coroutine function making the call, its result has to be available for the 'alookup'
+                of other processes.
+            alookup: Coroutine function providing stored result (or None).
+            timeout: Maximal time of waiting for the result of other caller (in seconds).
+
+        Returns:
+            Result of the call.
+
+        Raises:
+            TimeoutError: If the result of other caller was not received in time.
+        """
+        deadline = monotonic() + timeout
+        while True:
+            is_leader, future = cls.__join(key)
+            if not is_leader:
+                value = await cls.__wait(key, future, deadline)
+                if value is None:
+                    continue
+                return value
+
+            value = None
+            try:
+                lock_key, token, value = await cls.__alock(key, alookup, timeout, deadline)
+                if value is None:
+                    try:
+                        value = await acompute()
+                    finally:
+                        await cls.__aunlock(lock_key, token)
+                return value
+            finally:
+                cls.__leave(key, future, value)
+
+    @classmethod
+    async def astream(
+        cls, key: str, agenerate: Callable[[], AsyncIterator], alookup: Callable[[], Awaitable], timeout: float
+    ) -> AsyncIterator:
+        """Streaming version of the 'arun': the leader yields parts of the result as they are generated, other
+        callers yield complete result (stored by the leader) at once.
+
+        Args:
+            key: Key of the call.
+            agenerate: Async generator function making the call, complete result has to be available for
+                the 'alookup' of other processes when the generator is finished.
+            alookup: Coroutine function providing stored result (or None).
+            timeout: Maximal time of waiting for the result of other caller (in seconds).
+
+        Yields:
+            Parts of the result (leader) or complete result (other callers).
+
+        Raises:
+            TimeoutError: If the result of other caller was not received in time.
+        """
+        deadline = monotonic() + timeout
+        while True:
+            is_leader, future = cls.__join(key)
+            if not is_leader:
+                value = await cls.__wait(key, future, deadline)
+                if value is None:
+                    continue
+                yield value
+                return
+
+            value = None
+            try:
+                lock_key, token, value = await cls.__alock(key, alookup, timeout, deadline)
+                if value is not None:
+                    yield value
+                    return
+
+                try:
+                    async for part in agenerate():
+                        yield part
+                finally:
+                    await cls.__aunlock(lock_key, token)
+                value = await alookup()
+                return
+            finally:
+                cls.__leave(key, future, value)
+
+    @classmethod
+    def __run_locked(
+        cls, key: str, compute: Callable[[], Any], lookup: Callable[[], Any], timeout: float, deadline: float
+    ) -> Any:
+        """Makes the call holding the lock in the cache backend (or provides result of the call of other process)."""
+        lock_key = cls.LOCK_KEY.format(key=key)
+        token = uuid4().hex
+        while True:
+            if cache.add(lock_key, token, timeout=ceil(timeout)):
+                try:
+                    value = lookup()
+                    return compute() if value is None else value
+                finally:
+                    if cache.get(lock_key) == token:
+                        cache.delete(lock_key)
+
+            while cache.get(lock_key) is not None:
+                if monotonic() >= deadline:
+                    raise TimeoutError(f"Przekroczony czas oczekiwania na wynik wywołania {key!r} innego procesu.")
+                sleep(cls.POLL_INTERVAL)
+
+            value = lookup()
+            if value is not None:
+                return value
+
+    @classmethod
+    async def __alock(
+        cls, key: str, alookup: Callable[[], Awaitable], timeout: float, deadline: float
+    ) -> tuple[str, str, Any]:
+        """Takes the lock in the cache backend (or provides result of the call of other process).
+
+        Returns:
+            Cache key of the lock, token of the lock holder and stored result (if not None, the lock is not held).
+        """
+        lock_key = cls.LOCK_KEY.format(key=key)
+        token = uuid4().hex
+        while True:
+            if await cache.aadd(lock_key, token, timeout=ceil(timeout)):
+                value = await alookup()
+                if value is not None:
+                    await cls.__aunlock(lock_key, token)
+                return lock_key, token, value
+
+            while await cache.aget(lock_key) is not None:
+                if monotonic() >= deadline:
+                    raise TimeoutError(f"Przekroczony czas oczekiwania na wynik wywołania {key!r} innego procesu.")
+                await asyncio.sleep(cls.POLL_INTERVAL)
+
+            value = await alookup()
+            if value is not None:
+                return lock_key, token, value
+
+    @classmethod
+    async def __aunlock(cls, lock_key: str, token: str) -> None:
+        """Releases the lock in the cache backend (if it is still held by the token)."""
+        if await cache.aget(lock_key) == token:
+            await cache.adelete(lock_key)
+
+    @classmethod
+    def __join(cls, key: str) -> tuple[bool, asyncio.Future]:
+        """Provides future of the call in the running event loop (created, if the caller is the leader).
+
+        Returns:
+            Leader flag and future of the call.
+        """
+        loop = asyncio.get_running_loop()
+        futures = cls.__async_futures.setdefault(loop, {})
+        future = futures.get(key)
+        if future is not None:
+            return False, future
+
+        future = futures[key] = loop.create_future()
+        return True, future
+
+    @classmethod
+    async def __wait(cls, key: str, future: asyncio.Future, deadline: float) -> Any:
+        """Waits for the result of the leader of the running event loop."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=max(deadline - monotonic(), 0))
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Przekroczony czas oczekiwania na wynik wywołania {key!r}.")
+
+    @classmethod
+    def __leave(cls, key: str, future: asyncio.Future, value: Any) -> None:
+        """Removes future of the call of the running event loop and passes the result to other callers."""
+        cls.__async_futures[asyncio.get_running_loop()].pop(key, None)
+        if not future.done():
+            future.set_result(value)
+
+
+class AiDescriptionCache:
+    """Class with functionalities for caching AI descriptions of the catalog objects.
+
+    Descriptions are keyed by (model class, primary key, prompt hash, AI model name) and stored in the database
+    ('AiDescription' model), with the in-process LRU in front. Lifetime and LRU size are configured by
+    the 'AI_DESCRIPTION_CACHE_TTL' and 'AI_DESCRIPTION_CACHE_SIZE' settings. Invalidation bumps the version
+    of the model kept in the Django cache and records the invalidated primary keys under that version, so other
+    processes (checking the versions at most once per 'VERSION_CHECK_INTERVAL') drop only the invalidated
+    objects from their LRUs. Concurrent questions about the same
+    description are coalesced ('SingleFlight'), so the AI is asked once. Descriptions served without asking the AI
+    are recorded in the 'AiMetrics' (cache status 'hit' or 'coalesced').
+
+    Attributes:
+        FLIGHT_MARGIN (int): Time added to the 'AI_BUDGET' setting for waiting for the answer of other caller
+            (in seconds).
+        VERSION_CACHE_KEY (str): Django cache key template of the descriptions version of the model
+            (number of the invalidations).
+        INVALIDATION_CACHE_KEY (str): Django cache key template of the primary keys invalidated in the version
+            ({"ids": None} - all objects of the model).
+        INVALIDATION_TIMEOUT (int): Lifetime of the invalidated primary keys in the Django cache (in seconds).
+        MAX_INVALIDATIONS (int): Maximal number of the missed invalidations replayed one by one (more - all
+            descriptions of the model are dropped from the LRU).
+        VERSION_CHECK_INTERVAL (float): Minimal time between the version checks (in seconds).
+        __lru (OrderedDict): In-process LRU: key -> (description, creation timestamp).
+        __lru_versions (dict): Versions of the descriptions held in the LRU by the model label.
+        __version_checked_at (float): Time of the last version check (monotonic clock).
+        __lock (Lock): Lock guarding the LRU.
+    """
+
+    FLIGHT_MARGIN = 5
+    VERSION_CACHE_KEY = "polishness:ai-descriptions-version:{label}"
+    INVALIDATION_CACHE_KEY = "polishness:ai-descriptions-invalidation:{label}:{version}"
+    INVALIDATION_TIMEOUT = 86400
+    MAX_INVALIDATIONS = 100
+    VERSION_CHECK_INTERVAL = 5.0
+    __lru = OrderedDict()
+    __lru_versions = {}
+    __version_checked_at = 0.0
+    __lock = Lock()
+
+    @staticmethod
+    def get_key(item: models.Model, prompt: str, ai_model: str) -> tuple[str, int, str, str]:
+        """Provides cache key of the description.
+
+        Args:
+            item: Catalog object.
+            prompt: Question text.
+            ai_model: Name of the AI model.
+
+        Returns:
+            Tuple with model label, primary key, prompt hash and AI model name.
+        """
+        return item._meta.label_lower, item.pk, sha256(prompt.encode()).hexdigest(), ai_model
+
+    @classmethod
+    def get_flight_key(cls, item: models.Model, prompt: str, ai_model: str) -> str:
+        """Provides key of the question about the description, for coalescing concurrent questions.
+
+        Args:
+            item: Catalog object.
+            prompt: Question text.
+            ai_model: Name of the AI model.
+
+        Returns:
+            Key text.
+        """
+        return "ai-description:" + ":".join(str(part) for part in cls.get_key(item, prompt, ai_model))
+
+    @classmethod
+    def get(cls, item: models.Model, prompt: str, ai_model: str = OPENAI_MODEL) -> Optional[str]:
+        """Provides cached description.
+
+        Args:
+            item: Catalog object.
+            prompt: Question text.
+            ai_model: Name of the AI model.
+
+        Returns:
+            Description text or None if it is not cached (or expired).
+        """
+        key = cls.get_key(item, prompt, ai_model)
+        ttl = settings.AI_DESCRIPTION_CACHE_TTL
+        with cls.__lock:
+            cls.__check_version(key[0])
+            cached = cls.__lru.get(key)
+            if cached is not None and (not ttl or datetime.datetime.now().timestamp() - cached[1] < ttl):
+                cls.__lru.move_to_end(key)
+                return cached[0]
+
+        descriptions = AiDescription.objects.filter(
+            object_model=key[0], object_id=key[1], prompt_hash=key[2], ai_model=key[3]
+        )
+        if ttl:
+            descriptions = descriptions.filter(created_at__gte=timezone.now() - datetime.timedelta(seconds=ttl))
+        description = descriptions.values_list("content", "created_at").first()
+        if description is None:
+            return None
+
+        cls.__remember(key, description[0], description[1].timestamp())
+        return description[0]
+
+    @classmethod
+    def set(cls, item: models.Model, prompt: str, content: str, ai_model: str = OPENAI_MODEL) -> None:
+        """Stores description.
+
+        Args:
+            item: Catalog object.
+            prompt: Question text.
+            content: Description text.
+            ai_model: Name of the AI model.
+
+        Returns:
+            None
+        """
+        key = cls.get_key(item, prompt, ai_model)
+        created_at = timezone.now()
+        AiDescription.objects.update_or_create(
+            object_model=key[0],
+            object_id=key[1],
+            prompt_hash=key[2],
+            ai_model=key[3],
+            defaults={"content": content, "created_at": created_at},
+        )
+        cls.__remember(key, content, created_at.timestamp())
+
+    @classmethod
+    def get_or_ask(cls, item: models.Model, prompt: str, ai_model: str = OPENAI_MODEL) -> str:
+        """Provides cached description or asks the AI (and stores the answer).
+
+        Args:
+            item: Catalog object.
+            prompt: Question text.
+            ai_model: Name of the AI model.
+
+        Returns:
+            Description text ('AiClients.FALLBACK', not stored, if the AI answer is not available).
+        """
+        started = monotonic()
+        content = cls.get(item, prompt, ai_model)
+        if content is not None:
+            AiMetrics.record(prompt, ai_model, started, cache="hit")
+            return content
+
+        is_asked = False
+
+        def ask() -> str:
+            nonlocal is_asked
+            is_asked = True
+            answer = ask_ai(ask=prompt, model=ai_model)
+            cls.set(item, prompt, answer, ai_model)
+            return answer
+
+        try:
+            content = SingleFlight.run(
+                cls.get_flight_key(item, prompt, ai_model),
+                compute=ask,
+                lookup=lambda: cls.get(item, prompt, ai_model),
+                timeout=settings.AI_BUDGET + cls.FLIGHT_MARGIN,
+            )
+        except (AiUnavailableError, TimeoutError) as error:
+            if not is_asked:
+                AiMetrics.record(prompt, ai_model, started, cache="coalesced", error=error)
+            return AiClients.FALLBACK
+
+        if not is_asked:
+            AiMetrics.record(prompt, ai_model, started, cache="coalesced")
+        return content
+
+    @classmethod
+    async def aget_or_ask(cls, item: models.Model, prompt: str, ai_model: str = OPENAI_MODEL) -> str:
+        """Async version of the 'get_or_ask' (the AI is asked with the shared async client).
+
+        Args:
+            item: Catalog object.
+            prompt: Question text.
+            ai_model: Name of the AI model.
+
+        Returns:
+            Description text ('AiClients.FALLBACK', not stored, if the AI answer is not available).
+        """
+        started = monotonic()
+        content = await sync_to_async(cls.get)(item, prompt, ai_model)
+        if content is not None:
+            AiMetrics.record(prompt, ai_model, started, cache="hit")
+            return content
+
+        is_asked = False
+
+        async def ask() -> str:
+            nonlocal is_asked
+            is_asked = True
+            answer = await ask_ai_async(ask=prompt, model=ai_model)
+            await sync_to_async(cls.set)(item, prompt, answer, ai_model)
+            return answer
+
+        try:
+            content = await SingleFlight.arun(
+                cls.get_flight_key(item, prompt, ai_model),
+                acompute=ask,
+                alookup=lambda: sync_to_async(cls.get)(item, prompt, ai_model),
+                timeout=settings.AI_BUDGET + cls.FLIGHT_MARGIN,
+            )
+        except (AiUnavailableError, TimeoutError) as error:
+            if not is_asked:
+                AiMetrics.record(prompt, ai_model, started, cache="coalesced", error=error)
+            return AiClients.FALLBACK
+
+        if not is_asked:
+            AiMetrics.record(prompt, ai_model, started, cache="coalesced")
+        return content
+
+    @classmethod
+    async def astream_or_ask(cls, item: models.Model, prompt: str, ai_model: str = OPENAI_MODEL) -> AsyncIterator[str]:
+        """Streaming version of the 'aget_or_ask'.
+
+        Cached description is yielded at once. Otherwise the parts of the answer are yielded as they come
+        from the AI and the complete answer is stored (answer interrupted by the client is not stored).
+        If the AI answer is not available, 'AiClients.FALLBACK' is yielded (not stored).
+
+        Args:
+            item: Catalog object.
+            prompt: Question text.
+            ai_model: Name of the AI model.
+
+        Yields:
+            Description text in parts.
+
+        Raises:
+            AiUnavailableError: If the stream of the answer was broken after its first part.
+        """
+        started = monotonic()
+        content = await sync_to_async(cls.get)(item, prompt, ai_model)
+        if content is not None:
+            AiMetrics.record(prompt, ai_model, started, cache="hit")
+            yield content
+            return
+
+        is_asked = False
+
+        async def ask() -> AsyncIterator[str]:
+            nonlocal is_asked
+            is_asked = True
+            parts = []
+            async for part in ask_ai_stream(ask=prompt, model=ai_model):
+                parts.append(part)
+                yield part
+            await sync_to_async(cls.set)(item, prompt, "".join(parts), ai_model)
+
+        is_started = False
+        try:
+            async for part in SingleFlight.astream(
+                cls.get_flight_key(item, prompt, ai_model),
+                agenerate=ask,
+                alookup=lambda: sync_to_async(cls.get)(item, prompt, ai_model),
+                timeout=settings.AI_BUDGET + cls.FLIGHT_MARGIN,
+            ):
+                is_started = True
+                yield part
+        except (AiUnavailableError, TimeoutError) as error:
+            if not is_asked:
+                AiMetrics.record(prompt, ai_model, started, cache="coalesced", error=error)
+            if is_started:
+                raise
+            yield AiClients.FALLBACK
+            return
+
+        if not is_asked:
+            AiMetrics.record(prompt, ai_model, started, cache="coalesced")
+
+    @classmethod
+    def invalidate(cls, model: Optional[type[models.Model]] = None, ids: Optional[list[int]] = None) -> int:
+        """Deletes stored descriptions.
+
+        Args:
+            model: Catalog model class. If not given, descriptions of all objects are deleted.
+            ids: Primary keys of the objects. If not given, descriptions of all objects of the model are deleted.
+
+        Returns:
+            Number of the deleted descriptions.
+        """
+        descriptions = AiDescription.objects.all()
+        if model is not None:
+            labels = {model._meta.label_lower}
+            descriptions = descriptions.filter(object_model=model._meta.label_lower)
+            if ids is not None:
+                ids = [int(pk) for pk in ids]
+                descriptions = descriptions.filter(object_id__in=ids)
+        else:
+            labels = set(descriptions.values_list("object_model", flat=True).distinct())
+            with cls.__lock:
+                labels |= set(cls.__lru_versions)
+        deleted, _ = descriptions.delete()
+
+        for label in labels:
+            version_key = cls.VERSION_CACHE_KEY.format(label=label)
+            cache.add(version_key, 0, None)
+            version = cache.incr(version_key)
+            cache.set(
+                cls.INVALIDATION_CACHE_KEY.format(label=label, version=version), {"ids": ids}, cls.INVALIDATION_TIMEOUT
+            )
+            with cls.__lock:
+                cls.__drop(label, ids)
+                if cls.__lru_versions.get(label) == version - 1:
+                    # no invalidations of other processes missed - nothing to replay at the next check
+                    cls.__lru_versions[label] = version
+        return deleted
+
+    @classmethod
+    def delete_expired(cls) -> int:
+        """Deletes expired descriptions from the database.
+
+        Returns:
+            Number of the deleted descriptions.
+        """
+        ttl = settings.AI_DESCRIPTION_CACHE_TTL
+        if not ttl:
+            return 0
+
+        deleted, _ = AiDescription.objects.filter(
+            created_at__lt=timezone.now() - datetime.timedelta(seconds=ttl)
+        ).delete()
+        return deleted
+
+    @classmethod
+    def __remember(cls, key: tuple, content: str, created_at: float) -> None:
+        with cls.__lock:
+            cls.__check_version(key[0])
+            cls.__lru[key] = (content, created_at)
+            cls.__lru.move_to_end(key)
+            while len(cls.__lru) > settings.AI_DESCRIPTION_CACHE_SIZE:
+                cls.__lru.popitem(last=False)
+
+    @classmethod
+    def __check_version(cls, label: str) -> None:
+        """Drops descriptions invalidated by other processes from the LRU (called with the lock held).
+
+        Versions of all models held in the LRU are read with one cache query, at most once per
+        'VERSION_CHECK_INTERVAL' (version of a model seen for the first time is read at once).
+        """
+        now = monotonic()
+        if label in cls.__lru_versions and now - cls.__version_checked_at < cls.VERSION_CHECK_INTERVAL:
+            return
+
+        cls.__version_checked_at = now
+        labels = {*cls.__lru_versions, label}
+        version_keys = {cls.VERSION_CACHE_KEY.format(label=item): item for item in labels}
+        versions = {version_keys[key]: version for key, version in cache.get_many(list(version_keys)).items()}
+        for item in labels:
+            version = versions.get(item, 0)
+            lru_version = cls.__lru_versions.get(item)
+            cls.__lru_versions[item] = version
+            if lru_version is None or version == lru_version:
+                continue
+            if version < lru_version or version - lru_version > cls.MAX_INVALIDATIONS:
+                cls.__drop(item, None)
+                continue
+
+            invalidation_keys = [
+                cls.INVALIDATION_CACHE_KEY.format(label=item, version=number)
+                for number in range(lru_version + 1, version + 1)
+            ]
+            invalidations = cache.get_many(invalidation_keys).values()
+            if len(invalidations) < len(invalidation_keys) or any(entry["ids"] is None for entry in invalidations):
+                cls.__drop(item, None)
+            else:
+                cls.__drop(item, [pk for entry in invalidations for pk in entry["ids"]])
+
+    @classmethod
+    def __drop(cls, label: str, ids: Optional[list[int]]) -> None:
+        """Drops descriptions of the objects from the LRU (called with the lock held)."""
+        ids = None if ids is None else set(ids)
+        for key in [key for key in cls.__lru if key[0] == label and (ids is None or key[1] in ids)]:
+            del cls.__lru[key]
+
+
+class AiPregenerator:
+    """Class with functionalities for bulk pre-generation of AI descriptions of the catalog objects.
+
+    Objects are walked in the primary key order and asked about with the same prompts as the detail views
+    ('AiPrompts.for_object', short and full variants). Answers are stored in the 'AiDescriptionCache', already stored
+    descriptions are skipped. Progress is checkpointed in the database ('AiPregenerationCheckpoint') after each batch,
+    so the interrupted run resumes after the last checkpointed object. Checkpoint is not moved past the first object
+    with a failed description (it is asked again by the next batch, its stored neighbours are skipped). If no object
+    of the batch is completed, the run is stopped ('stopped_at' of the checkpoint is set) and should be retried later
+    (see 'get_retry_countdown'), the object failing in 'MAX_ATTEMPTS' consecutive runs is recorded as failed
+    ('failed_ids' of the checkpoint) and passed. Requests per minute and parallel requests are limited by
+    the 'AI_PREGENERATION_RPM' and 'AI_PREGENERATION_CONCURRENCY' settings.
+
+    Attributes:
+        BATCH_SIZE (int): Maximal number of the objects per checkpoint.
+        BATCH_SECONDS (int): Expected duration of the batch at the requests per minute limit (in seconds).
+        MAX_ATTEMPTS (int): Number of the stopped runs on the same object, after which the object is passed.
+        RETRY_COUNTDOWN (int): Pause before the retry of the first stopped run (in seconds), doubled by each attempt.
+        MAX_RETRY_COUNTDOWN (int): Maximal pause before the retry of the stopped run (in seconds).
+        VARIANTS (dict): Prompt variants: name -> 'short' flag of the prompt.
+        LOGGER (logging.Logger): Dedicated logger object for the pre-generation.
+    """
+
+    BATCH_SIZE = 50
+    BATCH_SECONDS = 30
+    MAX_ATTEMPTS = 5
+    RETRY_COUNTDOWN = 60
+    MAX_RETRY_COUNTDOWN = 3600
+    VARIANTS = {"short": True, "full": False}
+    LOGGER = configure_logger(logger_name="ai_pregeneration")
+
+    def __init__(
+        self,
+        kind: str,
+        voivodeships: Optional[list[str]] = None,
+        variants: tuple[str, ...] = ("short", "full"),
+        ai_model: str = OPENAI_MODEL,
+    ):
+        """Pre-generator initialization.
+
+        Args:
+            kind: Catalog model name (one of the 'ResultPages.MODELS' keys).
+            voivodeships: Names of the voivodeships to walk (all objects, if None).
+            variants: Names of the prompt variants (see 'VARIANTS').
+            ai_model: Name of the AI model.
+        """
+        unknown = set(variants) - set(self.VARIANTS)
+        if kind not in ResultPages.MODELS or not variants or unknown:
+            raise ValueError(f"Nieznany model {kind!r} lub warianty zapytań {variants!r}.")
+
+        self.kind = kind
+        self.model = ResultPages.MODELS[kind]
+        self.voivodeships = sorted({normalize_text(voivodeship) for voivodeship in voivodeships or []})
+        self.variants = tuple(variants)
+        self.ai_model = ai_model
+        self.rpm = settings.AI_PREGENERATION_RPM
+        self.concurrency = settings.AI_PREGENERATION_CONCURRENCY
+        self.__next_slot = 0.0
+        self.__lock = Lock()
+
+    def get_checkpoint_name(self) -> str:
+        """Provides name of the run (checkpoint key).
+
+        Returns:
+            Name text.
+        """
+        voivodeships = ",".join(self.voivodeships) or "*"
+        return f"{self.kind}:{voivodeships}:{','.join(self.variants)}:{self.ai_model}"
+
+    def get_queryset(self) -> QuerySet:
+        """Provides objects to walk (in the primary key order).
+
+        Returns:
+            Queryset of the catalog objects.
+        """
+        queryset = self.model.objects.order_by("id")
+        if self.voivodeships:
+            queryset = queryset.filter(voivodeship_normalized__in=self.voivodeships)
+        return queryset
+
+    def get_batch_size(self) -> int:
+        """Provides number of the objects per batch, so the batch lasts about 'BATCH_SECONDS' at the limit.
+
+        Returns:
+            Batch size.
+        """
+        return max(1, min(self.BATCH_SIZE, int(self.rpm * self.BATCH_SECONDS / 60 / len(self.variants))))
+
+    def reset(self) -> None:
+        """Deletes checkpoint of the run, so the next run starts from the beginning.
+
+        Returns:
+            None
+        """
+        AiPregenerationCheckpoint.objects.filter(name=self.get_checkpoint_name()).delete()
+
+    def run(self, time_limit: Optional[float] = None) -> AiPregenerationCheckpoint:
+        """Generates descriptions of the objects after the checkpoint.
+
+        Args:
+            time_limit: Time (in seconds), after which no new batch is started (no limit, if None).
+
+        Returns:
+            Checkpoint of the run: 'finished_at' is set, if all objects are processed, 'stopped_at' is set, if the run
+            was stopped without progress (neither is set, if the time limit was reached).
+        """
+        checkpoint, _ = AiPregenerationCheckpoint.objects.get_or_create(name=self.get_checkpoint_name())
+        deadline = None if time_limit is None else monotonic() + time_limit
+        batch_size = self.get_batch_size()
+        self.LOGGER.info(f"Wznowienie generowania opisów AI {checkpoint.name!r} od obiektu {checkpoint.last_id}.")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while deadline is None or monotonic() < deadline:
+                items = list(self.get_queryset().filter(id__gt=checkpoint.last_id)[:batch_size])
+                if not items:
+                    checkpoint.finished_at = timezone.now()
+                    checkpoint.stopped_at = None
+                    checkpoint.attempts = 0
+                    checkpoint.save()
+                    self.LOGGER.info(f"Zakończono generowanie opisów AI {checkpoint.name!r}.")
+                    break
+
+                generated, skipped, failed_ids = self.process_batch(items, executor)
+                completed = list(takewhile(lambda item: item.id not in failed_ids, items))
+                if completed:
+                    checkpoint.last_id = completed[-1].id
+                checkpoint.generated += generated
+                checkpoint.skipped += skipped
+                checkpoint.failed += len(failed_ids)
+                checkpoint.finished_at = None
+                is_stopped = False
+                if completed:
+                    checkpoint.stopped_at = None
+                    checkpoint.attempts = 0
+                elif checkpoint.attempts + 1 >= self.MAX_ATTEMPTS:
+                    checkpoint.last_id = items[0].id
+                    checkpoint.failed_ids = [*checkpoint.failed_ids, items[0].id]
+                    checkpoint.stopped_at = None
+                    checkpoint.attempts = 0
+                    self.LOGGER.error(
+                        f"Pominięto obiekt {items[0].id} w generowaniu opisów AI {checkpoint.name!r} "
+                        f"po {self.MAX_ATTEMPTS} nieudanych próbach."
+                    )
+                else:
+                    checkpoint.stopped_at = timezone.now()
+                    checkpoint.attempts += 1
+                    is_stopped = True
+                checkpoint.save()
+                self.LOGGER.info(
+                    f"Zapisano postęp {checkpoint.name!r}: obiekt {checkpoint.last_id}, wygenerowano {generated}, "
+                    f"pominięto {skipped}, nieudane {len(failed_ids)}."
+                )
+                if is_stopped:
+                    self.LOGGER.error(
+                        f"Przerwano generowanie opisów AI {checkpoint.name!r} - nieudany opis obiektu "
+                        f"{items[0].id} (próba {checkpoint.attempts} z {self.MAX_ATTEMPTS}), zostanie ponowiony "
+                        f"za {self.get_retry_countdown(checkpoint)} s."
+                    )
+                    break
+
+        return checkpoint
+
+    def get_retry_countdown(self, checkpoint: AiPregenerationCheckpoint) -> int:
+        """Provides pause before the retry of the stopped run (growing with the number of the attempts).
+
+        Args:
+            checkpoint: Checkpoint of the stopped run.
+
+        Returns:
+            Pause (in seconds).
+        """
+        return min(self.RETRY_COUNTDOWN * 2 ** max(checkpoint.attempts - 1, 0), self.MAX_RETRY_COUNTDOWN)
+
+    def process_batch(self, items: list[models.Model], executor: ThreadPoolExecutor) -> tuple[int, int, list[int]]:
+        """Generates missing descriptions of the batch objects (AI is asked in the executor threads, database
+        is accessed in the calling thread).
+
+        Args:
+            items: Catalog objects.
+            executor: Executor of the AI questions.
+
+        Returns:
+            Numbers of the generated and skipped (already stored) descriptions, primary keys of the objects
+            with the failed descriptions (one per failed description).
+        """
+        skipped = 0
+        questions = {}
+        for item in items:
+            for variant in self.variants:
+                prompt = AiPrompts.for_object(item, short=self.VARIANTS[variant])
+                if AiDescriptionCache.get(item, prompt, self.ai_model) is not None:
+                    skipped += 1
+                    continue
+                questions[executor.submit(self.ask, prompt)] = (item, prompt)
+
+        generated = 0
+        failed_ids = []
+        for question in as_completed(questions):
+            item, prompt = questions[question]
+            try:
+                content = question.result()
+            except AiUnavailableError:
+                failed_ids.append(item.pk)
+                self.LOGGER.error(f"Nie wygenerowano opisu AI obiektu {item._meta.label_lower} {item.pk}.")
+                continue
+            AiDescriptionCache.set(item, prompt, content, self.ai_model)
+            generated += 1
+
+        return generated, skipped, failed_ids
+
+    def ask(self, prompt: str) -> str:
+        """Asks the AI, within the requests per minute limit (shared by the executor threads).
+
+        Args:
+            prompt: Question text.
+
+        Returns:
+            Answer text.
+
+        Raises:
+            AiUnavailableError: If the answer was not received within the call budget.
+        """
+        with self.__lock:
+            now = monotonic()
+            slot = max(now, self.__next_slot)
+            self.__next_slot = slot + 60 / self.rpm
+        sleep(slot - now)
+        return ask_ai(ask=prompt, model=self.ai_model)
+
+
+def current_day_message() -> str:
+    """Provides current day message (without year).
+
+    Returns:
+        Current day message (without year).
+    """
+    days = {
+        1: "pierwszy",
+        2: "drugi",
+        3: "trzeci",
+        4: "czwarty",
+        5: "piąty",
+        6: "szósty",
+        7: "siódmy",
+        8: "ósmy",
+        9: "dziewiąty",
+        10: "dziesiąty",
+        11: "jedenasty",
+        12: "dwunasty",
+        13: "trzynasty",
+        14: "czternasty",
+        15: "piętnasty",
+        16: "szesnasty",
+        17: "siedemnasty",
+        18: "osiemnasty",
+        19: "dziewiętnasty",
+        20: "dwudziesty",
+        21: "dwudziesty pierwszy",
+        22: "dwudziesty drugi",
+        23: "dwudziesty trzeci",
+        24: "dwudziesty czwarty",
+        25: "dwudziesty piąty",
+        26: "dwudziesty szósty",
+        27: "dwudziesty siódmy",
+        28: "dwudziesty ósmy",
+        29: "dwudziesty dziewiąty",
+        30: "trzydziesty",
+        31: "trzydziesty pierwszy",
+    }
+
+    # Słownik z nazwami miesięcy
+    months = {
+        1: "styczeń",
+        2: "luty",
+        3: "marzec",
+        4: "kwiecień",
+        5: "maj",
+        6: "czerwiec",
+        7: "lipiec",
+        8: "sierpień",
+        9: "wrzesień",
+        10: "październik",
+        11: "listopad",
+        12: "grudzień",
+    }
+
+    current_day = datetime.date.today()
+
+    day_ = days[current_day.day]
+    month_ = months[current_day.month]
+
+    return f"{day_} {month_}"
+
+
+def get_history_news() -> str:
+    """Provides current day message (without year).
+
+    Returns:
+        Current day message (without year).
+    """
+    current_day = datetime.date.today()
+    filename = f"{current_day.day}d_{current_day.month}m.txt"
+    file_path = get_static_dir() + "historical_news/" + str(current_day.month) + "/" + filename
+
+    with open(file_path, "r") as file:
+        text = file.read()
+
+    return text
+
+
+def get_polish_photo_data() -> dict:
+    """Download polish photo data from the unplash api.
+
+    Returns:
+        The polish photo data dictionary (photo_link, photo_author, photo_author_link, photo_city)
+    """
+    unplash_api_key = getenv("UNPLASH_API_KEY")
+    url_request = f"https://api.unsplash.com/photos/random?query=poland&client_id={unplash_api_key}&count=1"
+    response = requests.get(url_request, timeout=60)
+    if response.status_code == 200:
+        return {
+            "photo_link": response.json()[0]["urls"]["full"],
+            "photo_author": response.json()[0]["user"]["name"],
+            "photo_author_link": response.json()[0]["user"]["links"]["html"],
+            "photo_city": response.json()[0]["location"]["city"],
+        }
+    return {}
+
+
+def get_polish_photo_google_links(phrase: Optional[str] = None) -> list:
+    """Download polish photo data from the Google custom search engine api.
+
+    Args:
+        phrase: Query text.
+
+    Returns:
+        List with the polish photo links.
+    """
+    query_keywords = [
+        "Polski krajobraz",
+        "Polski pejzaż",
+        "Polskie lasy",
+        "Polskie rzeki",
+        "Polskie góry, Tatry",
+        "Polskie jeziora",
+        "Morze Bałtyckie, Polska",
+        "Wisła, Polska",
+        "Odra, Polska",
+        "Warta, Polska",
+        "Polskie plaże",
+        "Polska przyroda",
+        "Parki Narodowe w Polsce",
+        "Polskie zwierzęta",
+        "Polska grzyby",
+        "Polska wieś",
+        "Polska PRL",
+        "Polskie kościoły",
+        "Polskie zabytki",
+        "Polskie zabytki archeologiczne",
+        "Polskie herby",
+        "Polska sztuka",
+        "Polska znaczki pocztowe",
+        "Kraków Wawel",
+        "Łazienki Warszawa",
+        "Kraków Rynek",
+        "Warszawa Belweder",
+        "Warszawa Pałac Kultury",
+        "Kraków Kościół Mariacki",
+        "Kraków sukiennice",
+        "Kraków Kazimierz",
+        "Polska Wrocław",
+        "Polska Bydgoszcz",
+        "Polska Lublin",
+        "Polska Zielona Góra",
+        "Polska Łódź",
+        "Polska Kraków",
+        "Polska Warszawa",
+        "Polska Opole",
+        "Polska Rzeszów",
+        "Polska Białystok",
+        "Polska Gdańsk",
+        "Polska Katowice",
+        "Polska Kielce",
+        "Polska Olsztyn",
+        "Polska Poznań",
+        "Polska Szczecin",
+    ]
+    if phrase is None:
+        random_number = randbelow(len(query_keywords))
+        phrase = query_keywords[random_number]
+
+    google_custom_search_api_key = getenv("GOOGLE_CUSTOM_SEARCH_API_KEY")
+    google_custom_search_engine_id = getenv("GOOGLE_CUSTOM_SEARCH_ENGINE_ID")
+    url_request = (
+        f"https://www.googleapis.com/customsearch/v1?q={phrase}&searchType=image&"
+        f"imgSize=xlarge&key={google_custom_search_api_key}&cx={google_custom_search_engine_id}"
+    )
+    response = requests.get(url_request, timeout=60)
+    if response.status_code == 200:
+        photo_items = response.json().get("items", [])
+        # print(photo_items)
+        photo_links = [photo_item.get("link") for photo_item in photo_items]
+        return [photo_links, phrase]
+    else:
+        return [[], phrase]
+
+
+def populate_archeological_monument_db_table() -> None:
+    """Populates data for the archeological monuments table.
+
+    Returns:
+        None
+    """
+    CatalogImporter.import_model(ArcheologicalMonument, replace=False)
+
+
+def populate_geographical_object_table() -> None:
+    """Populates data for the geographical objects table.
+
+    Returns:
+        None
+    """
+    CatalogImporter.import_model(GeographicalObject, replace=False)
+
+
+def populate_monument_db_table() -> None:
+    """Populates data for the monuments table.
+
+    Returns:
+        None
+    """
+    CatalogImporter.import_model(Monument, replace=False)
+
+
+class CatalogImporter:
+    """Class with functionalities for the bulk import of the catalog tables from the CSV files.
+
+    CSV files are read in chunks and inserted in batches, the whole import is done in a single transaction
+    (readers see the old or the new rows only). Secondary indexes (SQLite only) can be dropped for the time
+    of the load and recreated afterwards - DDL statements are a part of the transaction, so a failed load
+    restores them as well.
+
+    Attributes:
+        SOURCES (dict): CSV source configuration per model: file name, key field (matching the rows
+            in the incremental synchronization, None - rows are matched by the row hash), separator,
+            skipped data rows and model fields in the order of the CSV columns.
+    """
+
+    SOURCES = {
+        ArcheologicalMonument: {
+            "file_name": "archaeological_monuments.csv",
+            "key_field": "library_id",
+            "separator": ";",
+            "skip_rows": [1],
+            "fields": (
+                "library_id",
+                "security_form",
+                "location_accuracy",
+                "name",
+                "field_azp",
+                "position_area_number",
+                "chronology",
+                "function",
+                "documents",
+                "registration_date",
+                "voivodeship",
+                "county",
+                "parish",
+                "locality",
+                "link",
+            ),
+        },
+        GeographicalObject: {
+            "file_name": "geographicalObjects.csv",
+            "key_field": None,
+            "separator": ";",
+            "skip_rows": None,
+            "fields": ("name", "geo_object_type", "parish", "county", "voivodeship", "latitude", "longitude"),
+        },
+        Monument: {
+            "file_name": "monuments.csv",
+            "key_field": "library_id",
+            "separator": ",",
+            "skip_rows": None,
+            "fields": (
+                "library_id",
+                "security_form",
+                "location_accuracy",
+                "name",
+                "chronology_date",
+                "function",
+                "documents",
+                "registration_date",
+                "voivodeship",
+                "county",
+                "parish",
+                "locality",
+                "street",
+                "address_number",
+                "latitude",
+                "longitude",
+                "chronology",
+            ),
+        },
+    }
+
+    @classmethod
+    def read_chunks(cls, model: type[models.Model], chunk_size: int):
+        """Reads the CSV file of the model in chunks.
+
+        Args:
+            model: Catalog model class (key of the 'SOURCES').
+            chunk_size: Number of the CSV rows read at once.
+
+        Returns:
+            Iterator of the data frames with the prepared rows (see 'prepare_chunk').
+        """
+        source = cls.SOURCES[model]
+        with pd.read_csv(
+            get_static_dir() + source["file_name"],
+            sep=source["separator"],
+            skiprows=source["skip_rows"],
+            dtype=object,
+            chunksize=chunk_size,
+        ) as reader:
+            for chunk in reader:
+                yield cls.prepare_chunk(model, source["fields"], chunk)
+
+    @classmethod
+    def import_model(
+        cls,
+        model: type[models.Model],
+        replace: bool = True,
+        chunk_size: int = 20000,
+        batch_size: int = 1000,
+        drop_indexes: bool = True,
+    ) -> dict:
+        """Imports data of the model from its CSV file.
+
+        Args:
+            model: Catalog model class (key of the 'SOURCES').
+            replace: If True, existing rows are deleted before the import.
+            chunk_size: Number of the CSV rows read at once.
+            batch_size: Number of the rows in a single 'executemany' call.
+            drop_indexes: If True, secondary indexes of the table are dropped for the time of the load.
+
+        Returns:
+            Dictionary with the import statistics. For example:
+                {"rows": 120000, "seconds": 4.2, "rows_per_second": 28571.4}
+        """
+        started_at = monotonic()
+        with transaction.atomic():
+            dropped_indexes = cls.drop_indexes(model) if drop_indexes else []
+            if replace:
+                cls.truncate(model)
+                AiDescriptionCache.invalidate(model)
+            rows = 0
+            for chunk in cls.read_chunks(model, chunk_size):
+                rows += cls.insert_rows(model, chunk, batch_size)
+            cls.create_indexes(dropped_indexes)
+        refresh_catalog_indexes(model)
+
+        seconds = monotonic() - started_at
+        return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds else 0.0}
+
+    @classmethod
+    def sync_model(cls, model: type[models.Model], chunk_size: int = 20000, batch_size: int = 1000) -> dict:
+        """Incrementally synchronizes the model table with its CSV file.
+
+        Rows are matched by the key (see 'get_row_keys') and compared by the hash of the CSV values,
+        so only new, changed and removed rows are written. Primary keys of the unchanged and updated rows are kept,
+        AI descriptions are dropped only for the updated and removed rows.
+        Whole synchronization is done in a single transaction.
+
+        Args:
+            model: Catalog model class (key of the 'SOURCES').
+            chunk_size: Number of the CSV rows read at once.
+            batch_size: Number of the rows in a single 'executemany' call.
+
+        Returns:
+            Dictionary with the synchronization statistics. For example:
+                {"inserted": 12, "updated": 250, "deleted": 3, "unchanged": 119735, "seconds": 2.1}
+        """
+        started_at = monotonic()
+        key_field = cls.SOURCES[model]["key_field"]
+        stored_rows = model.objects.order_by("id").values_list("id", key_field or "row_hash", "row_hash")
+        stored = dict(zip(cls.get_row_keys(row[1] for row in stored_rows), ((row[0], row[2]) for row in stored_rows)))
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        updated_ids = []
+        key_counts = defaultdict(int)
+        with transaction.atomic():
+            for chunk in cls.read_chunks(model, chunk_size):
+                chunk_keys = cls.get_row_keys(chunk[key_field or "row_hash"], key_counts)
+                matched = [stored.pop(key, None) for key in chunk_keys]
+                is_new = np.array([item is None for item in matched], dtype=bool)
+                is_changed = np.array(
+                    [item is not None and item[1] != row_hash for item, row_hash in zip(matched, chunk["row_hash"])],
+                    dtype=bool,
+                )
+                stats["inserted"] += cls.insert_rows(model, chunk[is_new], batch_size)
+                changed_ids = [item[0] for item, changed in zip(matched, is_changed) if changed]
+                stats["updated"] += cls.update_rows(model, chunk[is_changed], changed_ids, batch_size)
+                updated_ids += changed_ids
+                stats["unchanged"] += int(len(chunk) - is_new.sum() - is_changed.sum())
+            deleted_ids = [item[0] for item in stored.values()]
+            stats["deleted"] = cls.delete_rows(model, deleted_ids, batch_size)
+            if updated_ids or deleted_ids:
+                AiDescriptionCache.invalidate(model, updated_ids + deleted_ids)
+        if stats["inserted"] or stats["updated"] or stats["deleted"]:
+            refresh_catalog_indexes(model)
+
+        stats["seconds"] = monotonic() - started_at
+        return stats
+
+    @staticmethod
+    def get_row_keys(values, key_counts: Optional[defaultdict] = None) -> list[str]:
+        """Provides keys matching the CSV rows with the stored ones.
+
+        Key is the key field value ('library_id' or the row hash, when the model has no natural key),
+        repeated values are distinguished by the number of the occurrence (in the file / primary key order).
+
+        Args:
+            values: Key field values.
+            key_counts: Occurrences of the key values counted so far (for the consecutive chunks).
+
+        Returns:
+            List with the row keys.
+        """
+        key_counts = defaultdict(int) if key_counts is None else key_counts
+        keys = []
+        for value in values:
+            keys.append(f"{value}#{key_counts[value]}")
+            key_counts[value] += 1
+        return keys
+
+    @staticmethod
+    def prepare_chunk(model: type[models.Model], fields: tuple[str, ...], chunk: pd.DataFrame) -> pd.DataFrame:
+        """Prepares the chunk of the CSV data for writing.
+
+        Derived columns are filled column-wise (with the same rules as 'NormalizedFieldsMixin' and 'CoordinatesMixin'),
+        'row_hash' column holds the hash of the CSV values.
+
+        Args:
+            model: Catalog model class.
+            fields: Model fields in the order of the CSV columns.
+            chunk: Chunk of the CSV data.
+
+        Returns:
+            Data frame with the columns named by the model fields.
+        """
+        # missing values are stored as 'nan' text, like by the ORM
+        columns = chunk.iloc[:, : len(fields)].astype(str)  # noqa: E203
+        columns.columns = list(fields)
+        columns["row_hash"] = [
+            blake2b("\x1f".join(values).encode(), digest_size=16).hexdigest()
+            for values in columns.itertuples(index=False, name=None)
+        ]
+        for field in model.NORMALIZED_FIELDS:
+            normalized_values = {value: normalize_text(value) for value in columns[field].unique()}
+            columns[f"{field}_normalized"] = columns[field].map(normalized_values)
+        if issubclass(model, CoordinatesMixin):
+            coordinates = [
+                (latitude, longitude) if latitude is not None and longitude is not None else (None, None)
+                for latitude, longitude in zip(
+                    (parse_coordinate(value, limit=90) for value in columns["latitude"]),
+                    (parse_coordinate(value, limit=180) for value in columns["longitude"]),
+                )
+            ]
+            columns["latitude_value"] = pd.Series([pair[0] for pair in coordinates], index=columns.index, dtype=object)
+            columns["longitude_value"] = pd.Series([pair[1] for pair in coordinates], index=columns.index, dtype=object)
+            columns["grid_cell"] = [
+                get_grid_cell(latitude, longitude) if latitude is not None else ""
+                for latitude, longitude in coordinates
+            ]
+        return columns
+
+    @staticmethod
+    def get_db_fields(model: type[models.Model]) -> list[models.Field]:
+        return [field for field in model._meta.concrete_fields if not field.primary_key]
+
+    @classmethod
+    def insert_rows(cls, model: type[models.Model], rows: pd.DataFrame, batch_size: int) -> int:
+        """Inserts the prepared rows with 'executemany' (no model instances are created).
+
+        Args:
+            model: Catalog model class.
+            rows: Prepared rows (see 'prepare_chunk').
+            batch_size: Number of the rows in a single 'executemany' call.
+
+        Returns:
+            Number of the inserted rows.
+        """
+        db_fields = cls.get_db_fields(model)
+        values = cls.get_values(db_fields, rows)
+        table_name = connection.ops.quote_name(model._meta.db_table)
+        column_names = ", ".join(connection.ops.quote_name(field.column) for field in db_fields)
+        placeholders = ", ".join(["%s"] * len(db_fields))
+        query = f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})"  # nosec B608
+        cls.execute_batches(query, values, batch_size)
+        return len(values)
+
+    @classmethod
+    def update_rows(cls, model: type[models.Model], rows: pd.DataFrame, ids: list[int], batch_size: int) -> int:
+        """Updates the stored rows with the prepared rows (in place, primary keys are kept).
+
+        Args:
+            model: Catalog model class.
+            rows: Prepared rows (see 'prepare_chunk').
+            ids: Primary keys of the updated rows (in the order of the 'rows').
+            batch_size: Number of the rows in a single 'executemany' call.
+
+        Returns:
+            Number of the updated rows.
+        """
+        db_fields = cls.get_db_fields(model)
+        values = [(*row, pk) for row, pk in zip(cls.get_values(db_fields, rows), ids)]
+        table_name = connection.ops.quote_name(model._meta.db_table)
+        assignments = ", ".join(f"{connection.ops.quote_name(field.column)} = %s" for field in db_fields)
+        query = f"UPDATE {table_name} SET {assignments} WHERE id = %s"  # nosec B608
+        cls.execute_batches(query, values, batch_size)
+        return len(values)
+
+    @staticmethod
+    def delete_rows(model: type[models.Model], ids: list[int], batch_size: int) -> int:
+        """Deletes the rows (without loading objects and sending the delete signals).
+
+        Args:
+            model: Catalog model class.
+            ids: Primary keys of the deleted rows.
+            batch_size: Number of the primary keys in a single query.
+
+        Returns:
+            Number of the deleted rows.
+        """
+        table_name = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            for batch_start in range(0, len(ids), batch_size):
+                batch = ids[batch_start : batch_start + batch_size]  # noqa: E203
+                placeholders = ", ".join(["%s"] * len(batch))
+                cursor.execute(f"DELETE FROM {table_name} WHERE id IN ({placeholders})", batch)  # nosec B608
+        return len(ids)
+
+    @staticmethod
+    def get_values(db_fields: list[models.Field], rows: pd.DataFrame) -> list[tuple]:
+        rows = rows.copy()
+        for field in db_fields:
+            if field.attname not in rows:
+                rows[field.attname] = field.get_default()
+        return list(rows[[field.attname for field in db_fields]].itertuples(index=False, name=None))
+
+    @staticmethod
+    def execute_batches(query: str, values: list[tuple], batch_size: int) -> None:
+        with connection.cursor() as cursor:
+            for batch_start in range(0, len(values), batch_size):
+                cursor.executemany(query, values[batch_start : batch_start + batch_size])  # noqa: E203
+
+    @staticmethod
+    def truncate(model: type[models.Model]) -> None:
+        """Deletes all rows of the model table (without loading objects and sending the delete signals).
+
+        Args:
+            model: Catalog model class.
+
+        Returns:
+            None
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")  # nosec B608
+
+    @staticmethod
+    def drop_indexes(model: type[models.Model]) -> list[str]:
+        """Drops secondary indexes of the model table (SQLite only).
+
+        Args:
+            model: Catalog model class.
+
+        Returns:
+            List with SQL statements recreating the dropped indexes.
+        """
+        if connection.vendor != "sqlite":
+            return []
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+                [model._meta.db_table],
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+        return [sql for _, sql in indexes]
+
+    @staticmethod
+    def get_missing_indexes(model: type[models.Model]) -> list[str]:
+        """Provides SQL statements creating secondary indexes of the model missing in the database.
+
+        Indexes declared by the model ('db_index' fields and 'Meta.indexes') are matched with the existing ones
+        by the indexed columns (e.g. indexes dropped by an interrupted load without a transaction).
+
+        Args:
+            model: Catalog model class.
+
+        Returns:
+            List with SQL statements creating the missing indexes.
+        """
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        indexed_columns = {tuple(item["columns"]) for item in constraints.values() if item["index"] or item["unique"]}
+
+        schema_editor = connection.schema_editor()
+        statements = []
+        for field in model._meta.local_fields:
+            if field.db_index and not field.unique and (field.column,) not in indexed_columns:
+                statements.append(str(schema_editor._create_index_sql(model, fields=[field])))
+        for index in model._meta.indexes:
+            columns = tuple(model._meta.get_field(field_name).column for field_name in index.fields)
+            if columns not in indexed_columns:
+                statements.append(str(index.create_sql(model, schema_editor)))
+        return statements
+
+    @staticmethod
+    def create_indexes(statements: list[str]) -> None:
+        """Recreates the dropped indexes.
+
+        Args:
+            statements: SQL statements returned by the 'drop_indexes'.
+
+        Returns:
+            None
+        """
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def refresh_catalog_indexes(model: Optional[type[models.Model]] = None) -> None:
+    """Refreshes indexes built over the catalog tables (after the data import).
+
+    In-process indexes are invalidated and the full-text search index is rebuilt.
+
+    Args:
+        model: Imported model class. If not given, indexes of all catalog models are refreshed.
+
+    Returns:
+        None
+    """
+    RandomSampler.invalidate()
+    FacetIndex.invalidate()
+    for indexed_model in [model] if model else SearchIndex.FIELDS:
+        SearchIndex.rebuild(indexed_model)
+
+
+class SearchIndex:
+    """Full-text search index (SQLite FTS5, trigram tokenizer) over the location fields of the catalog models.
+
+    Normalized shadow columns (see 'NormalizedFieldsMixin') are indexed, so matching is diacritic-insensitive.
+
+    Index tables are kept in sync on save/delete (see 'polishness.signals') and rebuilt after the bulk import.
+    Trigram tokenizer allows substring matching, so 'contains'/'icontains' lookups on the indexed fields
+    are answered by the index instead of the 'LIKE' scans. Phrases shorter than 3 characters (and databases
+    other than SQLite) are still handled by the regular lookups.
+
+    Attributes:
+        FIELDS (dict): Indexed fields per model.
+        MIN_PHRASE_LENGTH (int): Minimal length of the phrase handled by the trigram index.
+        __ready_tables (set): Names of index tables already checked (or created) in the process.
+    """
+
+    FIELDS = {
+        Monument: (
+            "locality_normalized",
+            "parish_normalized",
+            "county_normalized",
+            "voivodeship_normalized",
+            "function_normalized",
+        ),
+        ArcheologicalMonument: (
+            "locality_normalized",
+            "parish_normalized",
+            "county_normalized",
+            "voivodeship_normalized",
+            "function_normalized",
+        ),
+        GeographicalObject: ("parish_normalized", "county_normalized", "voivodeship_normalized"),
+    }
+    MIN_PHRASE_LENGTH = 3
+
+    __ready_tables: set[str] = set()
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Checks if the database supports the search index.
+
+        Returns:
+            True for SQLite database, otherwise False.
+        """
+        return connection.vendor == "sqlite"
+
+    @staticmethod
+    def get_table_name(model: type[models.Model]) -> str:
+        """Provides name of the index table for the given model.
+
+        Args:
+            model: Model class.
+
+        Returns:
+            Name of the index table (e.g. 'polishness_monument_fts').
+        """
+        return f"{model._meta.db_table}_fts"
+
+    @classmethod
+    def ensure_table(cls, model: type[models.Model]) -> None:
+        """Creates index table for the given model (and fills it) if it doesn't exist yet.
+
+        Args:
+            model: Model class (one of 'FIELDS' keys).
+
+        Returns:
+            None
+        """
+        table_name = cls.get_table_name(model)
+        if table_name in cls.__ready_tables:
+            return
+
+        if table_name not in connection.introspection.table_names():
+            cls.rebuild(model)
+
+        cls.__ready_tables.add(table_name)
+
+    @classmethod
+    def rebuild(cls, model: type[models.Model]) -> None:
+        """Recreates and fills index table for the given model.
+
+        Args:
+            model: Model class (one of 'FIELDS' keys).
+
+        Returns:
+            None
+        """
+        if not cls.is_supported():
+            return
+
+        table_name = cls.get_table_name(model)
+        fields = ", ".join(cls.FIELDS[model])
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table_name}")  # nosec B608
+            cursor.execute(f"CREATE VIRTUAL TABLE {table_name} USING fts5({fields}, tokenize='trigram')")  # nosec B608
+            cursor.execute(
+                f"INSERT INTO {table_name}(rowid, {fields}) "  # nosec B608
+                f"SELECT id, {fields} FROM {model._meta.db_table}"
+            )
+
+        cls.__ready_tables.add(table_name)
+
+    @classmethod
+    def update_row(cls, instance: models.Model) -> None:
+        """Updates index row of the given model object.
+
+        Args:
+            instance: Model object (of one of 'FIELDS' keys).
+
+        Returns:
+            None
+        """
+        if not cls.is_supported():
+            return
+
+        model = type(instance)
+        cls.ensure_table(model)
+        table_name = cls.get_table_name(model)
+        fields = cls.FIELDS[model]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table_name} WHERE rowid = %s", [instance.pk])  # nosec B608
+            cursor.execute(
+                f"INSERT INTO {table_name}(rowid, {', '.join(fields)}) "  # nosec B608
+                f"VALUES (%s, {', '.join(['%s'] * len(fields))})",
+                [instance.pk, *[getattr(instance, field) for field in fields]],
+            )
+
+    @classmethod
+    def delete_row(cls, instance: models.Model) -> None:
+        """Deletes index row of the given model object.
+
+        Args:
+            instance: Model object (of one of 'FIELDS' keys).
+
+        Returns:
+            None
+        """
+        if not cls.is_supported():
+            return
+
+        model = type(instance)
+        cls.ensure_table(model)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {cls.get_table_name(model)} WHERE rowid = %s", [instance.pk])  # nosec B608
+
+    @classmethod
+    def filter(cls, model: type[models.Model], filters: dict) -> QuerySet:
+        """Provides queryset filtered with usage of the search index.
+
+        'contains'/'icontains' lookups on the indexed fields are translated into one FTS 'MATCH' query,
+        remaining lookups are applied as regular queryset filters.
+
+        Args:
+            model: Model class.
+            filters: Filters, like for 'QuerySet.filter'.
+
+        Returns:
+            Filtered queryset.
+        """
+        if not cls.is_supported() or model not in cls.FIELDS:
+            return model.objects.filter(**filters)
+
+        match_phrases = []
+        remaining_filters = {}
+        for lookup, value in filters.items():
+            field, _, lookup_type = lookup.partition("__")
+            if (
+                lookup_type in ("contains", "icontains")
+                and field in cls.FIELDS[model]
+                and len(value) >= cls.MIN_PHRASE_LENGTH
+            ):
+                phrase = value.replace('"', '""')
+                match_phrases.append(f'{field} : "{phrase}"')
+            else:
+                remaining_filters[lookup] = value
+
+        queryset = model.objects.filter(**remaining_filters)
+        if not match_phrases:
+            return queryset
+
+        cls.ensure_table(model)
+        table_name = cls.get_table_name(model)
+        match_ids = RawSQL(
+            f"SELECT rowid FROM {table_name} WHERE {table_name} MATCH %s",  # nosec B608
+            [" AND ".join(match_phrases)],
+        )
+        return queryset.filter(id__in=match_ids)
+
+
+class FacetIndex:
+    """Process-level index mapping values of low-cardinality fields (facets) to primary keys.
+
+    Every facet value is mapped to a sorted numpy array with primary keys, so filters on facets are answered
+    by the array unions/intersections instead of the 'LIKE' scans in the database.
+    Index is built once per process (on the first use) and rebuilt after 'invalidate' call.
+    Version of the index is shared by the django cache, so invalidation reaches every process
+    using the same cache backend.
+
+    Attributes:
+        FACETS (dict): Indexed facet fields per model.
+        NULL_FACETS (dict): Fields per model, for which only primary keys of the NULL values are indexed
+            (answering 'isnull' lookups).
+        VERSION_CACHE_KEY (str): Cache key of the current index version.
+        __indexes (dict): Built indexes, keyed by the model label.
+    """
+
+    FACETS = {
+        Monument: ("voivodeship_normalized", "county_normalized", "parish_normalized", "chronology"),
+        ArcheologicalMonument: ("voivodeship_normalized", "county_normalized", "parish_normalized", "chronology"),
+        GeographicalObject: ("voivodeship_normalized", "county_normalized", "parish_normalized", "geo_object_type"),
+    }
+    NULL_FACETS = {
+        Monument: ("latitude_value",),
+        GeographicalObject: ("latitude_value",),
+    }
+    VERSION_CACHE_KEY = "polishness:facet-index-version"
+
+    __indexes: dict[str, dict] = {}
+    __lock = Lock()
+
+    @classmethod
+    def build(cls, model: type[models.Model]) -> dict:
+        """Builds facet index for the given model.
+
+        Args:
+            model: Model class (one of 'FACETS' keys).
+
+        Returns:
+            Dictionary with the built index. For example:
+                {
+                    "all": array([1, 2, 3]),
+                    "facets": {"voivodeship_normalized": {"lodzkie": array([2, 3]), ...}, ...},
+                    "nulls": {"latitude_value": array([3])},
+                }
+        """
+        facet_fields = cls.FACETS[model]
+        null_fields = cls.NULL_FACETS.get(model, ())
+        ids = []
+        facets = {facet_field: defaultdict(list) for facet_field in facet_fields}
+        nulls = {null_field: [] for null_field in null_fields}
+        rows = model.objects.order_by("id").values_list("id", *facet_fields, *null_fields)
+        for row in rows.iterator(chunk_size=10000):
+            ids.append(row[0])
+            facet_values = row[1 : len(facet_fields) + 1]  # noqa: E203
+            for facet_field, value in zip(facet_fields, facet_values):
+                facets[facet_field][value].append(row[0])
+            for null_field, value in zip(null_fields, row[len(facet_fields) + 1 :]):  # noqa: E203
+                if value is None:
+                    nulls[null_field].append(row[0])
+
+        return {
+            "all": np.array(ids, dtype=np.int64),
+            "facets": {
+                facet_field: {value: np.array(value_ids, dtype=np.int64) for value, value_ids in values.items()}
+                for facet_field, values in facets.items()
+            },
+            "nulls": {null_field: np.array(null_ids, dtype=np.int64) for null_field, null_ids in nulls.items()},
+        }
+
+    @classmethod
+    def get_index(cls, model: type[models.Model]) -> dict:
+        """Provides facet index for the given model (index is built if needed).
+
+        Args:
+            model: Model class (one of 'FACETS' keys).
+
+        Returns:
+            Dictionary with the index (see 'build').
+        """
+        version = cache.get_or_set(cls.VERSION_CACHE_KEY, uuid4().hex, None)
+        index = cls.__indexes.get(model._meta.label)
+        if index is not None and index["version"] == version:
+            return index
+
+        with cls.__lock:
+            index = cls.__indexes.get(model._meta.label)
+            if index is None or index["version"] != version:
+                index = cls.build(model)
+                index["version"] = version
+                cls.__indexes[model._meta.label] = index
+
+        return index
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Invalidates facet indexes (in all processes sharing the cache backend).
+
+        Returns:
+            None
+        """
+        cache.set(cls.VERSION_CACHE_KEY, uuid4().hex, None)
+        cls.__indexes.clear()
+
+    @classmethod
+    def get_ids(cls, model: type[models.Model], filters: dict, excludes: Optional[dict] = None) -> Optional[np.ndarray]:
+        """Provides primary keys of the rows matching filters (lookups as in 'QuerySet.filter').
+
+        Supported lookups of facet fields: exact ('field', 'field__exact'), 'field__contains', 'field__icontains',
+        'field__in'. Supported lookup of the null facet fields: 'field__isnull'.
+
+        Args:
+            model: Model class.
+            filters: Filters, like for 'QuerySet.filter'.
+            excludes: Exclusion filters, like for 'QuerySet.exclude'.
+
+        Returns:
+            Sorted array with primary keys or None if the query can't be answered by the facet index.
+        """
+        excludes = excludes or {}
+        if model not in cls.FACETS:
+            return None
+
+        for lookup in [*filters, *excludes]:
+            facet_field, _, lookup_type = lookup.partition("__")
+            if facet_field in cls.NULL_FACETS.get(model, ()) and lookup_type == "isnull":
+                continue
+            if facet_field not in cls.FACETS[model] or lookup_type not in ("", "exact", "contains", "icontains", "in"):
+                return None
+
+        index = cls.get_index(model)
+        ids = index["all"]
+        for lookup, value in filters.items():
+            ids = np.intersect1d(ids, cls.__lookup(index, lookup, value), assume_unique=True)
+
+        if excludes:
+            excluded_ids = index["all"]
+            for lookup, value in excludes.items():
+                excluded_ids = np.intersect1d(excluded_ids, cls.__lookup(index, lookup, value), assume_unique=True)
+            ids = np.setdiff1d(ids, excluded_ids, assume_unique=True)
+
+        return ids
+
+    @staticmethod
+    def __lookup(index: dict, lookup: str, value) -> np.ndarray:
+        """Provides primary keys matching single lookup.
+
+        Args:
+            index: Facet index (see 'build').
+            lookup: Lookup, like for 'QuerySet.filter' (e.g. 'county__icontains').
+            value: Lookup value.
+
+        Returns:
+            Sorted array with primary keys.
+        """
+        facet_field, _, lookup_type = lookup.partition("__")
+        if lookup_type == "isnull":
+            null_ids = index["nulls"][facet_field]
+            return null_ids if value else np.setdiff1d(index["all"], null_ids, assume_unique=True)
+
+        facet_values = index["facets"][facet_field]
+
+        if lookup_type == "contains":
+            matched_values = [facet_value for facet_value in facet_values if facet_value and value in facet_value]
+        elif lookup_type == "icontains":
+            needle = str(value).casefold()
+            matched_values = [
+                facet_value for facet_value in facet_values if facet_value and needle in facet_value.casefold()
+            ]
+        elif lookup_type == "in":
+            matched_values = [facet_value for facet_value in value if facet_value in facet_values]
+        else:
+            matched_values = [value] if value in facet_values else []
+
+        if not matched_values:
+            return np.array([], dtype=np.int64)
+        if len(matched_values) == 1:
+            return facet_values[matched_values[0]]
+
+        return np.unique(np.concatenate([facet_values[matched_value] for matched_value in matched_values]))
+
+
+class RandomSampler:
+    """Class with functionalities for drawing random rows from the filtered querysets.
+
+    Only primary keys of the filtered rows are read from the database (and cached per query),
+    then random primary keys are drawn and just the chosen rows are fetched.
+
+    Attributes:
+        ID_INDEX_TTL (int): Time (in seconds) for which primary keys of the given query are cached.
+        ID_INDEX_SIZE (int): Maximal number of the cached queries.
+        __id_index (OrderedDict): Cached primary keys, keyed by the model label and the SQL query.
+    """
+
+    ID_INDEX_TTL = 300
+    ID_INDEX_SIZE = 256
+
+    __id_index: OrderedDict[str, tuple[float, list[int]]] = OrderedDict()
+
+    @classmethod
+    def get_ids(cls, queryset: QuerySet) -> list[int]:
+        """Provides primary keys of the filtered rows.
+
+        Args:
+            queryset: Filtered queryset.
+
+        Returns:
+            List with primary keys of the filtered rows.
+        """
+        ids_queryset = queryset.order_by().values_list("id", flat=True)
+        sql, params = ids_queryset.query.sql_with_params()
+        index_key = f"{queryset.model._meta.label}:{sql}:{params}"
+
+        cached_ids = cls.__id_index.get(index_key)
+        if cached_ids is not None and monotonic() - cached_ids[0] < cls.ID_INDEX_TTL:
+            cls.__id_index.move_to_end(index_key)
+            return cached_ids[1]
+
+        ids = list(ids_queryset)
+        cls.__id_index[index_key] = (monotonic(), ids)
+        if len(cls.__id_index) > cls.ID_INDEX_SIZE:
+            cls.__id_index.popitem(last=False)
+
+        return ids
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Clears cached primary keys (e.g. after the data import).
+
+        Returns:
+            None
+        """
+        cls.__id_index.clear()
+
+    @staticmethod
+    def draw(ids: list[int] | np.ndarray, quantity: int) -> list[int]:
+        """Draws distinct random primary keys.
+
+        Floyd's sampling algorithm is used, so exactly 'quantity' random numbers are drawn (one pass, no retries),
+        then chosen positions are shuffled to get random order. Random numbers are generated in one batch
+        by the numpy generator seeded from the 'secrets' module.
+
+        Args:
+            ids: Primary keys to draw from.
+            quantity: Number of primary keys to draw.
+
+        Returns:
+            List with distinct, randomly ordered primary keys.
+        """
+        ids_len = len(ids)
+        quantity = min(quantity, ids_len)
+        generator = np.random.default_rng(randbits(128))
+
+        random_numbers = generator.integers(0, np.arange(ids_len - quantity + 1, ids_len + 1))
+        drawn_positions = set()
+        for position, random_number in zip(range(ids_len - quantity, ids_len), random_numbers.tolist()):
+            drawn_positions.add(position if random_number in drawn_positions else random_number)
+
+        drawn_positions = list(drawn_positions)
+        return [int(ids[drawn_positions[index]]) for index in generator.permutation(quantity).tolist()]
+
+    @classmethod
+    def sample(cls, queryset: QuerySet, quantity: int) -> list:
+        """Provides distinct random rows from the queryset.
+
+        Args:
+            queryset: Filtered queryset.
+            quantity: Quantity limit.
+
+        Returns:
+            List with random rows (model objects). If quantity limit is not lower than the number of filtered rows,
+            all of them are returned.
+        """
+        ids = cls.get_ids(queryset)
+        if quantity >= len(ids):
+            return [item for item in queryset]
+
+        return cls.fetch(queryset.model, cls.draw(ids, quantity))
+
+    @classmethod
+    def sample_filtered(
+        cls, model: type[models.Model], quantity: int, filters: dict, excludes: Optional[dict] = None
+    ) -> list:
+        """Provides distinct random rows matching filters.
+
+        Filters on facets are answered by the 'FacetIndex', other ones by the database query
+        (with usage of the 'SearchIndex').
+
+        Args:
+            model: Model class.
+            quantity: Quantity limit.
+            filters: Filters, like for 'QuerySet.filter'.
+            excludes: Exclusion filters, like for 'QuerySet.exclude'.
+
+        Returns:
+            List with random rows (model objects). If quantity limit is not lower than the number of matching rows,
+            all of them are returned.
+        """
+        excludes = excludes or {}
+        ids = FacetIndex.get_ids(model, filters, excludes)
+        if ids is None:
+            queryset = SearchIndex.filter(model, filters).exclude(**excludes)
+            return cls.sample(queryset=queryset, quantity=quantity)
+
+        if quantity >= len(ids):
+            return [item for item in model.objects.filter(id__in=ids.tolist())]
+
+        return cls.fetch(model, cls.draw(ids, quantity))
+
+    @classmethod
+    def sample_ids_filtered(
+        cls, model: type[models.Model], quantity: int, filters: dict, excludes: Optional[dict] = None
+    ) -> list[int]:
+        """Provides distinct random primary keys of the rows matching filters (no rows are fetched).
+
+        Args:
+            model: Model class.
+            quantity: Quantity limit.
+            filters: Filters, like for 'QuerySet.filter'.
+            excludes: Exclusion filters, like for 'QuerySet.exclude'.
+
+        Returns:
+            List with random primary keys. If quantity limit is not lower than the number of matching rows,
+            all of them are returned.
+        """
+        excludes = excludes or {}
+        ids = FacetIndex.get_ids(model, filters, excludes)
+        if ids is None:
+            ids = cls.get_ids(SearchIndex.filter(model, filters).exclude(**excludes))
+
+        return cls.draw(ids, quantity)
+
+    @staticmethod
+    def fetch(model: type[models.Model], ids: list[int]) -> list:
+        """Fetches rows with the given primary keys (order of the primary keys is kept).
+
+        Args:
+            model: Model class.
+            ids: Primary keys.
+
+        Returns:
+            List with rows (model objects).
+        """
+        items = model.objects.in_bulk(ids)
+        return [items[item_id] for item_id in ids if item_id in items]
+
+
+class ResultPages:
+    """Class with functionalities for paginating search results over the sampled primary keys.
+
+    Sampled primary keys are stored in the cache (under a random token) in the drawn (random) order, so pages
+    are read with keyset cursors (the last primary key shown) and the rows are fetched page by page
+    (or chunk by chunk in the streaming mode).
+
+    Attributes:
+        MODELS (dict): Paginated model classes by their kind.
+        PAGE_SIZE (int): Number of the rows on the page.
+        CHUNK_SIZE (int): Number of the rows fetched at once in the streaming mode.
+        TIMEOUT (int): Lifetime of the stored results (in seconds).
+        CACHE_KEY (str): Cache key template of the stored results.
+    """
+
+    MODELS = {"monument": Monument, "archeo": ArcheologicalMonument, "geo": GeographicalObject}
+    PAGE_SIZE = 60
+    CHUNK_SIZE = 300
+    TIMEOUT = 3600
+    CACHE_KEY = "polishness:results:{token}"
+
+    @classmethod
+    def store(cls, kind: str, ids: list[int]) -> tuple[str, np.ndarray]:
+        """Stores sampled primary keys.
+
+        Args:
+            kind: Kind of the results (key of the 'MODELS').
+            ids: Sampled primary keys (in the drawn order).
+
+        Returns:
+            Tuple with token of the stored results and primary keys.
+        """
+        token = uuid4().hex
+        ids = np.array(ids, dtype=np.int64)
+        cache.set(cls.CACHE_KEY.format(token=token), {"kind": kind, "ids": ids.tolist()}, cls.TIMEOUT)
+        return token, ids
+
+    @classmethod
+    def load(cls, token: str) -> Optional[tuple[str, np.ndarray]]:
+        """Loads stored primary keys.
+
+        Args:
+            token: Token of the stored results.
+
+        Returns:
+            Tuple with kind of the results and primary keys (in the drawn order), or None if results expired.
+        """
+        results = cache.get(cls.CACHE_KEY.format(token=token))
+        if results is None:
+            return None
+
+        return results["kind"], np.array(results["ids"], dtype=np.int64)
+
+    @classmethod
+    def get_page(
+        cls, kind: str, ids: np.ndarray, after: Optional[int] = None, page_size: Optional[int] = None
+    ) -> tuple[list, Optional[int]]:
+        """Provides page of the results.
+
+        Args:
+            kind: Kind of the results (key of the 'MODELS').
+            ids: Primary keys of the results (in the drawn order).
+            after: Keyset cursor - last primary key of the previous page.
+            page_size: Number of the rows on the page (default: 'PAGE_SIZE').
+
+        Returns:
+            Tuple with rows of the page (model objects, in the order of the 'ids') and the cursor of the next page
+            (None for the last page).
+
+        Raises:
+            ValueError: If the cursor is not one of the result primary keys.
+        """
+        page_size = page_size or cls.PAGE_SIZE
+        start = 0
+        if after is not None:
+            positions = np.flatnonzero(ids == after)
+            if not len(positions):
+                raise ValueError(f"Klucz {after} nie należy do wyników.")
+            start = int(positions[0]) + 1
+
+        page_ids = ids[start : start + page_size].tolist()  # noqa: E203
+        items = cls.MODELS[kind].objects.in_bulk(page_ids)
+        next_after = page_ids[-1] if start + page_size < len(ids) else None
+        # rows deleted since the search are skipped
+        return [items[pk] for pk in page_ids if pk in items], next_after
+
+    @classmethod
+    async def aiter_chunks(cls, kind: str, ids: np.ndarray) -> AsyncIterator[list]:
+        """Iterates over all results in chunks (for the streaming mode), fetching chunk by chunk in a worker thread.
+
+        Args:
+            kind: Kind of the results (key of the 'MODELS').
+            ids: Primary keys of the results (in the drawn order).
+
+        Yields:
+            Lists with rows (model objects, in the order of the 'ids').
+        """
+        after = None
+        while True:
+            items, after = await sync_to_async(cls.get_page)(kind, ids, after=after, page_size=cls.CHUNK_SIZE)
+            if items:
+                yield items
+            if after is None:
+                break
+
+
+class GeoSearch:
+    """Class with functionalities for querying objects by the numeric coordinates.
+
+    Candidates are narrowed by the indexed geographical grid cell (see 'helpers.get_grid_cell')
+    and the coordinates range, so the whole table is not scanned.
+
+    Attributes:
+        EARTH_RADIUS_KM (float): Mean Earth radius (in kilometers).
+        MAX_GRID_CELLS (int): Maximal number of grid cells used in the query (larger areas use coordinates only).
+    """
+
+    EARTH_RADIUS_KM = 6371.0088
+    MAX_GRID_CELLS = 400
+
+    @staticmethod
+    def get_grid_cells(
+        min_latitude: float, min_longitude: float, max_latitude: float, max_longitude: float
+    ) -> list[str]:
+        """Provides grid cells covering the bounding box.
+
+        Args:
+            min_latitude: Minimal latitude of the bounding box.
+            min_longitude: Minimal longitude of the bounding box.
+            max_latitude: Maximal latitude of the bounding box.
+            max_longitude: Maximal longitude of the bounding box.
+
+        Returns:
+            List with grid cell identifiers.
+        """
+        min_row, min_column = (int(part) for part in get_grid_cell(min_latitude, min_longitude).split(":"))
+        max_row, max_column = (int(part) for part in get_grid_cell(max_latitude, max_longitude).split(":"))
+        return [
+            f"{row}:{column}" for row in range(min_row, max_row + 1) for column in range(min_column, max_column + 1)
+        ]
+
+    @classmethod
+    def within_bbox(
+        cls,
+        queryset: QuerySet,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+    ) -> QuerySet:
+        """Filters queryset to the objects located in the bounding box.
+
+        Args:
+            queryset: Queryset of the model with coordinates ('Monument' or 'GeographicalObject').
+            min_latitude: Minimal latitude of the bounding box.
+            min_longitude: Minimal longitude of the bounding box.
+            max_latitude: Maximal latitude of the bounding box.
+            max_longitude: Maximal longitude of the bounding box.
+
+        Returns:
+            Filtered queryset.
+        """
+        grid_cells = cls.get_grid_cells(min_latitude, min_longitude, max_latitude, max_longitude)
+        if len(grid_cells) <= cls.MAX_GRID_CELLS:
+            queryset = queryset.filter(grid_cell__in=grid_cells)
+
+        return queryset.filter(
+            latitude_value__range=(min_latitude, max_latitude),
+            longitude_value__range=(min_longitude, max_longitude),
+        )
+
+    @classmethod
+    def within_radius(cls, queryset: QuerySet, latitude: float, longitude: float, radius_km: float) -> list[tuple]:
+        """Provides objects located within the radius from the given point.
+
+        Args:
+            queryset: Queryset of the model with coordinates ('Monument' or 'GeographicalObject').
+            latitude: Latitude of the point.
+            longitude: Longitude of the point.
+            radius_km: Radius (in kilometers).
+
+        Returns:
+            List with (object, distance in kilometers) tuples, sorted by the distance.
+        """
+        latitude_delta = np.degrees(radius_km / cls.EARTH_RADIUS_KM)
+        longitude_delta = latitude_delta / max(np.cos(np.radians(latitude)), 1e-6)
+        candidates = list(
+            cls.within_bbox(
+                queryset,
+                min_latitude=latitude - latitude_delta,
+                min_longitude=longitude - longitude_delta,
+                max_latitude=latitude + latitude_delta,
+                max_longitude=longitude + longitude_delta,
+            )
+        )
+        if not candidates:
+            return []
+
+        distances = cls.haversine(
+            latitude,
+            longitude,
+            np.array([candidate.latitude_value for candidate in candidates]),
+            np.array([candidate.longitude_value for candidate in candidates]),
+        )
+        return sorted(
+            [
+                (candidate, float(distance))
+                for candidate, distance in zip(candidates, distances)
+                if distance <= radius_km
+            ],
+            key=lambda item: item[1],
+        )
+
+    @classmethod
+    def haversine(cls, latitude1, longitude1, latitude2, longitude2) -> np.ndarray:
+        """Calculates great-circle distances between points (numpy broadcasting is supported).
+
+        Args:
+            latitude1: Latitude(s) of the first point(s).
+            longitude1: Longitude(s) of the first point(s).
+            latitude2: Latitude(s) of the second point(s).
+            longitude2: Longitude(s) of the second point(s).
+
+        Returns:
+            Array with distances (in kilometers).
+        """
+        latitude1, longitude1, latitude2, longitude2 = map(np.radians, (latitude1, longitude1, latitude2, longitude2))
+        haversine_value = (
+            np.sin((latitude2 - latitude1) / 2) ** 2
+            + np.cos(latitude1) * np.cos(latitude2) * np.sin((longitude2 - longitude1) / 2) ** 2
+        )
+        return 2 * cls.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(haversine_value, 0, 1)))
+
+
+class GeoObjectsSupport:
+    """Class with static method for supporting geographical object functionalities."""
+
+    MAPPER = {
+        "doliny": ["dolina", "jar", "wąwóz", "wąwozy", "rów", "obniżenie", "zagłębienie"],
+        "bagna": ["bagna/błota", "bagno/błoto", "torfowiska", "torfowisko"],
+        "cyrki": ["cyrk lodowcowy"],
+        "gory": ["góry", "góra/szczyt", "wzgórze/wzniesienie", "wzgórza/wzniesienia", "zbocze/stok", "pasmo górskie"],
+        "groble": ["grobla", "śluza"],
+        "jaskinie": ["jaskinia/grota", "bagno/błoto", "torfowiska", "torfowisko"],
+        "jeziora": ["jezioro", "jeziora", "staw", "stawy", "sztuczny zbiornik wodny"],
+        "lasy": ["las", "lasy", "część lasu"],
+        "mosty": ["most"],
+        "parki": ["park"],
+        "wydmy": ["wydma", "wydmy", "obszar piasków"],
+        "wyspy": ["półwysep", "wyspa", "zatoka"],
+        "regiony": ["region naturalny"],
+        "rzeki": ["rzeka", "potok", "struga", "strumień", "kanał"],
+        "skaly": ["skała", "skały", "głaz", "głazy"],
+        "starorzecza": ["starorzecze", "stare koryto"],
+        "uroczyska": ["uroczysko", "uroczysko/dawna miejscowość"],
+        "wodospady": ["wodospad", "wodospady"],
+    }
+
+    MAPPER_ALL = []
+    for mapped_list in MAPPER.values():
+        MAPPER_ALL += mapped_list
+
+    @staticmethod
+    def get_query_params(post_data: QueryDict) -> dict:
+        """Parse monument query POST request
+
+        Text values are normalized (see 'helpers.normalize_text') and matched against the normalized shadow columns.
+
+        Returns:
+            Dictionary with parsed monument query.
+        """
+        query_params = {
+            "parish_normalized__contains": normalize_text(post_data.get("parish")),
+            "county_normalized__contains": normalize_text(post_data.get("county")),
+            "voivodeship_normalized": normalize_text(post_data.get("voivodeship")),
+            "quantity": post_data.get("quantity"),
+            "nature_objects": post_data.get("nature_objects"),
+        }
+        return {key: value for key, value in query_params.items() if value}
+
+    @staticmethod
+    def randomize(quantity: int, query_params: dict, excludes: Optional[dict] = None) -> list[GeographicalObject]:
+        """Randomize queried geographical objects
+
+        Random primary keys are drawn (see 'RandomSampler'), so only the chosen objects are fetched.
+        Filters on facets (e.g. voivodeship, object type) are answered by the 'FacetIndex'.
+
+        Args:
+            quantity: quantity limit
+            query_params: geographical objects filters (like for 'QuerySet.filter')
+            excludes: geographical objects exclusion filters (like for 'QuerySet.exclude')
+
+        Returns:
+            List with randomized geographical objects.
+        """
+        return RandomSampler.sample_filtered(
+            model=GeographicalObject, quantity=quantity, filters=query_params, excludes=excludes
+        )
+
+    @staticmethod
+    def randomize_ids(quantity: int, query_params: dict, excludes: Optional[dict] = None) -> list[int]:
+        """Randomize primary keys of queried geographical objects (objects are fetched later, page by page).
+
+        Args:
+            quantity: quantity limit
+            query_params: geographical objects filters (like for 'QuerySet.filter')
+            excludes: geographical objects exclusion filters (like for 'QuerySet.exclude')
+
+        Returns:
+            List with randomized primary keys.
+        """
+        return RandomSampler.sample_ids_filtered(
+            model=GeographicalObject, quantity=quantity, filters=query_params, excludes=excludes
+        )
+
+
+class MonumentsSupport:
+    """Class with static method for supporting monuments functionalities."""
+
+    @staticmethod
+    def get_monument_query_params(post_data: QueryDict) -> dict:
+        """Parse monument query POST request
+
+        Text values are normalized (see 'helpers.normalize_text') and matched against the normalized shadow columns.
+
+        Returns:
+            Dictionary with parsed monument query/
+        """
+        query_params = {
+            "locality_normalized__contains": normalize_text(post_data.get("locality")),
+            "parish_normalized__contains": normalize_text(post_data.get("parish")),
+            "county_normalized__contains": normalize_text(post_data.get("county")),
+            "voivodeship_normalized": normalize_text(post_data.get("voivodeship")),
+            "function_normalized__contains": normalize_text(post_data.get("function")),
+            "chronology": post_data.get("chronology"),
+            "quantity": post_data.get("quantity"),
+            "is_archeological": post_data.get("is_archeological"),
+        }
+        return {key: value for key, value in query_params.items() if value}
+
+    @staticmethod
+    def randomize_monuments(
+        quantity: int,
+        model: type[Monument | ArcheologicalMonument],
+        query_params: dict,
+        excludes: Optional[dict] = None,
+    ) -> list[Monument | ArcheologicalMonument]:
+        """Randomize queried monuments
+
+        Because of the method always different monuments are queried.
+        Random primary keys are drawn (see 'RandomSampler'), so only the chosen monuments are fetched.
+        Filters on facets (e.g. voivodeship, chronology) are answered by the 'FacetIndex'.
+
+        Args:
+            quantity: quantity limit
+            model: monument model class ('Monument' or 'ArcheologicalMonument')
+            query_params: monuments filters (like for 'QuerySet.filter')
+            excludes: monuments exclusion filters (like for 'QuerySet.exclude')
+
+        Returns:
+            List with randomized monuments.
+        """
+        return RandomSampler.sample_filtered(model=model, quantity=quantity, filters=query_params, excludes=excludes)
+
+    @staticmethod
+    def randomize_monument_ids(
+        quantity: int,
+        model: type[Monument | ArcheologicalMonument],
+        query_params: dict,
+        excludes: Optional[dict] = None,
+    ) -> list[int]:
+        """Randomize primary keys of queried monuments (monuments are fetched later, page by page).
+
+        Args:
+            quantity: quantity limit
+            model: monument model class ('Monument' or 'ArcheologicalMonument')
+            query_params: monuments filters (like for 'QuerySet.filter')
+            excludes: monuments exclusion filters (like for 'QuerySet.exclude')
+
+        Returns:
+            List with randomized primary keys.
+        """
+        return RandomSampler.sample_ids_filtered(
+            model=model, quantity=quantity, filters=query_params, excludes=excludes
+        )
+
+
+class TripGenerator:
+    """Class for generating a trip.
+
+    Args:
+        quantity (int): Size of the trip.
+        monuments (list[Monument]): Base list of monuments (with the numeric coordinates).
+        start (tuple[float, float], optional): Coordinates (latitude, longitude) of the trip start point.
+            If not given, the trip starts at one of the monuments.
+
+    Attributes:
+        QUANTITY_LIMIT (int): Limit for trip generation.
+        __quantity (int): Size of the trip.
+        __monuments (list[Monument]): Base list of monuments.
+        __start (tuple[float, float] | None): Coordinates of the trip start point.
+    """
+
+    QUANTITY_LIMIT = 100
+
+    def __init__(self, quantity: int, monuments: list[Monument], start: Optional[tuple[float, float]] = None):
+        self.__monuments = monuments
+        self.__quantity = min(quantity, self.QUANTITY_LIMIT, len(monuments))
+        self.__start = start
+
+    def generate_trip(self) -> list[Monument]:
+        """Generates trip.
+
+        Returns:
+            List with monuments for the trip.
+        """
+        return self.__sort_monuments()
+
+    def __sort_monuments(self) -> list[Monument]:
+        """Sort list of monuments in the visiting order.
+
+        Sorting is handled by the 'RouteOptimizer' functionalities.
+
+        Returns:
+            List of sorted monuments for the trip.
+        """
+        monuments = self.__monuments[: self.__quantity]  # noqa: E203
+        route = RouteOptimizer.solve(
+            latitudes=[monument.latitude_value for monument in monuments],
+            longitudes=[monument.longitude_value for monument in monuments],
+            start=self.__start,
+        )
+        return [monuments[index] for index in route]
+
+
+class RouteOptimizer:
+    """Class with functionalities for planning the shortest (open) route visiting all given points.
+
+    Route is built with the nearest neighbour heuristic and improved with the 2-opt and Or-opt local searches
+    over the haversine distance matrix. The route starts at the fixed start point (if given) and does not
+    return to it.
+
+    Attributes:
+        MAX_SEGMENT_LENGTH (int): Maximal length of the segment moved by the Or-opt.
+        MAX_PASSES (int): Maximal number of the improvement passes.
+        EPSILON (float): Minimal accepted improvement (in kilometers).
+    """
+
+    MAX_SEGMENT_LENGTH = 3
+    MAX_PASSES = 50
+    EPSILON = 1e-9
+
+    @classmethod
+    def solve(
+        cls, latitudes: list[float], longitudes: list[float], start: Optional[tuple[float, float]] = None
+    ) -> list[int]:
+        """Provides the visiting order of the points.
+
+        Args:
+            latitudes: Latitudes of the points.
+            longitudes: Longitudes of the points.
+            start: Coordinates (latitude, longitude) of the fixed start point. If not given, the route can start
+                at any of the points.
+
+        Returns:
+            List with indexes of the points in the visiting order.
+        """
+        if len(latitudes) < 2:
+            return list(range(len(latitudes)))
+
+        matrix = cls.get_distance_matrix(latitudes, longitudes, start)
+        tour = cls.nearest_neighbour(matrix)
+        for _ in range(cls.MAX_PASSES):
+            improved = cls.two_opt(tour, matrix)
+            improved = cls.or_opt(tour, matrix) or improved
+            if not improved:
+                break
+
+        return [int(node) - 1 for node in tour[1:]]
+
+    @staticmethod
+    def get_distance_matrix(
+        latitudes: list[float], longitudes: list[float], start: Optional[tuple[float, float]] = None
+    ) -> np.ndarray:
+        """Provides haversine distance matrix of the points, preceded by the start node (node 0).
+
+        Without the fixed start point, the start node is at distance 0 from all points, so the open route
+        can start anywhere.
+
+        Args:
+            latitudes: Latitudes of the points.
+            longitudes: Longitudes of the points.
+            start: Coordinates (latitude, longitude) of the fixed start point.
+
+        Returns:
+            Square distance matrix (in kilometers).
+        """
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        distances = GeoSearch.haversine(
+            latitudes[:, None], longitudes[:, None], latitudes[None, :], longitudes[None, :]
+        )
+        matrix = np.zeros((len(latitudes) + 1, len(latitudes) + 1))
+        matrix[1:, 1:] = distances
+        if start is not None:
+            matrix[0, 1:] = matrix[1:, 0] = GeoSearch.haversine(start[0], start[1], latitudes, longitudes)
+        return matrix
+
+    @staticmethod
+    def get_route_length(tour: np.ndarray, matrix: np.ndarray) -> float:
+        return float(matrix[tour[:-1], tour[1:]].sum())
+
+    @staticmethod
+    def nearest_neighbour(matrix: np.ndarray) -> np.ndarray:
+        """Builds the route (from the start node) always visiting the nearest unvisited node.
+
+        Args:
+            matrix: Distance matrix.
+
+        Returns:
+            Array with the nodes in the visiting order.
+        """
+        size = len(matrix)
+        visited = np.zeros(size, dtype=bool)
+        tour = np.zeros(size, dtype=np.int64)
+        visited[0] = True
+        for position in range(1, size):
+            distances = np.where(visited, np.inf, matrix[tour[position - 1]])
+            tour[position] = np.argmin(distances)
+            visited[tour[position]] = True
+        return tour
+
+    @classmethod
+    def two_opt(cls, tour: np.ndarray, matrix: np.ndarray) -> bool:
+        """Improves the route (in place) by reversing its segments.
 
-    MAPPER_ALL = []
-    for mapped_list in MAPPER.values():
-        MAPPER_ALL += mapped_list
+        Args:
+            tour: Nodes in the visiting order (the start node is kept in place).
+            matrix: Distance matrix.
 
-    @staticmethod
-    def get_query_params(post_data: QueryDict) -> dict:
-        """Parse monument query POST request
+        Returns:
+            True if the route was improved, False otherwise.
+        """
+        size = len(tour)
+        improved = False
+        for i in range(1, size - 1):
+            # reversing tour[i:j + 1] replaces edges (i - 1, i) and (j, j + 1) with (i - 1, j) and (i, j + 1)
+            ends = tour[i + 1 :]  # noqa: E203
+            nexts = np.append(tour[i + 2 :], -1)  # noqa: E203
+            has_next = nexts >= 0
+            deltas = matrix[tour[i - 1], ends] - matrix[tour[i - 1], tour[i]]
+            deltas += np.where(has_next, matrix[tour[i], nexts] - matrix[ends, nexts], 0.0)
+            best = int(np.argmin(deltas))
+            if deltas[best] < -cls.EPSILON:
+                j = i + 1 + best
+                tour[i : j + 1] = tour[i : j + 1][::-1].copy()  # noqa: E203
+                improved = True
+        return improved
+
+    @classmethod
+    def or_opt(cls, tour: np.ndarray, matrix: np.ndarray) -> bool:
+        """Improves the route (in place) by moving short segments (optionally reversed) to other positions.
+
+        Args:
+            tour: Nodes in the visiting order (the start node is kept in place).
+            matrix: Distance matrix.
 
         Returns:
-            Dictionary with parsed monument query.
+            True if the route was improved, False otherwise.
         """
-        query_params = {
-            "parish__icontains": post_data.get("parish"),
-            "county__icontains": post_data.get("county"),
-            "voivodeship__icontains": post_data.get("voivodeship"),
-            "quantity": post_data.get("quantity"),
-            "nature_objects": post_data.get("nature_objects"),
-        }
-        return {key: value for key, value in query_params.items() if value}
+        improved = False
+        for length in range(1, cls.MAX_SEGMENT_LENGTH + 1):
+            i = 1
+            while i + length <= len(tour):
+                segment = tour[i : i + length].copy()  # noqa: E203
+                rest = np.concatenate((tour[:i], tour[i + length :]))  # noqa: E203
+                previous, first, last = tour[i - 1], segment[0], segment[-1]
+                gain = matrix[previous, first]
+                if i + length < len(tour):
+                    following = tour[i + length]
+                    gain += matrix[last, following] - matrix[previous, following]
+
+                # insertion between rest[p] and rest[p + 1] (or at the end), keeping the start node first
+                nexts = np.append(rest[1:], -1)
+                has_next = nexts >= 0
+                costs = np.full((2, len(rest)), np.inf)
+                for direction, (head, tail) in enumerate(((first, last), (last, first))):
+                    costs[direction] = matrix[rest, head] + np.where(
+                        has_next, matrix[tail, nexts] - matrix[rest, nexts], 0.0
+                    )
+                costs[:, i - 1] = np.inf  # current position
+                direction, position = np.unravel_index(np.argmin(costs), costs.shape)
+                if costs[direction, position] < gain - cls.EPSILON:
+                    moved = segment[::-1] if direction else segment
+                    tour[:] = np.concatenate((rest[: position + 1], moved, rest[position + 1 :]))  # noqa: E203
+                    improved = True
+                i += 1
+        return improved
 
-    @staticmethod
-    def randomize(quantity: int, geo_objects: QuerySet[GeographicalObject]) -> list[GeographicalObject]:
-        """Randomize queried geographical objects
+
+# API DBW
+class JsonRecordsStore:
+    """Process-level store of the JSON file with the list of records, indexed by one of the record fields.
+
+    File is loaded once and reloaded only after it changes on disk (modification time or size). Missing (or empty)
+    file is downloaded with the 'download' function and saved. Lookups are dictionary lookups instead of loading
+    and scanning the file.
+
+    Attributes:
+        path (str): Path of the JSON file.
+        key (str): Indexed field of the records.
+        download (Callable | None): Function providing records when there is no file (empty list - download failed).
+        unique (bool): If True, the key is unique (key -> record), otherwise key -> list of records.
+        logger (Logger | None): Logger of the loading and downloading.
+        __index (dict | None): Loaded index.
+        __stamp (tuple | None): Modification time and size of the loaded file (None - no file).
+        __lock (Lock): Lock guarding the loading.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        download: Optional[Callable[[], list[dict]]] = None,
+        unique: bool = False,
+        logger: Optional[Logger] = None,
+    ):
+        """Store initialization (the file is loaded on the first lookup).
 
         Args:
-            quantity: quantity limit
-            geo_objects: geographical objects selection
+            path: Path of the JSON file.
+            key: Indexed field of the records.
+            download: Function providing records when there is no file (empty list - download failed).
+            unique: If True, the key is unique (key -> record), otherwise key -> list of records.
+            logger: Logger of the loading and downloading.
+        """
+        self.path = path
+        self.key = key
+        self.download = download
+        self.unique = unique
+        self.logger = logger
+        self.__index = None
+        self.__stamp = None
+        self.__lock = Lock()
+
+    def get_stamp(self) -> Optional[tuple[int, int]]:
+        """Provides modification time and size of the file.
 
         Returns:
-            List with randomized geographical objects.
+            Tuple with the modification time (in nanoseconds) and size or None if the file is missing or empty.
         """
-        geo_objects_len = len(geo_objects)
-        if quantity > geo_objects_len:
-            return [geo_item for geo_item in geo_objects]
+        try:
+            stat_result = stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat_result.st_mtime_ns, stat_result.st_size) if stat_result.st_size else None
 
-        randomized_geo_objects = []
-        random_numbers = []
-        for num in range(quantity):
-            random_number = randbelow(geo_objects_len)
-            while random_number in random_numbers:
-                random_number = randbelow(geo_objects_len)
+    def get_index(self) -> dict:
+        """Provides index of the records (the file is loaded, downloaded or reloaded if needed).
 
-            random_geo_object = geo_objects[random_number]
-            randomized_geo_objects.append(random_geo_object)
-            random_numbers.append(random_number)
+        Returns:
+            Dictionary: key -> record (unique key) or key -> list of records.
+        """
+        stamp = self.get_stamp()
+        if self.__index is not None and stamp == self.__stamp:
+            return self.__index
+
+        with self.__lock:
+            stamp = self.get_stamp()
+            if self.__index is None or stamp != self.__stamp:
+                if stamp is None and self.download is not None:
+                    self.save(self.download())
+                    stamp = self.get_stamp()
+                self.__index = self.build(self.load() if stamp is not None else [])
+                self.__stamp = stamp
+        return self.__index
+
+    def get(self, value: Any) -> dict | list[dict] | None:
+        """Provides records with the given key value.
 
-        return randomized_geo_objects
+        Args:
+            value: Key value.
 
+        Returns:
+            Record or None (unique key), list of records (possibly empty) otherwise.
+        """
+        return self.get_index().get(value, None if self.unique else [])
 
-class MonumentsSupport:
-    """Class with static method for supporting monuments functionalities."""
+    def build(self, records: list[dict]) -> dict:
+        """Builds index of the records.
 
-    @staticmethod
-    def get_monument_query_params(post_data: QueryDict) -> dict:
-        """Parse monument query POST request
+        Args:
+            records: Records.
 
         Returns:
-            Dictionary with parsed monument query/
+            Dictionary: key -> record (unique key) or key -> list of records.
         """
-        query_params = {
-            "locality__icontains": post_data.get("locality"),
-            "parish__icontains": post_data.get("parish"),
-            "county__icontains": post_data.get("county"),
-            "voivodeship__icontains": post_data.get("voivodeship"),
-            "function__icontains": post_data.get("function"),
-            "chronology": post_data.get("chronology"),
-            "quantity": post_data.get("quantity"),
-            "is_archeological": post_data.get("is_archeological"),
-        }
-        return {key: value for key, value in query_params.items() if value}
+        if self.unique:
+            return {record.get(self.key): record for record in records}
 
-    @staticmethod
-    def randomize_monuments(quantity: int, monuments: QuerySet[Monument | ArcheologicalMonument]) -> list[Monument]:
-        """Randomize queried monuments
+        index = defaultdict(list)
+        for record in records:
+            index[record.get(self.key)].append(record)
+        return dict(index)
 
-        Because of the method always different monuments are queried.
+    def load(self) -> list[dict]:
+        """Loads records from the file.
 
         Returns:
-            List with randomized monuments.
+            Records.
         """
-        monuments_len = len(monuments)
-        if quantity > monuments_len:
-            return [monument for monument in monuments]
+        with open(self.path, "r", encoding="utf-8") as json_file:
+            records = json.load(json_file)
+        if self.logger is not None:
+            self.logger.info(f"Wczytano plik {self.path!r} (liczba elementów: {len(records)}).")
+        return records
 
-        randomized_monuments = []
-        random_numbers = []
-        for num in range(quantity):
-            random_number = randbelow(monuments_len)
-            while random_number in random_numbers:
-                random_number = randbelow(monuments_len)
+    def save(self, records: list[dict]) -> None:
+        """Saves records to the file (the file is replaced atomically, nothing is saved if there are no records).
+
+        Args:
+            records: Records.
 
-            random_monument = monuments[random_number]
-            randomized_monuments.append(random_monument)
-            random_numbers.append(random_number)
+        Returns:
+            None
+        """
+        if not records:
+            if self.logger is not None:
+                self.logger.error(f"Brak danych do zapisania w pliku {self.path!r}.")
+            return
 
-        return randomized_monuments
+        temporary_path = f"{self.path}.{getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as json_file:
+            json.dump(records, json_file, indent=4)
+        replace(temporary_path, self.path)
+        if self.logger is not None:
+            self.logger.info(f"Zapisano plik {self.path!r} (liczba elementów: {len(records)}).")
 
 
-class TripGenerator:
-    """Class for generating a trip.
+class DbwAreaTree:
+    """Process-level cache of the DBW knowledge areas tree (the 'area/area-area' dictionary of the DBW API).
 
-    Args:
-        quantity (int): Size of the trip.
-        monuments (list[Monument]): Base list of monuments.
+    Areas are indexed by id and by the parent id (root areas under None), so navigating the tree doesn't call
+    the DBW API. The dictionary is persisted in the 'DBW_AREA_TREE_PATH' file and loaded from it after the restart.
+    Tree older than 'DBW_AREA_TREE_TTL' seconds is refreshed in the background thread, the stale tree is served
+    meanwhile (and kept, if the refresh fails). The DBW API is called in the request only when there is no tree
+    in memory nor on disk (the first start).
 
     Attributes:
-        QUANTITY_LIMIT (int): Limit for trip generation.
-        __quantity (int): Size of the trip.
-        __monuments (list[Monument]): Base list of monuments.
+        RETRY_INTERVAL (int): Time between the refresh attempts after the failed refresh (in seconds).
+        __tree (dict | None): Indexed tree (see 'build').
+        __retry_at (float): Timestamp, before which the failed refresh is not repeated.
+        __is_refreshing (bool): If True, the background refresh is running.
+        __lock (Lock): Lock guarding the loading and starting of the refresh.
     """
 
-    QUANTITY_LIMIT = 10
+    RETRY_INTERVAL = 5 * 60
 
-    def __init__(self, quantity: int, monuments: list[Monument]):
-        self.__monuments = monuments
-        if quantity > self.QUANTITY_LIMIT:
-            self.__quantity = 10
-        elif quantity > len(monuments):
-            self.__quantity = len(monuments)
-        else:
-            self.__quantity = quantity
+    __tree = None
+    __retry_at = 0.0
+    __is_refreshing = False
+    __lock = Lock()
 
-    def generate_trip(self) -> list[Monument]:
-        """Generates trip.
+    @staticmethod
+    def build(areas: list[dict], fetched_at: float) -> dict:
+        """Builds indexed tree of the areas.
+
+        Args:
+            areas: Areas data of the DBW API. For example:
+                [{"id": 727, "nazwa": "Gospodarka", "id-nadrzedny-element": None, "czy-zmienne": False, ...}, ...]
+            fetched_at: Timestamp of the areas download.
 
         Returns:
-            List with monuments for the trip.
+            Dictionary with the indexed tree. For example:
+                {
+                    "nodes": {727: {"id": 727, ...}, 728: {"id": 728, "id-nadrzedny-element": 727, ...}, ...},
+                    "children": {None: [{"id": 727, ...}, ...], 727: [{"id": 728, ...}, ...], ...},
+                    "fetched_at": 1729000000.0,
+                }
         """
-        return self.__sort_monuments()
+        nodes = {}
+        children = defaultdict(list)
+        for area in areas:
+            nodes[area.get("id")] = area
+            children[area.get("id-nadrzedny-element")].append(area)
+        return {"nodes": nodes, "children": dict(children), "fetched_at": fetched_at}
 
-    def __sort_monuments(self) -> list[Monument]:
-        """Sort list of monuments.
-
-        Sorting is handled by the 'MonumentItem' functionalities.
+    @classmethod
+    def get_tree(cls) -> dict:
+        """Provides indexed tree (the background refresh is started, if the tree is stale).
 
         Returns:
-            List of sorted monuments for the trip.
+            Dictionary with the indexed tree (see 'build').
         """
-        monument_items = []
-        for monument in self.__monuments:
-            latitude = monument.latitude
-            longitude = monument.longitude
-            monument_item = MonumentItem(data=monument, latitude=latitude, longitude=longitude)
-            monument_items.append(monument_item)
+        tree = cls.__tree
+        if tree is None:
+            with cls.__lock:
+                if cls.__tree is None:
+                    cls.__tree = cls.load() or cls.fetch()
+                tree = cls.__tree
+
+        now = datetime.datetime.now().timestamp()
+        if now - tree["fetched_at"] >= settings.DBW_AREA_TREE_TTL and now >= cls.__retry_at:
+            cls.refresh_in_background()
+        return tree
 
-        monument_items.sort()
-        return [monument_item.monument for monument_item in monument_items]
+    @classmethod
+    def get_area(cls, area_id: int) -> Optional[dict]:
+        """Provides area data.
 
+        Args:
+            area_id: Area id.
 
-class MonumentItem:
-    """Class for representing monuments and solving sorting issue.
+        Returns:
+            Area data of the DBW API or None if there is no such area.
+        """
+        return cls.get_tree()["nodes"].get(area_id)
 
-    Args:
-        data (Monument): Monument from the 'Monument' model class.
-        latitude (str): Latitude of the monument.
-        longitude (str): Longitude of the monument.
+    @classmethod
+    def get_children(cls, parent_id: Optional[int]) -> list[dict]:
+        """Provides subareas of the area.
 
-    Attributes:
-        __data (Monument): Monument object (from the 'Monument' model class).
-        __latitude (float): Latitude of the monument.
-        __longitude (float): Longitude of the monument.
-        __reference_measure (float): Calculated reference measure.
-    """
+        Args:
+            parent_id: Area id (None - root areas).
 
-    def __init__(self, data: Monument, latitude: str, longitude: str):
-        self.__data = data
-        self.__latitude = float(latitude)
-        self.__longitude = float(longitude)
-        self.__reference_measure = self.calc_reference_measure()
+        Returns:
+            List with areas data of the DBW API.
+        """
+        return cls.get_tree()["children"].get(parent_id, [])
 
-    @property
-    def monument(self):
-        """Provides monument object (from the 'Monument' model class).
+    @classmethod
+    def fetch(cls) -> dict:
+        """Downloads the areas from the DBW API and builds the tree (persisted, if the download succeeded).
 
         Returns:
-            Monument object (from the 'Monument' model class).
+            Dictionary with the indexed tree (see 'build'), empty and stale if the download failed.
         """
-        return self.__data
+        areas = GusApiDbwClient.fetch_areas()
+        if areas is None:
+            cls.__retry_at = datetime.datetime.now().timestamp() + cls.RETRY_INTERVAL
+            return cls.build([], fetched_at=0.0)
 
-    @property
-    def reference_measure(self):
-        """Provides calculated reference measure.
+        tree = cls.build(areas, fetched_at=datetime.datetime.now().timestamp())
+        cls.save(areas, tree["fetched_at"])
+        return tree
+
+    @classmethod
+    def refresh_in_background(cls) -> None:
+        """Starts the refresh of the tree in the background thread (unless it is running already).
 
         Returns:
-            Calculated reference measure.
+            None
         """
-        return self.__reference_measure
+        with cls.__lock:
+            if cls.__is_refreshing:
+                return
+            cls.__is_refreshing = True
+        Thread(target=cls.refresh, name="dbw-area-tree-refresh", daemon=True).start()
 
-    def calc_reference_measure(self) -> float:
-        """Provides calculated reference measure.
+    @classmethod
+    def refresh(cls) -> bool:
+        """Downloads the areas from the DBW API and replaces the tree (the current one is kept if the download failed).
 
         Returns:
-            Calculated reference measure (float).
+            True if the tree was replaced, False otherwise.
         """
-        measure = self.__latitude * self.__latitude + self.__longitude * self.__longitude
-        return measure
+        try:
+            tree = cls.fetch()
+            if not tree["fetched_at"]:
+                GusApiDbwClient.DBW_LOGGER.error(
+                    f"Nie odświeżono drzewa dziedzin wiedzy, kolejna próba za {cls.RETRY_INTERVAL} s."
+                )
+                return False
 
-    def __lt__(self, other):
-        return self.reference_measure < other.reference_measure
+            cls.__tree = tree
+            GusApiDbwClient.DBW_LOGGER.info(
+                f"Odświeżono drzewo dziedzin wiedzy (liczba dziedzin: {len(tree['nodes'])})."
+            )
+            return True
+        finally:
+            cls.__is_refreshing = False
 
-    def __le__(self, other):
-        return self.reference_measure <= other.reference_measure
+    @classmethod
+    def load(cls) -> Optional[dict]:
+        """Loads the tree from the 'DBW_AREA_TREE_PATH' file.
 
-    def __eq__(self, other):
-        return self.reference_measure == other.reference_measure
+        Returns:
+            Dictionary with the indexed tree (see 'build') or None if there is no file.
+        """
+        path = settings.DBW_AREA_TREE_PATH
+        if not (exists(path) and getsize(path)):
+            return None
+
+        with open(path, "r", encoding="utf-8") as json_file:
+            data = json.load(json_file)
+        GusApiDbwClient.DBW_LOGGER.info(
+            f"Wczytano drzewo dziedzin wiedzy z pliku {path!r} (liczba dziedzin: {len(data['areas'])})."
+        )
+        return cls.build(data["areas"], fetched_at=data["fetched_at"])
 
-    def __ne__(self, other):
-        return self.reference_measure != other.reference_measure
+    @staticmethod
+    def save(areas: list[dict], fetched_at: float) -> None:
+        """Saves the areas to the 'DBW_AREA_TREE_PATH' file (the file is replaced atomically).
 
-    def __gt__(self, other):
-        return self.reference_measure > other.reference_measure
+        Args:
+            areas: Areas data of the DBW API.
+            fetched_at: Timestamp of the areas download.
 
-    def __ge__(self, other):
-        return self.reference_measure >= other.reference_measure
+        Returns:
+            None
+        """
+        path = settings.DBW_AREA_TREE_PATH
+        temporary_path = f"{path}.{getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as json_file:
+            json.dump({"fetched_at": fetched_at, "areas": areas}, json_file, indent=4)
+        replace(temporary_path, path)
+        GusApiDbwClient.DBW_LOGGER.info(f"Zapisano drzewo dziedzin wiedzy do pliku {path!r}.")
 
 
-# API DBW
 class GusApiDbwClient:
     """Delivers client functionalities for GUS DBW API
 
@@ -566,42 +4220,74 @@ class GusApiDbwClient:
 
     GUS_DBW_API_KEY = getenv("GUS_DBW_API_KEY")
     REQUEST_HEADERS = {"accept": "application/json", "X-ClientId": GUS_DBW_API_KEY}
+    SECTION_PERIODS = JsonRecordsStore(
+        "static/all_section_periods.json",
+        key="id-zmienna",
+        download=lambda: GusApiDbwClient.download_section_periods(),
+        logger=DBW_LOGGER,
+    )
+    PERIODS = JsonRecordsStore(
+        "static/all_periods.json",
+        key="id-okres",
+        download=lambda: GusApiDbwClient.download_periods(),
+        unique=True,
+        logger=DBW_LOGGER,
+    )
+    REPRESENTATION_MEASURES = JsonRecordsStore(
+        "static/all_representation_measures.json",
+        key="id-sposob-prezentacji-miara",
+        download=lambda: GusApiDbwClient.download_representation_measures(),
+        unique=True,
+        logger=DBW_LOGGER,
+    )
 
     @classmethod
-    def get_dbw_root_fields(cls) -> list[dict]:
-        """Delivers Base Knowledge Fields from.
+    def fetch_areas(cls) -> Optional[list[dict]]:
+        """Downloads all Knowledge Fields (areas) from the DBW API.
 
         Returns:
-            List with Base Knowledge Fields data dictionaries.
+            List with areas data of the DBW API or None if there was no 200 response code.
             For example:
-                [{"field_id":727, "field_name": "Gospodarka"}, ...]
-
-            If there was no 200 response code then empty list is returned.
+                [{"id": 727, "nazwa": "Gospodarka", "id-nadrzedny-element": None, "czy-zmienne": False, ...}, ...]
         """
         url_request = "https://api-dbw.stat.gov.pl/api/1.1.0/area/area-area?lang=pl"
-        cls.DBW_LOGGER.info("Zostaną pobrane podstawowe dziedziny wiedzy.")
         cls.DBW_LOGGER.debug(f"Zostanie wykonane zapytanie pobierające wszystkie dziedziny wiedzy ({url_request}).")
-        response = requests.get(url_request, headers=cls.REQUEST_HEADERS, timeout=60)
+        try:
+            response = requests.get(url_request, headers=cls.REQUEST_HEADERS, timeout=60)
+        except requests.RequestException as error:
+            cls.DBW_LOGGER.error(f"Nieudane zapytanie pobierające wszystkie dziedziny wiedzy ({error!r}).")
+            return None
+
         cls.DBW_LOGGER.info(
             f"Wykonano zapytanie pobierające wszystkie dziedziny wiedzy ({url_request}). "
             f"Zwrócony kod odpowiedzi: {response.status_code}."
         )
         if response.status_code == 200:
-            root_fields = [
-                {"field_id": field_data.get("id"), "field_name": field_data.get("nazwa").replace("/", "-")}
-                for field_data in response.json()
-                if field_data.get("id-nadrzedny-element") is None
-            ]
-            cls.DBW_LOGGER.debug(f"Odszukano podstawowe dziedziny wiedzy ({root_fields}).")
-            return root_fields
+            return response.json()
+        return None
 
-        else:
-            cls.DBW_LOGGER.error("Nieudane zapytanie, zostanie zwrócona pusta lista bez podstawowych dziedzin wiedzy.")
-            return []
+    @classmethod
+    def get_dbw_root_fields(cls) -> list[dict]:
+        """Delivers Base Knowledge Fields (from the cached areas tree, see 'DbwAreaTree').
+
+        Returns:
+            List with Base Knowledge Fields data dictionaries.
+            For example:
+                [{"field_id":727, "field_name": "Gospodarka"}, ...]
+
+            If areas couldn't be downloaded then empty list is returned.
+        """
+        cls.DBW_LOGGER.info("Zostaną pobrane podstawowe dziedziny wiedzy.")
+        root_fields = [
+            {"field_id": field_data.get("id"), "field_name": field_data.get("nazwa").replace("/", "-")}
+            for field_data in DbwAreaTree.get_children(None)
+        ]
+        cls.DBW_LOGGER.debug(f"Odszukano podstawowe dziedziny wiedzy ({root_fields}).")
+        return root_fields
 
     @classmethod
     def get_dbw_fields(cls, field_id: int, field_name: str) -> list[dict]:
-        """Delivers Knowledge Fields categories.
+        """Delivers Knowledge Fields categories (from the cached areas tree, see 'DbwAreaTree').
 
         Args:
             field_id: Knowledge field id.
@@ -612,36 +4298,21 @@ class GusApiDbwClient:
             For example:
                 [{"field_id":1, "field_name": "Ceny", "field_variables": False}, ...]
 
-            If there was no 200 response code then empty list is returned.
+            If areas couldn't be downloaded then empty list is returned.
         """
-        url_request = "https://api-dbw.stat.gov.pl/api/1.1.0/area/area-area?lang=pl"
         cls.DBW_LOGGER.info(f"Zostaną wyszukane podkategorie dziedzin wiedzy dla: {field_name} (field_id={field_id}).")
-        cls.DBW_LOGGER.debug(f"Zostanie wykonane zapytanie pobierające wszystkie dziedziny wiedzy ({url_request}).")
-        response = requests.get(url_request, headers=cls.REQUEST_HEADERS, timeout=60)
+        fields = [
+            {
+                "field_id": field_data.get("id"),
+                "field_name": field_data.get("nazwa").replace("/", "-"),
+                "field_variables": field_data.get("czy-zmienne"),
+            }
+            for field_data in DbwAreaTree.get_children(field_id)
+        ]
         cls.DBW_LOGGER.info(
-            f"Wykonano zapytanie pobierające wszystkie dziedziny wiedzy ({url_request}). "
-            f"Zwrócony kod odpowiedzi: {response.status_code}."
+            f"Odszukano podkategorie dziedzin wiedzy dla: {field_name} (field_id={field_id}). Znaleziono: {fields}."
         )
-
-        if response.status_code == 200:
-            fields = [
-                {
-                    "field_id": field_data.get("id"),
-                    "field_name": field_data.get("nazwa").replace("/", "-"),
-                    "field_variables": field_data.get("czy-zmienne"),
-                }
-                for field_data in response.json()
-                if field_data.get("id-nadrzedny-element") == field_id
-            ]
-            cls.DBW_LOGGER.info(
-                f"Odszukano podkategorie dziedzin wiedzy dla: {field_name} (field_id={field_id}). "
-                f"Znaleziono: {fields}."
-            )
-            return fields
-
-        else:
-            cls.DBW_LOGGER.error("Nieudane zapytanie, zostanie zwrócona pusta lista bez podkategorii dziedzin wiedzy.")
-            return []
+        return fields
 
     @classmethod
     def get_dbw_field_variables(cls, field_id: int, field_name: str) -> list[dict]:
@@ -658,9 +4329,14 @@ class GusApiDbwClient:
                 "field_id":3, "field_variable_id": 313,
                 "field_variable_name": "Ceny producentów wyrobów spożywczych"}, ...]
 
-            If there was no 200 response code then most probably category doesn't have statistical variables.
-            Empty list is returned.
+            If the category doesn't have statistical variables (according to the areas tree) or there was
+            no 200 response code, then empty list is returned.
         """
+        area = DbwAreaTree.get_area(field_id)
+        if area is not None and not area.get("czy-zmienne"):
+            cls.DBW_LOGGER.info(f"Obszar {field_name!r} (field_id={field_id}) nie posiada zmiennych statystycznych.")
+            return []
+
         url_request = f"https://api-dbw.stat.gov.pl/api/1.1.0/area/area-variable?id-obszaru={field_id}&lang=pl"
         cls.DBW_LOGGER.info(f"Zostaną wyszukane zmienne dla {field_name!r} (field_id={field_id}).")
         cls.DBW_LOGGER.debug(f"Zostanie wykonane zapytanie pobierające zmienne dla {field_name!r} ({url_request}).")
@@ -701,14 +4377,15 @@ class GusApiDbwClient:
 
     @classmethod
     def get_variable_section_periods(cls, field_variable_id: int, field_variable_name: str) -> list[dict]:
-        """ " Delivers sections and periods for the given variable.
+        """ " Delivers sections and periods for the given variable (from the 'SECTION_PERIODS' store).
 
         Args:
             field_variable_id: Variable id.
             field_variable_name: Variable name.
 
         Returns:
-            List with Knowledge Fields category variable - sections and periods - data grouped in dictionaries.
+            List with Knowledge Fields category variable - sections and periods - data grouped in dictionaries
+            (copies, which may be modified).
             For example:
                 [...
                     {
@@ -720,9 +4397,19 @@ class GusApiDbwClient:
                     },
                 ...]
         """
-        section_periods = []
+        cls.DBW_LOGGER.info(f"Ustalenie przekrojów i okresów dla zmiennej {field_variable_name!r}.")
+        section_periods = [dict(item) for item in cls.SECTION_PERIODS.get(field_variable_id)]
+        cls.DBW_LOGGER.info(f"Ustalono przekroje i okresy dla zmiennej {field_variable_name!r} ({section_periods}).")
+        return section_periods
+
+    @classmethod
+    def download_section_periods(cls) -> list[dict]:
+        """Downloads all sections and periods of the variables from the DBW API (two pages of 5000 records).
+
+        Returns:
+            List with sections and periods data of all variables (see 'get_variable_section_periods').
+        """
         responses_data = []
-        filename_path = "static/all_section_periods.json"
         url_request1 = (
             "https://api-dbw.stat.gov.pl/api/1.1.0/variable/variable-section-periods?"
             "ile-na-stronie=5000&numer-strony=0&lang=pl"
@@ -731,58 +4418,30 @@ class GusApiDbwClient:
             "https://api-dbw.stat.gov.pl/api/1.1.0/variable/variable-section-periods?"
             "ile-na-stronie=5000&numer-strony=1&lang=pl"
         )
+        cls.DBW_LOGGER.info(
+            f"Zostaną pobrane wszystkie przekroje/okresy z DBW API. "
+            f"Wykonane będą dwa zapytania (1: {url_request1}, 2: {url_request2})."
+        )
 
-        if exists(filename_path) and getsize(filename_path):
-            cls.DBW_LOGGER.debug(
-                f"Plik {filename_path!r} jest już na dysku, więc zostanie wykorzystany przy ustalaniu "
-                f"przekrojów i okresów dla zmiennej {field_variable_name!r}."
-            )
-            with open(filename_path, "r", encoding="utf-8") as json_file:
-                responses_data = json.load(json_file)
-
-        else:
-            cls.DBW_LOGGER.debug(
-                f"Pliku {filename_path!r} nie ma jeszcze na dysku, więc wszystkie przekroje i okresy "
-                f"zostaną wczytane z DBW API."
-            )
-
-            cls.DBW_LOGGER.info(
-                f"Zostaną pobrane wszystkie przekroje/okresy z DBW API. "
-                f"Wykonane będą dwa zapytania (1: {url_request1}, 2: {url_request2})."
-            )
-
-            response1 = requests.get(url_request1, headers=cls.REQUEST_HEADERS, timeout=60)
-
-            cls.DBW_LOGGER.info(
-                f"Wykonano zapytanie pobierające przekroje/okresy z DBW API ({url_request1}). "
-                f"Zwrócony kod odpowiedzi: {response1.status_code}."
-            )
-            if response1.status_code == 200:
-                responses_data = response1.json()["data"]
-            response2 = requests.get(url_request2, headers=cls.REQUEST_HEADERS, timeout=60)
-            cls.DBW_LOGGER.info(
-                f"Wykonano zapytanie pobierające przekroje/okresy z DBW API ({url_request2}). "
-                f"Zwrócony kod odpowiedzi: {response2.status_code}."
-            )
-            if response2.status_code == 200:
-                responses_data += response2.json()["data"]
-
-            with open(filename_path, "w", encoding="utf-8") as json_file:
-                json.dump(responses_data, json_file, indent=4)
-                cls.DBW_LOGGER.info(f"Zapisano wszystkie przekroje/okresy do pliku {filename_path!r}.")
-
-        cls.DBW_LOGGER.info(f"Ustalenie przekrojów i okresów dla zmiennej {field_variable_name!r}.")
-        for item in responses_data:
-            if item.get("id-zmienna") == field_variable_id:
-                section_periods.append(item)
-
-        cls.DBW_LOGGER.info(f"Ustalono przekroje i okresy dla zmiennej {field_variable_name!r} ({section_periods}).")
-
-        return section_periods
+        response1 = requests.get(url_request1, headers=cls.REQUEST_HEADERS, timeout=60)
+        cls.DBW_LOGGER.info(
+            f"Wykonano zapytanie pobierające przekroje/okresy z DBW API ({url_request1}). "
+            f"Zwrócony kod odpowiedzi: {response1.status_code}."
+        )
+        if response1.status_code == 200:
+            responses_data = response1.json()["data"]
+        response2 = requests.get(url_request2, headers=cls.REQUEST_HEADERS, timeout=60)
+        cls.DBW_LOGGER.info(
+            f"Wykonano zapytanie pobierające przekroje/okresy z DBW API ({url_request2}). "
+            f"Zwrócony kod odpowiedzi: {response2.status_code}."
+        )
+        if response2.status_code == 200:
+            responses_data += response2.json()["data"]
+        return responses_data
 
     @classmethod
     def get_periods(cls) -> list[dict]:
-        """Delivers all periods data.
+        """Delivers all periods data (from the 'PERIODS' store).
 
         Returns:
             List with all periods data, grouped in dictionaries.
@@ -798,33 +4457,49 @@ class GusApiDbwClient:
                 },
                 ...]
         """
-        filename_path = "static/all_periods.json"
+        return list(cls.PERIODS.get_index().values())
 
-        if exists(filename_path) and getsize(filename_path):
-            cls.DBW_LOGGER.debug(f"Plik {filename_path!r} jest już na dysku, więc zostanie wykorzystany. ")
-            with open(filename_path, "r", encoding="utf-8") as json_file:
-                periods = json.load(json_file)
-                cls.DBW_LOGGER.info(
-                    f"Wczytano wszystkie okresy z pliku {filename_path!r}. "
-                    f"(Liczba okresów: {len(periods)}). Zostaną dalej wykorzystane."
-                )
-                return periods
+    @classmethod
+    def download_periods(cls) -> list[dict]:
+        """Downloads all periods data from the DBW API.
 
-        else:
-            cls.DBW_LOGGER.debug(
-                f"Pliku {filename_path!r} nie ma jeszcze na dysku, więc wszystkie okresy "
-                f" zostaną wczytane z DBW API."
-            )
-            url_request = "https://api-dbw.stat.gov.pl/api/1.1.0/dictionaries/periods-dictionary"
-            response = requests.get(url_request, headers=cls.REQUEST_HEADERS, timeout=60)
-            periods = response.json()["data"]
-            with open(filename_path, "w", encoding="utf-8") as json_file:
-                json.dump(periods, json_file, indent=4)
-                cls.DBW_LOGGER.info(
-                    f"Zapisano wszystkie okresy do pliku {filename_path!r}. "
-                    f"(Liczba okresów: {len(periods)}). Zostaną dalej wykorzystane."
-                )
-            return periods
+        Returns:
+            List with all periods data (see 'get_periods'), empty if there was no 200 response code.
+        """
+        url_request = "https://api-dbw.stat.gov.pl/api/1.1.0/dictionaries/periods-dictionary"
+        cls.DBW_LOGGER.info(f"Zostaną pobrane wszystkie okresy z DBW API ({url_request}).")
+        response = requests.get(url_request, headers=cls.REQUEST_HEADERS, timeout=60)
+        cls.DBW_LOGGER.info(
+            f"Wykonano zapytanie pobierające wszystkie okresy z DBW API ({url_request}). "
+            f"Zwrócony kod odpowiedzi: {response.status_code}."
+        )
+        if response.status_code == 200:
+            return response.json()["data"]
+        return []
+
+    @classmethod
+    def enrich_section_periods(cls, section_periods: list[dict]) -> list[dict]:
+        """Adds template-friendly keys and period descriptions to the sections and periods of the variable.
+
+        Periods are looked up in the 'PERIODS' index, so the records are enriched in a single pass.
+
+        Args:
+            section_periods: Sections and periods of the variable (see 'get_variable_section_periods'),
+                modified in place.
+
+        Returns:
+            The same list, with 'nazwa_przekroj', 'id_przekroj', 'id_okres' and 'opis_okres' (if the period is known)
+            added to each record.
+        """
+        periods = cls.PERIODS.get_index()
+        for item_section_periods in section_periods:
+            item_section_periods["nazwa_przekroj"] = item_section_periods["nazwa-przekroj"]
+            item_section_periods["id_przekroj"] = item_section_periods["id-przekroj"]
+            item_section_periods["id_okres"] = item_section_periods["id-okres"]
+            period = periods.get(item_section_periods["id_okres"])
+            if period is not None:
+                item_section_periods["opis_okres"] = period["opis"]
+        return section_periods
 
     @classmethod
     def get_stats_data(cls, field_variable_id: int, section_id: int, period_id: int, year_id: int) -> list[dict]:
@@ -866,7 +4541,8 @@ class GusApiDbwClient:
 
         if response.status_code == 200:
             stats_data = response.json()["data"]
-            cls.DBW_LOGGER.info(f"Pobrane dane statystyczne ({url_request}): {stats_data}.")
+            cls.DBW_LOGGER.info(f"Pobrano dane statystyczne ({url_request}), liczba rekordów: {len(stats_data)}.")
+            cls.DBW_LOGGER.debug(f"Pobrane dane statystyczne ({url_request}): {stats_data}.")
             return stats_data
 
         cls.DBW_LOGGER.info(
@@ -876,96 +4552,104 @@ class GusApiDbwClient:
         return []
 
     @classmethod
-    def get_dimension_description(
-        cls, section_id: int, dimension_id: int, dimension_position_id: int, section_dimensions: list
-    ) -> str:
-        """Delivers dimension description for the given query.
+    def enrich_stats_data(cls, stats_data: list[dict], section_dimensions: list[dict]) -> list[dict]:
+        """Adds dimension and measure descriptions to the stats data, in one batched pass.
+
+        Lookup tables (dimension position id -> description, measure id -> name) are built once and joined
+        on the 'id-pozycja-N' and 'id-sposob-prezentacji-miara' columns of all rows at once.
 
         Args:
-            section_id: Section id.
-            dimension_id: Dimension id.
-            dimension_position_id: Dimension position id.
-            section_dimensions: List with all dimensions data for the given section, grouped in dictionaries.
+            stats_data: Stats data (see 'get_stats_data'), modified in place.
+            section_dimensions: List with all dimensions data for the given section (see 'get_section_dimensions').
 
         Returns:
-            Text with dimension description built as below:
-             - dim.get('nazwa-wymiar') / dim.get('nazwa-pozycja')
-             For example:
-             - 'Wyroby spożywcze / Cukier biały kryształ, workowany [kg]'
-
-            If there was no 200 response code then empty string is returned.
+            The same list, with 'dimension_description', 'dimension_description_beta',
+            'dimension_description_gamma' (built as 'nazwa-wymiar / nazwa-pozycja' of the position, e.g.
+            'Wyroby spożywcze / Cukier biały kryształ, workowany [kg]'; empty if the position is not known,
+            '-' if the row has no such dimension) and 'representation_description'
+            (see 'get_representation_description') added to each row.
         """
-        if not dimension_id or not dimension_position_id:
-            err_message = (
-                "Zmienne dimension_id i dimension_position_id muszą mieć niezerową wartość typu integer "
-                "przy ustalaniu opisu wymiaru."
-            )
-            cls.DBW_LOGGER.error(err_message)
-            raise ValueError(err_message)
+        if not stats_data:
+            return stats_data
 
-        cls.DBW_LOGGER.info(
-            f"Nastąpi ustalanie opisu dla wymiaru '{dimension_id}' "
-            f"(id pozycji: {dimension_position_id}, id przekroju: {section_id})."
+        stats = pd.DataFrame.from_records(stats_data)
+        dimensions = pd.DataFrame.from_records(
+            section_dimensions, columns=["id-pozycja", "nazwa-wymiar", "nazwa-pozycja"]
+        ).drop_duplicates("id-pozycja")
+        dimension_descriptions = pd.Series(
+            (dimensions["nazwa-wymiar"].astype(str) + " / " + dimensions["nazwa-pozycja"].astype(str)).to_numpy(),
+            index=pd.Index(dimensions["id-pozycja"], dtype="Int64"),
         )
 
-        for dim in section_dimensions:
-            if dim.get("id-pozycja") == dimension_position_id:
-                dim_description = f"{dim.get('nazwa-wymiar')} / {dim.get('nazwa-pozycja')}"
-                cls.DBW_LOGGER.info(
-                    f"Ustalono opis wymiaru dla '{dimension_id}' "
-                    f"(id pozycji: {dimension_position_id}): {dim_description!r}."
-                )
-                return dim_description
-        else:
-            cls.DBW_LOGGER.info(
-                f"Nie ustalono opisu wymiaru dla '{dimension_id}' "
-                f"(id pozycji: {dimension_position_id}). Zostanie zwrócony pusty string."
-            )
-            return ""
+        descriptions = pd.DataFrame(index=stats.index)
+        columns = ("dimension_description", "dimension_description_beta", "dimension_description_gamma")
+        for number, column in enumerate(columns, start=1):
+            dimension_ids = stats.get(f"id-wymiar-{number}")
+            position_ids = stats.get(f"id-pozycja-{number}")
+            if dimension_ids is None or position_ids is None:
+                descriptions[column] = "-"
+                continue
+
+            position_ids = position_ids.astype("Int64")
+            is_described = dimension_ids.notna() & (dimension_ids != 0) & (position_ids.fillna(0) != 0)
+            described = position_ids.map(dimension_descriptions).fillna("")
+            descriptions[column] = described.where(is_described, "-")
+
+        representation_ids = stats["id-sposob-prezentacji-miara"]
+        measure_names = {
+            representation_id: cls.get_representation_description(representation_id)
+            for representation_id in representation_ids.unique()
+        }
+        descriptions["representation_description"] = representation_ids.map(measure_names)
+
+        for stats_row, row_descriptions in zip(stats_data, descriptions.to_dict("records")):
+            stats_row.update(row_descriptions)
+        cls.DBW_LOGGER.info(
+            f"Wzbogacono dane statystyczne (liczba rekordów: {len(stats_data)}, "
+            f"liczba pozycji wymiarów: {len(dimension_descriptions)}, liczba miar: {len(measure_names)})."
+        )
+        return stats_data
 
     @classmethod
     def get_representation_description(cls, representation_id) -> str:
-        filename_path = "static/all_representation_measures.json"
-        representation_measures = []
+        """Delivers measure name for the given way of presentation (from the 'REPRESENTATION_MEASURES' store).
 
-        cls.DBW_LOGGER.info(f"Nastąpi ustalenie opisu dla miary (id miary: '{representation_id}').")
+        Args:
+            representation_id: Way of presentation (measure) id.
 
-        if exists(filename_path) and getsize(filename_path):
-            cls.DBW_LOGGER.debug(
-                f"Plik {filename_path!r} jest już na dysku, więc zostanie wykorzystany przy ustalaniu "
-                f"opisu dla miary (id miary: {representation_id!r})."
-            )
-            with open(filename_path, "r", encoding="utf-8") as json_file:
-                representation_measures = json.load(json_file)
-        else:
+        Returns:
+            Measure name or empty string if the measure is not known.
+        """
+        representation = cls.REPRESENTATION_MEASURES.get(representation_id)
+        if representation is None:
+            cls.DBW_LOGGER.info(f"Nie ustalono nazwy miary dla id miary {representation_id!r}.")
+            return ""
 
-            url_request = (
-                "https://api-dbw.stat.gov.pl/api/1.1.0/dictionaries/way-of-presentation?page=1&page-size=5000&lang=pl"
-            )
-            cls.DBW_LOGGER.debug(f"Zostanie wykonane zapytanie pobierające dane opisu miar ({url_request}).")
-            response = requests.get(url_request, headers=cls.REQUEST_HEADERS, timeout=60)
-            cls.DBW_LOGGER.info(
-                f"Wykonano zapytanie pobierające wszystkie dane opisujące miary ({url_request}). "
-                f"Zwrócony kod odpowiedzi: {response.status_code}."
-            )
-            if response.status_code == 200:
-                representation_measures = response.json()["data"]
-                cls.DBW_LOGGER.info(f"Pobrane dane opisu miar: {representation_measures}.")
-
-            with open(filename_path, "w", encoding="utf-8") as json_file:
-                json.dump(representation_measures, json_file, indent=4)
-                cls.DBW_LOGGER.info(
-                    f"Zapisano wszystkie dane opisujące miary do pliku {filename_path!r}. "
-                    f"(Liczba elementów: {len(representation_measures)}). Zostaną dalej wykorzystane."
-                )
+        measure_name = representation.get("nazwa")
+        cls.DBW_LOGGER.debug(f"Ustalono nazwę miary dla id miary {representation_id!r} => {measure_name!r}.")
+        return measure_name
 
-        for representation in representation_measures:
-            if representation.get("id-sposob-prezentacji-miara") == representation_id:
-                measure_name = representation.get("nazwa")
-                cls.DBW_LOGGER.info(f"Ustalono nazwę miary dla id miary {representation_id!r} => {measure_name!r}.")
-                return measure_name
+    @classmethod
+    def download_representation_measures(cls) -> list[dict]:
+        """Downloads all ways of presentation (measures) from the DBW API.
 
-        return ""
+        Returns:
+            List with measures data, grouped in dictionaries, empty if there was no 200 response code.
+            For example:
+                [{"id-sposob-prezentacji-miara": 180, "nazwa": "Cena [zł]", ...}, ...]
+        """
+        url_request = (
+            "https://api-dbw.stat.gov.pl/api/1.1.0/dictionaries/way-of-presentation?page=1&page-size=5000&lang=pl"
+        )
+        cls.DBW_LOGGER.debug(f"Zostanie wykonane zapytanie pobierające dane opisu miar ({url_request}).")
+        response = requests.get(url_request, headers=cls.REQUEST_HEADERS, timeout=60)
+        cls.DBW_LOGGER.info(
+            f"Wykonano zapytanie pobierające wszystkie dane opisujące miary ({url_request}). "
+            f"Zwrócony kod odpowiedzi: {response.status_code}."
+        )
+        if response.status_code == 200:
+            return response.json()["data"]
+        return []
 
     @classmethod
     def get_section_dimensions(cls, section_id: int) -> list[dict]: